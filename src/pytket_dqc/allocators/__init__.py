@@ -18,5 +18,6 @@ from .annealing import Annealing  # noqa:F401
 from .brute import Brute  # noqa:F401
 from .routing import Routing  # noqa:F401
 from .hypergraph_partitioning import HypergraphPartitioning  # noqa:F401
+from .multilevel import Multilevel  # noqa:F401
 from .random import Random  # noqa:F401
 from .ordered import Ordered  # noqa:F401
@@ -16,10 +16,11 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 
-from typing import TYPE_CHECKING
+from typing import Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pytket_dqc.circuits.distribution import Distribution
+    from pytket_dqc.circuits.prepared import PreparedCircuit
     from pytket_dqc.networks import NISQNetwork
     from pytket import Circuit
 
@@ -34,5 +35,7 @@ class Allocator(ABC):
 
     # TODO: Correct type here to be any subclass of ServerNetwork
     @abstractmethod
-    def allocate(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def allocate(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         pass
@@ -15,8 +15,8 @@
 from __future__ import annotations
 
 from pytket_dqc.allocators import Allocator, GainManager
-from pytket_dqc.circuits import HypergraphCircuit, Distribution
-from typing import TYPE_CHECKING
+from pytket_dqc.circuits import Distribution, PreparedCircuit, prepare
+from typing import Union, TYPE_CHECKING
 import random
 from .random import Random
 import math
@@ -62,11 +62,13 @@ class Annealing(Allocator):
     def __init__(self) -> None:
         pass
 
-    def allocate(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def allocate(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         """Distribute quantum circuit using simulated annealing approach.
 
         :param circ: Circuit to distribute.
-        :type circ: pytket.Circuit
+        :type circ: Union[Circuit, PreparedCircuit]
         :param network: Network onto which circuit is to be distributed.
         :type network: NISQNetwork
         :return: Distribution of ``circ`` onto ``network``.
@@ -81,9 +83,16 @@ class Annealing(Allocator):
             stored in cache; see GainManager. Default value is 5.
         :key initial_temperature: Initial temperature of annealing procedure.
             Default value of 3.
+        :key initial_distribution: A distribution of a previous version of
+            ``circ`` onto ``network``. If provided, its placement is mapped
+            onto ``circ`` (see ``Distribution.transfer_placement``) and used
+            as the initial placement instead of ``initial_place_method``.
+            Only the vertices in the region affected by the differences
+            between the circuits are then chosen to be moved.
         """
 
-        dist_circ = HypergraphCircuit(circ)
+        prepared = prepare(circ)
+        dist_circ = prepared.hypergraph_circuit()
         if not network.can_implement(dist_circ):
             raise Exception("This circuit cannot be implemented on this network.")
 
@@ -97,7 +106,19 @@ class Annealing(Allocator):
 
         # The annealing procedure requires an initial placement to work with.
         # An initial placement is arrived at here.
-        distribution = initial_aloc.allocate(circ, network)
+        previous = kwargs.get("initial_distribution", None)
+        if previous is not None:
+            if previous.network != network:
+                raise Exception("The initial distribution uses a different network.")
+            placement, region = previous.transfer_placement(dist_circ)
+            distribution = Distribution(dist_circ, placement, network)
+            movable_vertices = sorted(region)
+            # Nothing has changed, so there is nothing to anneal
+            if not movable_vertices:
+                return distribution
+        else:
+            distribution = initial_aloc.allocate(prepared, network)
+            movable_vertices = distribution.circuit.vertex_list
 
         # TODO: Check that the initial placement does not have cost 0, and
         # that not all qubits are already in the same server etc.
@@ -114,7 +135,7 @@ class Annealing(Allocator):
         # there is no improvement.
         for i in range(iterations):
             # Choose a random vertex to move.
-            vertex_to_move = random.choice(distribution.circuit.vertex_list)
+            vertex_to_move = random.choice(movable_vertices)
 
             # Find the server in which the chosen vertex resides.
             home_server = gain_manager.current_server(vertex_to_move)
@@ -130,15 +151,10 @@ class Annealing(Allocator):
                 distribution.circuit._vertex_circuit_map[vertex_to_move]["type"]
                 == "qubit"
             ):
-                # List all qubit vertices
-                dest_qubit_list = distribution.circuit.get_qubit_vertices()
-
                 # Gather qubits in ``destination_server``
-                dest_qubit_list = [
-                    v
-                    for v in dest_qubit_list
-                    if (gain_manager.current_server(v) == destination_server)
-                ]
+                dest_qubit_list = sorted(
+                    gain_manager.qubits_in_server[destination_server]
+                )
 
                 q_in_dest = len(dest_qubit_list)
                 size_dest = len(network.server_qubits[destination_server])
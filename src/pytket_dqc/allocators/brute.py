@@ -17,9 +17,9 @@ from __future__ import annotations
 from pytket_dqc.allocators import Allocator
 import itertools
 from pytket_dqc.placement import Placement
-from pytket_dqc.circuits import HypergraphCircuit, Distribution
+from pytket_dqc.circuits import Distribution, PreparedCircuit, prepare
 
-from typing import TYPE_CHECKING
+from typing import Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pytket import Circuit
@@ -34,12 +34,14 @@ class Brute(Allocator):
     def __init__(self) -> None:
         pass
 
-    def allocate(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def allocate(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         """Distribute quantum circuit by looking at all possible placements
         and returning the one with the lowest cost.
 
         :param circ: Circuit to distribute.
-        :type circ: pytket.Circuit
+        :type circ: Union[Circuit, PreparedCircuit]
         :param network: Network onto which ``circ`` should be distributed.
         :type network: NISQNetwork
         :raises Exception: Raised if no valid placement could be found.
@@ -47,7 +49,8 @@ class Brute(Allocator):
         :rtype: Distribution
         """
 
-        dist_circ = HypergraphCircuit(circ)
+        prepared = prepare(circ)
+        dist_circ = prepared.hypergraph_circuit()
         if not network.can_implement(dist_circ):
             raise Exception("This circuit cannot be implemented on this network.")
 
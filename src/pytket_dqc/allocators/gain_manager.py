@@ -14,11 +14,12 @@
 
 from __future__ import annotations
 
+import heapq
 import networkx as nx  # type: ignore
 from pytket_dqc.utils import steiner_tree
 from pytket_dqc.circuits.hypergraph import Hyperedge
 
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pytket_dqc import Distribution
@@ -38,6 +39,8 @@ class GainManager:
     :type server_graph: nx.Graph
     :param occupancy: Maps servers to its current number of qubit vertices
     :type occupancy: dict[int, int]
+    :param qubits_in_server: Maps servers to the qubit vertices placed in them
+    :type qubits_in_server: dict[int, set[int]]
     :param hyperedge_cost_map: Contains the current cost of each hyperedge.
         Note that `hyperedge_cost_map` may contain hyperedges which are not
         currently in the `Hypergraph` of `distribution`. Hyperedges in
@@ -73,15 +76,32 @@ class GainManager:
         )
         self.server_graph: nx.Graph = self.distribution.network.get_server_nx()
         self.occupancy: dict[int, int] = dict()
+        self.qubits_in_server: dict[int, set[int]] = dict()
         self.hyperedge_cost_map: dict[Hyperedge, int] = dict()
         self.requires_h_embedded_cu1: dict[Hyperedge, bool] = dict()
         self.steiner_cache: dict[frozenset[int], nx.Graph] = dict()
 
+        # The gain of moving a vertex depends only on the placement of its
+        # neighbours. Whenever a vertex or one of its neighbours is moved its
+        # version is increased, so that gains computed for older versions
+        # are known to be outdated.
+        self._version: dict[int, int] = {v: 0 for v in dist_circ.vertex_list}
+        # Indexed by a source and a target server, contains a heap of qubit
+        # vertices in source ordered by the gain of moving to target, along
+        # with the version of each vertex whose gain is in the heap, and the
+        # set of vertices in source whose gain must be pushed to the heap
+        # again since it was last used.
+        self._swap_index: dict[
+            int, dict[int, tuple[list[tuple[int, int, int]], set[int]]]
+        ] = dict()
+
         for server in self.distribution.network.server_qubits.keys():
             self.occupancy[server] = 0
+            self.qubits_in_server[server] = set()
         for vertex, server in self.distribution.placement.placement.items():
             if vertex in self.qubit_vertices:
                 self.occupancy[server] += 1
+                self.qubits_in_server[server].add(vertex)
 
         for hypedge in dist_circ.hyperedge_list:
             self.update_cost(hypedge)
@@ -97,7 +117,7 @@ class GainManager:
         )
         if len(servers) <= self.max_key_size:
             if servers not in self.steiner_cache.keys():
-                tree = steiner_tree(self.server_graph, list(servers))
+                tree = self.distribution.network.get_steiner_tree(list(servers))
                 self.steiner_cache[servers] = tree
             else:
                 tree = self.steiner_cache[servers]
@@ -172,6 +192,7 @@ class GainManager:
         if recalculate_cost:
             for hypedge in new_hyperedge_list:
                 self.update_cost(hypedge)
+        self._outdate(old_hyperedge.vertices)
 
     def merge_hyperedge_gain(self, to_merge_hyperedge_list: list[Hyperedge]) -> int:
         """Calculate the gain from merging a list of hyperedges.
@@ -234,6 +255,7 @@ class GainManager:
 
         if recalculate_cost:
             self.update_cost(new_hyperedge)
+        self._outdate(new_hyperedge.vertices)
 
         return new_hyperedge
 
@@ -265,14 +287,14 @@ class GainManager:
             prev_cost_map[hypedge] = self.hyperedge_cost_map[hypedge]
             prev_cost += self.hyperedge_cost_map[hypedge]
 
-        self.move_vertex(vertex, new_server)  # This will recalculate the costs
+        self._move(vertex, new_server)  # This will recalculate the costs
 
         new_cost = 0
         for hypedge in self.distribution.circuit.hyperedge_dict[vertex]:
             new_cost += self.hyperedge_cost_map[hypedge]
 
         # Move back without recalculating costs
-        self.move_vertex(vertex, prev_server, recalculate_cost=False)
+        self._move(vertex, prev_server, recalculate_cost=False)
         # Reassign previous costs
         for hypedge, cost in prev_cost_map.items():
             self.hyperedge_cost_map[hypedge] = cost
@@ -288,7 +310,18 @@ class GainManager:
         checked whether the move is valid or not. If unsure, you should
         call ``is_move_valid``.
         """
+        # Moves that do not recalculate costs are assumed to be temporary
+        outdated = recalculate_cost and self.current_server(vertex) != server
+        self._move(vertex, server, recalculate_cost)
+        if outdated:
+            self._outdate(
+                [vertex] + list(self.distribution.circuit.vertex_neighbours[vertex])
+            )
 
+    def _move(self, vertex: int, server: int, recalculate_cost: bool = True):
+        """Same as ``move_vertex``, but the gains in the swap partner index
+        are not marked as outdated. Only to be used for temporary moves.
+        """
         placement_dict = self.distribution.placement.placement
         dist_circ = self.distribution.circuit
 
@@ -311,6 +344,8 @@ class GainManager:
             if vertex in self.qubit_vertices:
                 self.occupancy[server] += 1
                 self.occupancy[placement_dict[vertex]] -= 1
+                self.qubits_in_server[placement_dict[vertex]].discard(vertex)
+                self.qubits_in_server[server].add(vertex)
 
             placement_dict[vertex] = server
 
@@ -335,6 +370,150 @@ class GainManager:
         else:
             return True
 
+    def best_swap_partner(self, vertex: int, server: int) -> tuple[Optional[int], int]:
+        """Find the qubit vertex in ``server`` that would be best to move to
+        the current server of ``vertex`` if ``vertex`` were moved to
+        ``server``. The gains of the qubit vertices in ``server`` are kept
+        in a heap, and only those marked as outdated by the moves applied
+        since the last call are recalculated. The gains of the neighbours of
+        ``vertex``, which depend on where ``vertex`` is placed, are always
+        recalculated. Ties are broken in favour of the lowest vertex.
+
+        :param vertex: The vertex that would be moved to ``server``.
+        :type vertex: int
+        :param server: The server ``vertex`` would be moved to.
+        :type server: int
+
+        :return: The best vertex to swap with, or None if ``server`` has no
+            qubit vertices, and the gain of moving it (in addition to the
+            gain of moving ``vertex``).
+        :rtype: tuple[Optional[int], int]
+        """
+        home_server = self.current_server(vertex)
+        neighbours = self.distribution.circuit.vertex_neighbours[vertex]
+        targets = self._swap_index.setdefault(server, dict())
+        if home_server not in targets:
+            targets[home_server] = ([], set(self.qubits_in_server[server]))
+        heap, outdated = targets[home_server]
+
+        # Discard outdated entries once they outnumber valid ones
+        if len(heap) > 2 * len(self.qubits_in_server[server]) + 8:
+            heap[:] = [
+                entry
+                for entry in heap
+                if entry[1] in self.qubits_in_server[server]
+                and entry[2] == self._version[entry[1]]
+            ]
+            heapq.heapify(heap)
+
+        # The outdated neighbours of ``vertex`` are left to later calls
+        outdated_neighbours = []
+        for v in outdated:
+            if v in neighbours:
+                outdated_neighbours.append(v)
+            elif v in self.qubits_in_server[server]:
+                gain = self.move_vertex_gain(v, home_server)
+                heapq.heappush(heap, (-gain, v, self._version[v]))
+        outdated.clear()
+        outdated.update(outdated_neighbours)
+
+        # The best entry that is up to date and not a neighbour of ``vertex``
+        best_vertex: Optional[int] = None
+        best_gain = 0
+        skipped = []
+        while heap:
+            neg_gain, v, version = heap[0]
+            if v not in self.qubits_in_server[server] or version != self._version[v]:
+                heapq.heappop(heap)
+            elif v in neighbours:
+                skipped.append(heapq.heappop(heap))
+            else:
+                best_vertex, best_gain = v, -neg_gain
+                break
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+
+        # The gain of neighbours is calculated with ``vertex`` in ``server``
+        neighbour_partners = sorted(
+            v for v in neighbours if v in self.qubits_in_server[server]
+        )
+        if neighbour_partners:
+            self._move(vertex, server, recalculate_cost=False)
+            for v in neighbour_partners:
+                gain = self.move_vertex_gain(v, home_server)
+                if (
+                    best_vertex is None
+                    or gain > best_gain
+                    or gain == best_gain
+                    and v < best_vertex
+                ):
+                    best_vertex, best_gain = v, gain
+            self._move(vertex, home_server, recalculate_cost=False)
+
+        return best_vertex, best_gain
+
+    def relieve_overfull_servers(self) -> None:
+        """Move qubit vertices out of the servers over capacity until none
+        is. The gain of moving each qubit vertex of an overfull server to
+        each server with free space is kept in a heap, and the move with the
+        highest gain is applied. After each move, only the gains of the
+        neighbours of the moved vertex are recalculated. Ties are broken in
+        favour of the lowest vertex and then the lowest server.
+        """
+        network = self.distribution.network
+        dist_circ = self.distribution.circuit
+
+        def capacity(server: int) -> int:
+            return len(network.server_qubits[server])
+
+        def is_overfull(server: int) -> bool:
+            return self.occupancy[server] > capacity(server)
+
+        # Entries are only valid if their version is the latest one
+        queue: list[tuple[int, int, int, int]] = []
+
+        def push_moves(vertex: int):
+            for server in network.server_qubits.keys():
+                if self.occupancy[server] < capacity(server):
+                    gain = self.move_vertex_gain(vertex, server)
+                    heapq.heappush(
+                        queue, (-gain, vertex, server, self._version[vertex])
+                    )
+
+        for server in network.server_qubits.keys():
+            if is_overfull(server):
+                for vertex in sorted(self.qubits_in_server[server]):
+                    push_moves(vertex)
+
+        while queue:
+            _, vertex, server, version = heapq.heappop(queue)
+            if (
+                version != self._version[vertex]
+                or not is_overfull(self.current_server(vertex))
+                or not self.is_move_valid(vertex, server)
+            ):
+                continue
+            self.move_vertex(vertex, server)
+            # The gains of the neighbours that may still be moved are outdated
+            for neighbour in dist_circ.vertex_neighbours[vertex]:
+                if neighbour in self.qubit_vertices and is_overfull(
+                    self.current_server(neighbour)
+                ):
+                    push_moves(neighbour)
+
+    def _outdate(self, vertices: list[int]):
+        """Mark the gains of ``vertices`` in the swap partner index as
+        outdated, so that they are pushed again to the heaps of their
+        current server.
+        """
+        for v in vertices:
+            self._version[v] = self._version.get(v, 0) + 1
+            if v in self.qubit_vertices:
+                for _, outdated in self._swap_index.get(
+                    self.current_server(v), dict()
+                ).values():
+                    outdated.add(v)
+
     def current_server(self, vertex: int):
         """Return the server that ``vertex`` is placed at."""
         return self.distribution.placement.placement[vertex]
@@ -15,29 +15,64 @@
 from __future__ import annotations
 
 import random
-import kahypar as kahypar  # type:ignore
+import time
+import numpy as np
 from pytket_dqc.allocators import Allocator, GainManager
 from pytket_dqc.placement import Placement
-from pytket_dqc.circuits import HypergraphCircuit, Distribution
+from pytket_dqc.circuits import (
+    HypergraphCircuit,
+    Distribution,
+    PreparedCircuit,
+    prepare,
+)
 import importlib_resources
 from pytket import Circuit
+from concurrent.futures import ProcessPoolExecutor
 
 
-from typing import TYPE_CHECKING
+from typing import NamedTuple, Optional, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pytket_dqc.networks import NISQNetwork
 
 
+class PortfolioCandidate(NamedTuple):
+    """Outcome of one of the KaHyPar runs in a portfolio.
+
+    :param seed: Seed given to KaHyPar.
+    :type seed: Optional[int]
+    :param ini_path: Path to the kahypar ini file used.
+    :type ini_path: str
+    :param cost: Ebit cost of the distribution, after it is made valid.
+    :type cost: int
+    :param time: Wall clock time in seconds taken by this run.
+    :type time: float
+    """
+
+    seed: Optional[int]
+    ini_path: str
+    cost: int
+    time: float
+
+
 class HypergraphPartitioning(Allocator):
     """Distribution technique, making use of existing tools for hypergraph
     partitioning available through the `KaHyPar <https://kahypar.org/>`_
     package. This allocator will ignore weights on hyperedges and
     assume all hyperedges have weight 1. This allocator will ignore the
-    connectivity of the NISQNetwork.
+    connectivity of the NISQNetwork, unless ``process_mapping`` is requested.
+
+    :param portfolio_report: One entry per KaHyPar run of the last call to
+        ``allocate`` that used a portfolio of seeds or ini files.
+    :type portfolio_report: list[PortfolioCandidate]
     """
 
-    def allocate(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def __init__(self) -> None:
+        self.portfolio_report: list[PortfolioCandidate] = []
+
+    def allocate(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         """Distribute ``circ`` onto ``network``. The distribution
         is found by KaHyPar using the connectivity metric. All-to-all
         connectivity of the network of modules is assumed; you may wish
@@ -45,19 +80,41 @@ class HypergraphPartitioning(Allocator):
         ``Distribution`` to take the network topology into account.
 
         :param circ: Circuit to distribute.
-        :type circ: pytket.Circuit
+        :type circ: Union[Circuit, PreparedCircuit]
         :param network: Network onto which ``circ`` should be placed.
         :type network: NISQNetwork
 
         :key ini_path: Path to kahypar ini file. Default points to the
             ini file within the pytket-dqc repository.
         :key seed: Seed for randomness. Default is None
+        :key process_mapping: If True, the blocks found by KaHyPar are
+            assigned to servers so that blocks that communicate heavily are
+            placed on nearby servers, as done by ``map_blocks_to_servers``.
+            Default is False, meaning block ``i`` is placed in server ``i``.
+        :key seeds: List of seeds. If provided, KaHyPar is run once per
+            seed and per ini file in ``ini_paths``; each result is made
+            valid and the one with the lowest ebit cost is returned, with
+            ties broken by the order of ``seeds``. A summary of each run is
+            stored in ``portfolio_report``. Default is None, meaning a
+            single run with ``seed``.
+        :key ini_paths: List of paths to kahypar ini files to be tried for
+            each seed. Default is ``[ini_path]``.
+        :key num_workers: Number of worker processes among which the runs
+            of the portfolio are distributed. Default is None, meaning runs
+            are carried out serially in the current process.
+        :key initial_distribution: A distribution of a previous version of
+            ``circ`` onto ``network``. If provided, KaHyPar is not called;
+            instead, the placement of ``initial_distribution`` is mapped onto
+            ``circ`` (see ``Distribution.transfer_placement``) and made valid.
+            The affected region may then be refined by passing it as
+            ``active_vertices`` to ``BoundaryReallocation``.
 
         :return: Distribution of ``circ`` onto ``network``.
         :rtype: Distribution
         """
 
-        dist_circ = HypergraphCircuit(circ)
+        prepared = prepare(circ)
+        dist_circ = prepared.hypergraph_circuit()
         if not network.can_implement(dist_circ):
             raise Exception("This circuit cannot be implemented on this network.")
 
@@ -65,10 +122,86 @@ class HypergraphPartitioning(Allocator):
         default_ini = f"{package_path}/allocators/km1_kKaHyPar_sea20.ini"
         ini_path = kwargs.get("ini_path", default_ini)
         seed = kwargs.get("seed", None)
+        process_mapping = kwargs.get("process_mapping", False)
+
+        previous = kwargs.get("initial_distribution", None)
+        if previous is not None:
+            if previous.network != network:
+                raise Exception("The initial distribution uses a different network.")
+            placement, _ = previous.transfer_placement(dist_circ)
+            distribution = Distribution(dist_circ, placement, network)
+            self.make_valid(distribution, seed=seed)
+            return distribution
+
+        seeds = kwargs.get("seeds", None)
+        ini_paths = kwargs.get("ini_paths", None)
+        if seeds is None and ini_paths is None:
+            return self.partition(
+                dist_circ, network, ini_path, seed, process_mapping=process_mapping
+            )
+
+        # Portfolio of KaHyPar runs, each scored by its real ebit cost
+        candidates = [
+            (s, ini)
+            for s in (seeds if seeds is not None else [seed])
+            for ini in (ini_paths if ini_paths is not None else [ini_path])
+        ]
+        num_workers = kwargs.get("num_workers", None)
+        if num_workers is None:
+            results = [
+                _portfolio_candidate(prepared, network, ini, s, process_mapping)
+                for s, ini in candidates
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                results = list(
+                    executor.map(
+                        _portfolio_candidate,
+                        [prepared] * len(candidates),
+                        [network] * len(candidates),
+                        [ini for _, ini in candidates],
+                        [s for s, _ in candidates],
+                        [process_mapping] * len(candidates),
+                    )
+                )
+
+        self.portfolio_report = [
+            PortfolioCandidate(s, ini, cost, elapsed)
+            for (s, ini), (_, cost, elapsed) in zip(candidates, results)
+        ]
+        best = min(range(len(results)), key=lambda i: results[i][1])
+        return Distribution(dist_circ, Placement(results[best][0]), network)
+
+    def partition(
+        self,
+        dist_circ: HypergraphCircuit,
+        network: NISQNetwork,
+        ini_path: str,
+        seed: Optional[int],
+        **kwargs,
+    ) -> Distribution:
+        """Run KaHyPar once and make its output valid.
+
+        :param dist_circ: Circuit to distribute.
+        :type dist_circ: HypergraphCircuit
+        :param network: Network onto which ``dist_circ`` should be placed.
+        :type network: NISQNetwork
+        :param ini_path: Path to kahypar ini file.
+        :type ini_path: str
+        :param seed: Seed for randomness.
+        :type seed: Optional[int]
+
+        :key process_mapping: Whether to call ``map_blocks_to_servers``
+            on the partition found by KaHyPar. Default is False.
 
+        :return: Distribution of ``dist_circ`` onto ``network``.
+        :rtype: Distribution
+        """
         # First step is to call KaHyPar using the connectivity metric (i.e. no
         # knowledge about network topology other than server sizes)
         placement = self.initial_distribute(dist_circ, network, ini_path, seed=seed)
+        if kwargs.get("process_mapping", False):
+            placement = self.map_blocks_to_servers(dist_circ, network, placement)
 
         distribution = Distribution(dist_circ, placement, network)
         self.make_valid(distribution, seed=seed)
@@ -80,6 +213,13 @@ class HypergraphPartitioning(Allocator):
         capacity will be satisfied, we enforce this ourselves.
         However, it usually does satisfy the requirement and the following
         code often does nothing or it moves very few vertices.
+
+        All qubit vertices in servers over capacity are considered at once:
+        the gain of moving each of them to each server with free space is
+        kept in a priority queue, and the move with the highest gain is
+        applied until no server is over capacity. After each move, only the
+        gains of the neighbours of the moved vertex are recalculated. This is
+        done by ``GainManager.relieve_overfull_servers``.
         """
         seed = kwargs.get("seed", None)
         if seed is not None:
@@ -88,23 +228,8 @@ class HypergraphPartitioning(Allocator):
         # We will use a ``GainManager`` to manage the calculation of gains
         # (and management of pre-computed values) in a transparent way
         gain_manager = GainManager(distribution)
+        gain_manager.relieve_overfull_servers()
 
-        for vertex in gain_manager.qubit_vertices:
-            # If moving in place is not valid then the current server is full
-            if not gain_manager.is_move_valid(
-                vertex, gain_manager.current_server(vertex)
-            ):
-                # Then, find the first server where the move would be valid
-                for server in gain_manager.occupancy.keys():
-                    if gain_manager.is_move_valid(vertex, server):
-                        # Move ``vertex`` to a server with free spaces and
-                        # return control to the outer loop
-                        gain_manager.move_vertex(vertex, server)
-                        break
-        # Notice that the moves have been arbitrary, i.e. we have not
-        # calculated gains. This is fine since the vertices we moved will
-        # likely be boundary vertices; the following rounds of the
-        # refinement algorithm will move them around to optimise gains.
         # At the end of the previous subroutine, no server should be
         # overpopulated.
         assert gain_manager.distribution.is_valid()
@@ -136,6 +261,9 @@ class HypergraphPartitioning(Allocator):
         :rtype: Placement
         """
 
+        # Imported here, since loading kahypar is slow
+        import kahypar  # type:ignore
+
         if not dist_circ.is_valid():
             raise Exception("This hypergraph is not valid.")
 
@@ -177,10 +305,6 @@ class HypergraphPartitioning(Allocator):
             )
 
             context = kahypar.Context()
-
-            package_path = importlib_resources.files("pytket_dqc")
-            default_ini = f"{package_path}/allocators/km1_kKaHyPar_sea20.ini"
-            ini_path = kwargs.get("ini_path", default_ini)
             context.loadINIconfiguration(ini_path)
 
             context.setK(num_servers)
@@ -199,3 +323,147 @@ class HypergraphPartitioning(Allocator):
             placement = Placement(placement_dict)
 
         return placement
+
+    def map_blocks_to_servers(
+        self,
+        dist_circ: HypergraphCircuit,
+        network: NISQNetwork,
+        placement: Placement,
+    ) -> Placement:
+        """Relabel the blocks of ``placement`` so that the network topology
+        is taken into account. The communication volume between each pair
+        of blocks is estimated from the hyperedges spanning them, and blocks
+        are assigned to servers so that the total volume weighted by server
+        distance is minimised. This is a quadratic assignment problem,
+        which is approximately solved by a greedy construction followed by
+        a local search over swaps of pairs of blocks. Assignments that
+        would place more qubits in a server than it can hold are avoided.
+        The original assignment is kept unless a strictly better one is
+        found.
+
+        :param dist_circ: Circuit that has been partitioned.
+        :type dist_circ: HypergraphCircuit
+        :param network: Network onto which ``dist_circ`` is placed.
+        :type network: NISQNetwork
+        :param placement: Placement whose servers are understood as blocks,
+            such as the one returned by ``initial_distribute``.
+        :type placement: Placement
+
+        :return: Placement of ``dist_circ`` onto ``network``.
+        :rtype: Placement
+        """
+        server_list = network.get_server_list()
+        num_servers = len(server_list)
+        # Any assignment is equivalent if all servers are equidistant
+        if num_servers < 3 or not placement.placement:
+            return placement
+        server_index = {server: i for i, server in enumerate(server_list)}
+
+        distance = network.get_distance_matrix()
+        capacity = np.array([len(network.server_qubits[s]) for s in server_list])
+
+        # Estimate the communication volume between each pair of blocks
+        volume = np.zeros((num_servers, num_servers))
+        for hyperedge in dist_circ.hyperedge_list:
+            blocks = list(
+                {server_index[placement.placement[v]] for v in hyperedge.vertices}
+            )
+            if len(blocks) < 2:
+                continue
+            share = hyperedge.weight / (len(blocks) - 1)
+            for i, a in enumerate(blocks):
+                for b in blocks[i + 1 :]:
+                    volume[a, b] += share
+                    volume[b, a] += share
+        size = np.zeros(num_servers, dtype=int)
+        for vertex in dist_circ.get_qubit_vertices():
+            size[server_index[placement.placement[vertex]]] += 1
+
+        def cost(assignment: np.ndarray) -> float:
+            return float((volume * distance[np.ix_(assignment, assignment)]).sum() / 2)
+
+        def overflow(assignment: np.ndarray) -> int:
+            return int(np.maximum(size - capacity[assignment], 0).sum())
+
+        # Greedy construction: blocks are placed in decreasing order of
+        # their total volume, each on the free server with the lowest
+        # communication cost to the blocks already placed. The first block
+        # is placed on the most central server.
+        assignment = np.full(num_servers, -1)
+        free = set(range(num_servers))
+        for block in np.argsort(-volume.sum(axis=1), kind="stable").tolist():
+            placed = np.flatnonzero(assignment >= 0)
+
+            def greedy_key(server: int) -> tuple[int, float, float, int]:
+                return (
+                    max(size[block] - capacity[server], 0),
+                    float(
+                        (
+                            volume[block, placed] * distance[server, assignment[placed]]
+                        ).sum()
+                    ),
+                    float(distance[server].sum()),
+                    server,
+                )
+
+            server = min(free, key=greedy_key)
+            assignment[block] = server
+            free.remove(server)
+
+        # Local search: apply swaps that do not increase the overflow and
+        # that reduce either the overflow or the communication cost
+        current_cost = cost(assignment)
+        current_overflow = overflow(assignment)
+        improved = True
+        while improved:
+            improved = False
+            for a in range(num_servers):
+                for b in range(a + 1, num_servers):
+                    assignment[a], assignment[b] = assignment[b], assignment[a]
+                    new_cost = cost(assignment)
+                    new_overflow = overflow(assignment)
+                    if new_overflow < current_overflow or (
+                        new_overflow == current_overflow
+                        and new_cost < current_cost - 1e-9
+                    ):
+                        current_cost = new_cost
+                        current_overflow = new_overflow
+                        improved = True
+                    else:
+                        assignment[a], assignment[b] = assignment[b], assignment[a]
+
+        identity = np.arange(num_servers)
+        if (overflow(identity), cost(identity)) <= (current_overflow, current_cost):
+            return placement
+
+        return Placement(
+            {
+                vertex: server_list[assignment[server_index[server]]]
+                for vertex, server in placement.placement.items()
+            }
+        )
+
+
+def _portfolio_candidate(
+    prepared: PreparedCircuit,
+    network: NISQNetwork,
+    ini_path: str,
+    seed: Optional[int],
+    process_mapping: bool,
+) -> tuple[dict[int, int], int, float]:
+    """Run one KaHyPar configuration of a portfolio. Defined at module level
+    so that it may be sent to worker processes.
+
+    :return: The placement found, its ebit cost and the time taken.
+    :rtype: tuple[dict[int, int], int, float]
+    """
+    start = time.perf_counter()
+    distribution = HypergraphPartitioning().partition(
+        prepared.hypergraph_circuit(),
+        network,
+        ini_path,
+        seed,
+        process_mapping=process_mapping,
+    )
+    cost = distribution.cost()
+    return distribution.placement.placement, cost, time.perf_counter() - start
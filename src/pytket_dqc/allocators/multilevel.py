@@ -0,0 +1,389 @@
+# Copyright 2023 Quantinuum and The University of Tokyo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import random
+import numpy as np
+from pytket_dqc.allocators import Allocator, GainManager
+from pytket_dqc.placement import Placement
+from pytket_dqc.circuits import (
+    HypergraphCircuit,
+    Distribution,
+    PreparedCircuit,
+    prepare,
+)
+
+from typing import NamedTuple, Optional, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pytket import Circuit
+    from pytket_dqc.networks import NISQNetwork
+
+
+class CoarseLevel(NamedTuple):
+    """A level of the multilevel hierarchy. Nodes are clusters of qubits,
+    and the finest level has one node per qubit vertex.
+
+    :param weight: Number of qubits in each cluster.
+    :type weight: np.ndarray
+    :param adjacency: For each cluster, maps each neighbouring cluster to
+        the weight of the edge between them.
+    :type adjacency: list[dict[int, float]]
+    :param parent: For each cluster, the cluster of the next coarser level
+        that contains it. None in the coarsest level.
+    :type parent: Optional[np.ndarray]
+    """
+
+    weight: np.ndarray
+    adjacency: list[dict[int, float]]
+    parent: Optional[np.ndarray]
+
+
+class Multilevel(Allocator):
+    """Multilevel partitioner implemented natively, which may be used in
+    place of ``HypergraphPartitioning`` when KaHyPar is not available.
+    Each gate vertex is anchored to one of the qubit vertices it acts on,
+    so that the hypergraph is summarised by a weighted graph of qubits.
+    This graph is coarsened by heavy edge matching, the coarsest graph is
+    partitioned greedily taking server capacities and distances into
+    account, and the partition is refined at each level while uncoarsening.
+    Finally, the placement of the original hypergraph is refined using
+    the gains computed by ``GainManager``.
+    """
+
+    def __init__(self) -> None:
+        pass
+
+    def allocate(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
+        """Distribute ``circ`` onto ``network`` using multilevel
+        partitioning.
+
+        :param circ: Circuit to distribute.
+        :type circ: Union[Circuit, PreparedCircuit]
+        :param network: Network onto which ``circ`` should be placed.
+        :type network: NISQNetwork
+
+        :key seed: Seed for randomness. Default is None.
+        :key coarsening_limit: Coarsening stops once the number of clusters
+            is at most this value. Default is twice the number of servers.
+        :key num_rounds: Max number of refinement rounds at each level.
+            Default is 10.
+
+        :return: Distribution of ``circ`` onto ``network``.
+        :rtype: Distribution
+        """
+
+        prepared = prepare(circ)
+        dist_circ = prepared.hypergraph_circuit()
+        if not network.can_implement(dist_circ):
+            raise Exception("This circuit cannot be implemented on this network.")
+
+        seed = kwargs.get("seed", None)
+        if seed is not None:
+            random.seed(seed)
+        num_rounds = kwargs.get("num_rounds", 10)
+
+        qubit_vertices = dist_circ.get_qubit_vertices()
+        if len(qubit_vertices) == 0:
+            return Distribution(dist_circ, Placement(dict()), network)
+
+        server_list = network.get_server_list()
+        coarsening_limit = kwargs.get("coarsening_limit", 2 * len(server_list))
+        # Plain lists are faster than arrays when accessing single entries
+        if len(server_list) > 1:
+            distance = network.get_distance_matrix().tolist()
+        else:
+            server_list = list(network.server_qubits.keys())
+            distance = [[0]]
+        capacity = [len(network.server_qubits[s]) for s in server_list]
+
+        anchor, adjacency = self.qubit_graph(dist_circ)
+
+        # Coarsening
+        levels = [CoarseLevel(np.ones(len(qubit_vertices), dtype=int), adjacency, None)]
+        max_weight = max(capacity)
+        while len(levels[-1].weight) > coarsening_limit:
+            coarse = _coarsen(levels[-1], max_weight)
+            if coarse is None:
+                break
+            levels[-1] = coarse[0]
+            levels.append(coarse[1])
+
+        # Initial partition of the coarsest level
+        assignment = _initial_partition(levels[-1], distance, capacity)
+
+        # Uncoarsening and refinement
+        for i in reversed(range(len(levels))):
+            if i < len(levels) - 1:
+                parent = levels[i].parent
+                assert parent is not None
+                assignment = assignment[parent]
+            _refine_level(levels[i], assignment, distance, capacity, num_rounds)
+
+        placement_dict = {
+            q: server_list[assignment[i]] for i, q in enumerate(qubit_vertices)
+        }
+        for vertex, q in anchor.items():
+            placement_dict[vertex] = placement_dict[q]
+        distribution = Distribution(dist_circ, Placement(placement_dict), network)
+
+        self.refine_with_gains(distribution, num_rounds=num_rounds)
+
+        return distribution
+
+    def qubit_graph(
+        self, dist_circ: HypergraphCircuit
+    ) -> tuple[dict[int, int], list[dict[int, float]]]:
+        """Summarise ``dist_circ`` as a weighted graph of qubit vertices.
+        Two qubits are connected if some hyperedge of one of them contains
+        a gate acting on the other, and the weight of the edge is the total
+        weight of such hyperedges. Each gate vertex is anchored to the qubit
+        vertex of the first hyperedge it is found in.
+
+        :param dist_circ: The hypergraph to summarise.
+        :type dist_circ: HypergraphCircuit
+
+        :return: The qubit vertex each gate vertex is anchored to, and the
+            adjacency of the graph, indexed by position in
+            ``get_qubit_vertices``.
+        :rtype: tuple[dict[int, int], list[dict[int, float]]]
+        """
+        qubit_vertices = dist_circ.get_qubit_vertices()
+        index = {q: i for i, q in enumerate(qubit_vertices)}
+        # Avoid ``get_vertex_of_qubit``, which searches every vertex
+        qubit_index = {
+            dist_circ.get_qubit_of_vertex(q): i for i, q in enumerate(qubit_vertices)
+        }
+        adjacency: list[dict[int, float]] = [dict() for _ in qubit_vertices]
+        anchor: dict[int, int] = dict()
+
+        for hyperedge in dist_circ.hyperedge_list:
+            qubit = dist_circ.get_qubit_vertex(hyperedge)
+            others = set()
+            for gate_vertex in dist_circ.get_gate_vertices(hyperedge):
+                anchor.setdefault(gate_vertex, qubit)
+                for q in dist_circ.get_gate_of_vertex(gate_vertex).qubits:
+                    others.add(qubit_index[q])
+            u = index[qubit]
+            others.discard(u)
+            for v in others:
+                adjacency[u][v] = adjacency[u].get(v, 0) + hyperedge.weight
+                adjacency[v][u] = adjacency[v].get(u, 0) + hyperedge.weight
+
+        return anchor, adjacency
+
+    def refine_with_gains(self, distribution: Distribution, **kwargs):
+        """Refine ``distribution`` in place, moving boundary vertices to the
+        server of one of their neighbours whenever the gain computed by
+        ``GainManager`` is positive and the move is valid. Servers above
+        their capacity are first relieved by moving out the qubit vertices
+        whose departure is least costly.
+
+        :param distribution: Distribution to refine.
+        :type distribution: Distribution
+
+        :key num_rounds: Max number of refinement rounds. Default is 10.
+        :key seed: Seed for randomness. Default is None.
+        """
+        num_rounds = kwargs.get("num_rounds", 10)
+        seed = kwargs.get("seed", None)
+        if seed is not None:
+            random.seed(seed)
+
+        gain_manager = GainManager(distribution)
+        dist_circ = distribution.circuit
+        placement = distribution.placement
+
+        # Rebalance servers that are over capacity
+        gain_manager.relieve_overfull_servers()
+
+        for _ in range(num_rounds):
+            boundary = dist_circ.get_boundary(placement)
+            random.shuffle(boundary)
+            moves = 0
+            for vertex in boundary:
+                current_server = gain_manager.current_server(vertex)
+                best_gain = 0
+                best_server = current_server
+                for server in sorted(
+                    {
+                        placement.placement[v]
+                        for v in dist_circ.vertex_neighbours[vertex]
+                    }
+                ):
+                    if server == current_server or not gain_manager.is_move_valid(
+                        vertex, server
+                    ):
+                        continue
+                    gain = gain_manager.move_vertex_gain(vertex, server)
+                    if gain > best_gain:
+                        best_gain = gain
+                        best_server = server
+                if best_server != current_server:
+                    gain_manager.move_vertex(vertex, best_server)
+                    moves += 1
+            if moves == 0:
+                break
+
+        assert gain_manager.distribution.is_valid()
+
+
+def _coarsen(
+    level: CoarseLevel, max_weight: int
+) -> Optional[tuple[CoarseLevel, CoarseLevel]]:
+    """Contract a matching of ``level`` chosen greedily, preferring heavy
+    edges between light clusters. Clusters heavier than ``max_weight`` are
+    not created.
+
+    :return: ``level`` with its ``parent`` field set, and the coarser
+        level. None if the matching is too small to be worth contracting.
+    :rtype: Optional[tuple[CoarseLevel, CoarseLevel]]
+    """
+    level_weight = level.weight.tolist()
+    n = len(level_weight)
+    order = list(range(n))
+    random.shuffle(order)
+    order.sort(key=lambda u: level_weight[u])
+
+    parent = [-1] * n
+    num_coarse = 0
+    for u in order:
+        if parent[u] != -1:
+            continue
+        best_v = None
+        best_rating = 0.0
+        for v, w in level.adjacency[u].items():
+            if parent[v] != -1 or level_weight[u] + level_weight[v] > max_weight:
+                continue
+            rating = w / (level_weight[u] * level_weight[v])
+            if rating > best_rating:
+                best_rating = rating
+                best_v = v
+        parent[u] = num_coarse
+        if best_v is not None:
+            parent[best_v] = num_coarse
+        num_coarse += 1
+
+    # Stop if fewer than 10% of the clusters were contracted
+    if num_coarse > 0.9 * n:
+        return None
+
+    weight = [0] * num_coarse
+    adjacency: list[dict[int, float]] = [dict() for _ in range(num_coarse)]
+    for u in range(n):
+        cu = parent[u]
+        weight[cu] += level_weight[u]
+        for v, w in level.adjacency[u].items():
+            cv = parent[v]
+            if cu != cv:
+                adjacency[cu][cv] = adjacency[cu].get(cv, 0) + w
+
+    return (
+        CoarseLevel(level.weight, level.adjacency, np.array(parent)),
+        CoarseLevel(np.array(weight), adjacency, None),
+    )
+
+
+def _connection_cost(
+    level: CoarseLevel, node: int, assignment: list[int], distance: list[list[float]]
+) -> list[float]:
+    """Cost of the edges of ``node`` to its assigned neighbours, for each
+    choice of server for ``node``. The weights of the neighbours are summed
+    per server first, so that each row of ``distance`` is read once per
+    server that the neighbours are assigned to.
+    """
+    weight_in: dict[int, float] = dict()
+    for v, w in level.adjacency[node].items():
+        server = assignment[v]
+        if server >= 0:
+            weight_in[server] = weight_in.get(server, 0) + w
+    return [sum(w * row[s] for s, w in weight_in.items()) for row in distance]
+
+
+def _initial_partition(
+    level: CoarseLevel, distance: list[list[float]], capacity: list[int]
+) -> np.ndarray:
+    """Assign clusters to servers greedily, heaviest first, each to the
+    server with room for it that minimises its connection cost to the
+    clusters already assigned. If no server has room, the cluster is
+    assigned to the server that would be least over capacity; this is
+    fixed during refinement.
+    """
+    level_weight = level.weight.tolist()
+    n = len(level_weight)
+    servers = range(len(capacity))
+    assignment = [-1] * n
+    load = [0] * len(capacity)
+    for node in sorted(range(n), key=lambda u: -level_weight[u]):
+        weight = level_weight[node]
+        cost = _connection_cost(level, node, assignment, distance)
+        server = min(
+            servers,
+            key=lambda s: (
+                max(load[s] + weight - capacity[s], 0),
+                cost[s],
+                load[s] - capacity[s],
+                s,
+            ),
+        )
+        assignment[node] = server
+        load[server] += weight
+    return np.array(assignment)
+
+
+def _refine_level(
+    level: CoarseLevel,
+    assignment: np.ndarray,
+    distance: list[list[float]],
+    capacity: list[int],
+    num_rounds: int,
+):
+    """Move clusters between servers, updating ``assignment`` in place.
+    A cluster is moved if this reduces its connection cost without exceeding
+    the capacity of the target server, or if its current server is over
+    capacity and the target server has room for it.
+    """
+    level_weight = level.weight.tolist()
+    assigned = assignment.tolist()
+    n = len(level_weight)
+    load = [0] * len(capacity)
+    for node, server in enumerate(assigned):
+        load[server] += level_weight[node]
+    for _ in range(num_rounds):
+        order = list(range(n))
+        random.shuffle(order)
+        moves = 0
+        for node in order:
+            current = assigned[node]
+            weight = level_weight[node]
+            cost = _connection_cost(level, node, assigned, distance)
+            fits = [
+                s
+                for s in range(len(capacity))
+                if s != current and load[s] + weight <= capacity[s]
+            ]
+            if not fits:
+                continue
+            target = min(fits, key=lambda s: cost[s])
+            if load[current] > capacity[current] or cost[target] < cost[current]:
+                assigned[node] = target
+                load[current] -= weight
+                load[target] += weight
+                moves += 1
+        if moves == 0:
+            break
+    assignment[:] = assigned
@@ -16,8 +16,8 @@ from __future__ import annotations
 
 from pytket_dqc.allocators import Allocator
 from pytket_dqc.placement import Placement
-from pytket_dqc.circuits import HypergraphCircuit, Distribution
-from typing import TYPE_CHECKING
+from pytket_dqc.circuits import Distribution, PreparedCircuit, prepare
+from typing import Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pytket import Circuit
@@ -75,19 +75,22 @@ class Ordered(Allocator):
     def __init__(self) -> None:
         pass
 
-    def allocate(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def allocate(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         """Distribute ``circ`` onto ``network`` by placing quibts onto
         servers, in decreasing order of size, until they are full.
 
         :param circ: Circuit to distribute.
-        :type circ: pytket.Circuit
+        :type circ: Union[Circuit, PreparedCircuit]
         :param network: Network onto which ``circ`` should be distributed.
         :type network: NISQNetwork
         :return: Distribution of ``circ`` onto ``network``.
         :rtype: Distribution
         """
 
-        dist_circ = HypergraphCircuit(circ)
+        prepared = prepare(circ)
+        dist_circ = prepared.hypergraph_circuit()
         if not network.can_implement(dist_circ):
             raise Exception("This circuit cannot be implemented on this network.")
 
@@ -16,8 +16,8 @@ from __future__ import annotations
 
 from pytket_dqc.allocators import Allocator
 from pytket_dqc.placement import Placement
-from pytket_dqc.circuits import HypergraphCircuit, Distribution
-from typing import TYPE_CHECKING
+from pytket_dqc.circuits import Distribution, PreparedCircuit, prepare
+from typing import Union, TYPE_CHECKING
 import random
 
 if TYPE_CHECKING:
@@ -34,21 +34,24 @@ class Random(Allocator):
     def __init__(self) -> None:
         pass
 
-    def allocate(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def allocate(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         """Distribute ``circ`` onto ``network`` by randomly placing
         vertices onto servers. Qubit vertices are placed onto servers
         until the server is full. Gate vertices are placed on servers at random
         without restriction.
 
         :param circ: Circuit to distribute.
-        :type circ: pytket.Circuit
+        :type circ: Union[Circuit, PreparedCircuit]
         :param network: Network onto which ``circ`` should be distributed.
         :type network: NISQNetwork
         :return: Distribution of ``circ`` onto ``network``.
         :rtype: Distribution
         """
 
-        dist_circ = HypergraphCircuit(circ)
+        prepared = prepare(circ)
+        dist_circ = prepared.hypergraph_circuit()
         if not network.can_implement(dist_circ):
             raise Exception("This circuit cannot be implemented on this network.")
 
@@ -18,9 +18,9 @@ from pytket_dqc.allocators import Allocator
 from pytket.passes import DecomposeSwapsToCXs, PlacementPass, RoutingPass
 from pytket_dqc.placement import Placement
 from pytket_dqc.utils import DQCPass
-from pytket_dqc.circuits import HypergraphCircuit, Distribution
+from pytket_dqc.circuits import Distribution, PreparedCircuit, prepare
 
-from typing import TYPE_CHECKING
+from typing import Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pytket import Circuit
@@ -36,20 +36,23 @@ class Routing(Allocator):
     def __init__(self) -> None:
         pass
 
-    def allocate(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def allocate(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         """Distribute quantum circuits using routing tools available in
         `tket <https://cqcl.github.io/tket/pytket/api/routing.html>`_. Note
         that this allocator will alter the initial circuit.
 
         :param circ: Circuit to distribute.
-        :type circ: pytket.Circuit
+        :type circ: Union[Circuit, PreparedCircuit]
         :param network: Network onto which ``circ`` should be distributed.
         :type network: NISQNetwork
         :return: Distribution of ``circ`` onto ``network``.
         :rtype: Distribution
         """
 
-        dist_circ = HypergraphCircuit(circ)
+        prepared = prepare(circ)
+        dist_circ = prepared.hypergraph_circuit()
         if not network.can_implement(dist_circ):
             raise Exception("This circuit cannot be implemented on this network.")
 
@@ -25,3 +25,7 @@ from .hypergraph import (  # noqa:F401
 )
 
 from .distribution import Distribution  # noqa:F401
+
+from .prepared import PreparedCircuit, prepare  # noqa:F401
+
+from .structure import check_ejpp_structure, StructuralViolation  # noqa:F401
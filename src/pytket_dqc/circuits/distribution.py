@@ -16,7 +16,11 @@ from __future__ import annotations
 from pytket_dqc.circuits import HypergraphCircuit, Hyperedge
 from pytket_dqc.placement import Placement
 from pytket_dqc.networks import NISQNetwork
-from pytket_dqc.utils import steiner_tree, check_equivalence, ConstraintException
+from pytket_dqc.utils import (
+    check_equivalence,
+    check_equivalence_statevector,
+    ConstraintException,
+)
 from pytket_dqc.utils.gateset import (
     start_proc,
     is_start_proc,
@@ -25,18 +29,21 @@ from pytket_dqc.utils.gateset import (
     origin_of_start_proc,
 )
 from pytket_dqc.utils.circuit_analysis import (
-    all_cu1_local,
-    ebit_cost,
+    analyse_distributed_circuit,
     get_server_id,
     is_link_qubit,
 )
 from pytket import Circuit, OpType, Qubit
-from pytket.circuit import Command
+from pytket.circuit import Command, Op
 import networkx as nx  # type: ignore
+from pytket_dqc.utils.binary import write_arrays, read_arrays
+import numpy as np
 from numpy import isclose
+import json
 import warnings
-from typing import NamedTuple
+from typing import Iterable, NamedTuple, Optional
 from .hypergraph import Vertex
+from .structure import check_ejpp_structure
 
 
 class Distribution:
@@ -107,6 +114,147 @@ class Distribution:
             network=NISQNetwork.from_dict(distribution_dict["network"]),
         )
 
+    def to_binary(self, path: str) -> None:
+        """Write the Distribution to ``path`` in a compact binary format,
+        readable by ``from_binary``. The file holds a version header and
+        NumPy arrays describing the placement, the pins of each hyperedge,
+        the network and a table of the commands of the circuit. Operation
+        types are stored by name, as in ``to_dict``.
+
+        :param path: Path of the file to write.
+        :type path: str
+        :raises Exception: Raised if the circuit has symbolic parameters or
+            phase, which cannot be stored as floats.
+        """
+
+        circ = self.circuit._circuit
+        if circ.free_symbols():
+            raise Exception(
+                "Circuits with symbolic parameters cannot be written in binary "
+                + "format. Substitute the symbols with ``symbol_substitution`` "
+                + "first, or use ``to_dict``."
+            )
+
+        def flatten(lists: list[list], dtype) -> tuple[np.ndarray, np.ndarray]:
+            # Concatenation of ``lists`` and the offset where each one starts
+            offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum([len(x) for x in lists])
+            flat = np.array([v for x in lists for v in x], dtype=dtype)
+            return offsets, flat
+
+        qubits = circ.qubits
+        qubit_index = {qubit: i for i, qubit in enumerate(qubits)}
+        commands = circ.get_commands()
+        op_types = list(dict.fromkeys(command.op.type.name for command in commands))
+        op_type_index = {name: i for i, name in enumerate(op_types)}
+        hyperedges = self.circuit.hyperedge_list
+        network = self.network
+        servers = sorted(network.server_qubits)
+
+        arrays: dict[str, np.ndarray] = dict()
+        arrays["qubit_names"] = np.frombuffer(
+            json.dumps([qubit.to_list() for qubit in qubits]).encode(), dtype=np.uint8
+        )
+        arrays["phase"] = np.array([float(circ.phase)])
+        arrays["op_types"] = np.frombuffer(
+            json.dumps(op_types).encode(), dtype=np.uint8
+        )
+        arrays["command_types"] = np.array(
+            [op_type_index[command.op.type.name] for command in commands],
+            dtype=np.int32,
+        )
+        arrays["command_param_offsets"], arrays["command_params"] = flatten(
+            [[float(p) for p in command.op.params] for command in commands],
+            np.float64,
+        )
+        arrays["command_qubit_offsets"], arrays["command_qubits"] = flatten(
+            [[qubit_index[q] for q in command.qubits] for command in commands],
+            np.int64,
+        )
+        arrays["vertices"] = np.array(self.circuit.vertex_list, dtype=np.int64)
+        arrays["hyperedge_offsets"], arrays["hyperedge_pins"] = flatten(
+            [hyperedge.vertices for hyperedge in hyperedges], np.int64
+        )
+        arrays["hyperedge_weights"] = np.array(
+            [hyperedge.weight for hyperedge in hyperedges], dtype=np.int64
+        )
+        arrays["placement"] = np.array(
+            list(self.placement.placement.items()), dtype=np.int64
+        ).reshape(-1, 2)
+        arrays["server_coupling"] = np.array(
+            network.server_coupling, dtype=np.int64
+        ).reshape(-1, 2)
+        arrays["servers"] = np.array(servers, dtype=np.int64)
+        arrays["server_qubit_offsets"], arrays["server_qubits"] = flatten(
+            [network.server_qubits[s] for s in servers], np.int64
+        )
+        arrays["server_ebit_mem"] = np.array(
+            [network.server_ebit_mem[s] for s in servers], dtype=np.int64
+        )
+
+        write_arrays(path, arrays)
+
+    @classmethod
+    def from_binary(cls, path: str, mmap: bool = True) -> Distribution:
+        """Construct ``Distribution`` instance from a file written by
+        ``to_binary``. The hypergraph is rebuilt directly from the stored
+        hyperedges, rather than from the circuit.
+
+        :param path: Path of the file to read.
+        :type path: str
+        :param mmap: Whether to memory-map the file rather than reading it
+            into memory. Default is True.
+        :type mmap: bool
+        :return: Distribution instance stored in the file.
+        :rtype: Distribution
+        """
+
+        arrays = read_arrays(path, mmap=mmap)
+
+        def unflatten(offsets: np.ndarray, flat: np.ndarray) -> list[list]:
+            bounds = offsets.tolist()
+            values = flat.tolist()
+            return [values[bounds[i] : bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+        qubits = [
+            Qubit.from_list(qubit)
+            for qubit in json.loads(arrays["qubit_names"].tobytes())
+        ]
+        circ = Circuit()
+        for qubit in qubits:
+            circ.add_qubit(qubit)
+        circ.add_phase(float(arrays["phase"][0]))
+        op_types = [OpType[name] for name in json.loads(arrays["op_types"].tobytes())]
+        params = unflatten(arrays["command_param_offsets"], arrays["command_params"])
+        args = unflatten(arrays["command_qubit_offsets"], arrays["command_qubits"])
+        for op_type, op_params, op_args in zip(
+            arrays["command_types"].tolist(), params, args
+        ):
+            circ.add_gate(op_types[op_type], op_params, [qubits[i] for i in op_args])
+
+        pins = unflatten(arrays["hyperedge_offsets"], arrays["hyperedge_pins"])
+        hyperedges = [
+            Hyperedge(vertices, weight)
+            for vertices, weight in zip(pins, arrays["hyperedge_weights"].tolist())
+        ]
+        hyp_circ = HypergraphCircuit.from_hyperedges(
+            circ, arrays["vertices"].tolist(), hyperedges
+        )
+
+        placement = Placement(dict(arrays["placement"].tolist()))
+
+        servers = arrays["servers"].tolist()
+        server_qubits = unflatten(
+            arrays["server_qubit_offsets"], arrays["server_qubits"]
+        )
+        network = NISQNetwork(
+            server_coupling=arrays["server_coupling"].tolist(),
+            server_qubits=dict(zip(servers, server_qubits)),
+            server_ebit_mem=dict(zip(servers, arrays["server_ebit_mem"].tolist())),
+        )
+
+        return cls(circuit=hyp_circ, placement=placement, network=network)
+
     def is_valid(self) -> bool:
         """Check that this distribution can be implemented."""
 
@@ -120,8 +268,8 @@ class Distribution:
         NOTE: this function does not guarantee that the distribution being
         analysed satisfies the bound to the link qubit registers. If you wish
         to take the bound into account, call ``to_pytket_circuit`` before
-        calling this function. Alternatively, call ``ebit_cost`` on the
-        distributed circuit.
+        calling this function. Alternatively, call ``ebit_cost`` or
+        ``analyse_distributed_circuit`` on the distributed circuit.
 
         :return: The number of ebits used in this distribution.
         :rtype: int
@@ -222,6 +370,163 @@ class Distribution:
 
         return len(self.detached_gate_list())
 
+    def transfer_placement(
+        self, dist_circ: HypergraphCircuit
+    ) -> tuple[Placement, set[Vertex]]:
+        """Map the placement of this distribution onto ``dist_circ``, the
+        hypergraph of a circuit that is similar to this one, so that it may
+        be used as the starting point of allocators and refiners.
+
+        Qubit vertices are matched by their qubit. Gate vertices are matched
+        by their position: the k-th gate of each type acting on the same
+        qubits in ``dist_circ`` is matched with the k-th such gate in this
+        distribution, regardless of its parameters. Qubit vertices without
+        a match are placed on the servers with most free space, and gate
+        vertices without a match are placed in the server of their first
+        qubit.
+
+        :param dist_circ: The hypergraph to place on ``self.network``.
+        :type dist_circ: HypergraphCircuit
+        :raises Exception: Raised if ``dist_circ`` cannot be implemented on
+            ``self.network``.
+        :return: A valid placement of ``dist_circ``, and the vertices of
+            ``dist_circ`` in the region affected by the differences between
+            the circuits. These are the vertices without a match, the qubit
+            vertices of gates with no match in ``dist_circ``, and all of
+            their neighbours.
+        :rtype: tuple[Placement, set[Vertex]]
+        """
+        if not self.network.can_implement(dist_circ):
+            raise Exception("This circuit cannot be implemented on this network.")
+
+        def gate_keys(circ: HypergraphCircuit) -> dict[tuple, Vertex]:
+            keys: dict[tuple, Vertex] = dict()
+            count: dict[tuple, int] = dict()
+            for vertex in circ.vertex_list:
+                if circ.is_qubit_vertex(vertex):
+                    continue
+                command = circ.get_gate_of_vertex(vertex)
+                signature = (tuple(command.qubits), command.op.type)
+                count[signature] = count.get(signature, -1) + 1
+                keys[signature + (count[signature],)] = vertex
+            return keys
+
+        old_placement = self.placement.placement
+        old_qubit_server = {
+            self.circuit.get_qubit_of_vertex(v): old_placement[v]
+            for v in self.circuit.get_qubit_vertices()
+        }
+        old_gate_keys = gate_keys(self.circuit)
+        new_gate_keys = gate_keys(dist_circ)
+        qubit_vertex = {
+            dist_circ.get_qubit_of_vertex(v): v for v in dist_circ.get_qubit_vertices()
+        }
+
+        placement_dict: dict[Vertex, int] = dict()
+        changed: set[Vertex] = set()
+
+        free_space = {
+            server: len(qubits) for server, qubits in self.network.server_qubits.items()
+        }
+        for qubit, vertex in qubit_vertex.items():
+            if qubit in old_qubit_server:
+                placement_dict[vertex] = old_qubit_server[qubit]
+                free_space[old_qubit_server[qubit]] -= 1
+            else:
+                changed.add(vertex)
+        for vertex in sorted(changed):
+            server = max(free_space, key=lambda s: (free_space[s], -s))
+            placement_dict[vertex] = server
+            free_space[server] -= 1
+
+        for key, vertex in new_gate_keys.items():
+            if key in old_gate_keys:
+                placement_dict[vertex] = old_placement[old_gate_keys[key]]
+            else:
+                first_qubit = dist_circ.get_gate_of_vertex(vertex).qubits[0]
+                placement_dict[vertex] = placement_dict[qubit_vertex[first_qubit]]
+                changed.add(vertex)
+        # The hyperedges of the qubits of removed gates have changed too
+        for key, vertex in old_gate_keys.items():
+            if key not in new_gate_keys:
+                for qubit in self.circuit.get_gate_of_vertex(vertex).qubits:
+                    if qubit in qubit_vertex:
+                        changed.add(qubit_vertex[qubit])
+
+        region = set(changed)
+        for vertex in changed:
+            region.update(dist_circ.vertex_neighbours[vertex])
+
+        return Placement(placement_dict), region
+
+    def apply_edit(
+        self,
+        append: Optional[Circuit] = None,
+        replace: Optional[dict[int, Op]] = None,
+        remove: Optional[Iterable[int]] = None,
+    ) -> set[Vertex]:
+        """Edit the circuit of this distribution in place, as described in
+        ``HypergraphCircuit.apply_edit``, and update the placement to match.
+        Hyperedges that are not affected by the edit, including those
+        resulting from merges, are kept as they are.
+
+        Every vertex that remains keeps its server. Each new gate vertex is
+        placed in the server of one of its qubits, choosing the one that
+        minimises the cost of the hyperedges containing it.
+
+        :param append: Commands to append at the end of the circuit.
+        :type append: Optional[Circuit]
+        :param replace: Maps the index of a command to the operation that
+            replaces it, which acts on the same qubits.
+        :type replace: Optional[dict[int, Op]]
+        :param remove: Indices of commands to remove.
+        :type remove: Optional[Iterable[int]]
+        :return: The region affected by the edit: the qubit vertices acted
+            on by edited commands, the new gate vertices and all of their
+            neighbours. It may be given to :class:`.BoundaryReallocation`
+            as ``active_vertices`` to refine the distribution locally.
+        :rtype: set[Vertex]
+        """
+        vertex_map, changed = self.circuit.apply_edit(
+            append=append, replace=replace, remove=remove
+        )
+
+        placement = {
+            vertex_map[vertex]: server
+            for vertex, server in self.placement.placement.items()
+            if vertex in vertex_map
+        }
+        qubit_vertex = {
+            self.circuit.get_qubit_of_vertex(v): v
+            for v in self.circuit.get_qubit_vertices()
+        }
+        new_vertices = sorted(v for v in changed if not self.circuit.is_qubit_vertex(v))
+        for vertex in new_vertices:
+            first_qubit = self.circuit.get_gate_of_vertex(vertex).qubits[0]
+            placement[vertex] = placement[qubit_vertex[first_qubit]]
+        self.placement.placement = placement
+
+        def cost_in_server(vertex: Vertex, server: int) -> int:
+            placement[vertex] = server
+            return sum(
+                self.hyperedge_cost(hedge)
+                for hedge in self.circuit.hyperedge_dict[vertex]
+            )
+
+        for vertex in new_vertices:
+            servers = {
+                placement[qubit_vertex[qubit]]
+                for qubit in self.circuit.get_gate_of_vertex(vertex).qubits
+            }
+            placement[vertex] = min(
+                sorted(servers), key=lambda s: cost_in_server(vertex, s)
+            )
+
+        region = set(changed)
+        for vertex in changed:
+            region.update(self.circuit.vertex_neighbours[vertex])
+        return region
+
     def hyperedge_cost(self, hyperedge: Hyperedge, **kwargs) -> int:
         """First, we check whether the hyperedge requires H-embeddings to be
         implemented. If not, we calculate its cost by counting the number of
@@ -269,7 +574,7 @@ class Distribution:
         servers = [placement_map[v] for v in hyperedge.vertices]
         # Obtain the Steiner tree or check that the one given is valid
         if tree is None:
-            tree = steiner_tree(self.network.get_server_nx(), servers)
+            tree = self.network.get_steiner_tree(servers)
         else:
             assert all(s in tree.nodes for s in servers)
 
@@ -406,7 +711,10 @@ class Distribution:
         return qubit_map
 
     def to_pytket_circuit(
-        self, satisfy_bound: bool = True, allow_update: bool = False
+        self,
+        satisfy_bound: bool = True,
+        allow_update: bool = False,
+        verify: str = "structural",
     ) -> Circuit:
         """Generate the circuit corresponding to this `Distribution`.
 
@@ -418,17 +726,30 @@ class Distribution:
             this method, in order to make it satisfy the network's
             communication capacity (in case it has been bounded). Optional
             parameter, defaults to False.
+        :param verify: How the output circuit is checked against the
+            original one. ``"structural"`` only runs
+            ``check_ejpp_structure``, which takes linear time. ``"zx"``
+            also proves equivalence with ``check_equivalence``, and
+            ``"sampled"`` also compares the circuits on random input states
+            with ``check_equivalence_statevector``. Both are much slower and
+            are meant for sampled verification. Optional parameter,
+            defaults to ``"structural"``.
+        :type verify: str
         :raise ``ConstraintException``: If a server's communication capacity
             is exceeded, `satisfy_bound` was set to True and `allow_update`
             was set to False.
+        :raise Exception: If ``verify`` is not one of the options above, or
+            if the output circuit fails verification.
         """
+        if verify not in ["structural", "zx", "sampled"]:
+            raise Exception(f"Unknown verification method {verify}.")
         if not self.is_valid():
             raise Exception("The distribution of the circuit is not valid!")
 
         # -- SCOPE VARIABLES -- #
         # Accessible to the internal class below
         hyp_circ = self.circuit
-        server_graph = self.network.get_server_nx()
+        network = self.network
         placement_map = self.placement.placement
         qubit_mapping = self.get_qubit_mapping()
         server_ebit_mem = self.network.server_ebit_mem
@@ -533,7 +854,7 @@ class Distribution:
                 q_vertex = hyp_circ.get_qubit_vertex(hyperedge)
                 home_server = placement_map[q_vertex]
                 hyp_servers = [placement_map[v] for v in hyperedge.vertices]
-                tree = steiner_tree(server_graph, hyp_servers)
+                tree = network.get_steiner_tree(hyp_servers)
                 assert target in hyp_servers
 
                 # For each server connected to the qubit in ``hyperedge``,
@@ -1214,7 +1535,7 @@ class Distribution:
                     # Check that this hyperedge actually uses a link
                     # qubit on `e.server`.
                     h_servers = [placement_map[v] for v in h.vertices]
-                    tree = steiner_tree(server_graph, h_servers)
+                    tree = network.get_steiner_tree(h_servers)
                     # If it does, it's the best split so far, otherwise skip.
                     if e.server in tree.nodes:
                         longest_dist = dist
@@ -1271,7 +1592,7 @@ class Distribution:
             assert hyp_circ is self.circuit
 
             # Run to_pytket_circuit on the updated distribution
-            return self.to_pytket_circuit(allow_update=allow_update)
+            return self.to_pytket_circuit(allow_update=allow_update, verify=verify)
 
         # Turn every CZ (correction) gate to CU1; remove barriers
         # Remove the origin qubit from the name of each start_proc
@@ -1289,9 +1610,25 @@ class Distribution:
                 final_circ.add_gate(cmd.op, cmd.qubits)
 
         # Final sanity checks
-        assert all_cu1_local(final_circ)
-        assert check_equivalence(self.circuit.get_circuit(), final_circ, qubit_mapping)
-        if ebit_cost(final_circ) != self.cost():
+        analysis = analyse_distributed_circuit(final_circ)
+        assert analysis.all_cu1_local
+        # The structural check is cheap and, unlike ZX, points at the
+        # offending command
+        violations = check_ejpp_structure(self, final_circ)
+        if violations:
+            index, message = violations[0]
+            raise Exception(
+                f"The circuit generated is not valid. Command {index}: {message}"
+            )
+        if verify == "zx":
+            assert check_equivalence(
+                self.circuit.get_circuit(), final_circ, qubit_mapping
+            )
+        elif verify == "sampled":
+            assert check_equivalence_statevector(
+                self.circuit.get_circuit(), final_circ, qubit_mapping
+            )
+        if analysis.ebit_cost != self.cost():
             detached_gates = self.detached_gate_list()
             embedded_gates = self.circuit.get_all_h_embedded_gate_vertices()
             # If a gate is both detached and embedded, the cost estimate may
@@ -1302,12 +1639,12 @@ class Distribution:
                     "Detected a gate that is both detached and embedded. "
                     + "As a consequence, the estimated cost did not match "
                     + f"actual cost. Estimate: {self.cost()}, "
-                    + f"real: {ebit_cost(final_circ)}."
+                    + f"real: {analysis.ebit_cost}."
                 )
             else:
                 raise Exception(
                     "Estimated cost does not match actual cost. Estimate: "
-                    + f"{self.cost()}, real: {ebit_cost(final_circ)}."
+                    + f"{self.cost()}, real: {analysis.ebit_cost}."
                 )
 
         return final_circ
@@ -14,7 +14,7 @@
 
 from __future__ import annotations
 
-import hypernetx as hnx  # type: ignore
+from pytket_dqc.utils.fingerprint import new_hasher
 
 from typing import TYPE_CHECKING, Tuple, NamedTuple, Optional, Union, cast
 
@@ -86,6 +86,7 @@ class Hypergraph:
         self.hyperedge_list: list[Hyperedge] = []
         self.hyperedge_dict: dict[Vertex, list[Hyperedge]] = dict()
         self.vertex_neighbours: dict[Vertex, set[Vertex]] = dict()
+        self._fingerprint: Optional[str] = None
 
     def __str__(self) -> str:
         out_string = f"Hyperedges: {self.hyperedge_list}"
@@ -150,6 +151,29 @@ class Hypergraph:
 
         return hypergraph
 
+    def fingerprint(self) -> str:
+        """Return a fingerprint of the hypergraph, computed by streaming its
+        vertices and hyperedges into a hash. The fingerprint is cached and
+        recomputed after the hypergraph is modified through its methods.
+
+        :return: Hexadecimal digest of the hypergraph.
+        :rtype: str
+        """
+        if self._fingerprint is None:
+            hasher = new_hasher()
+            self._update_fingerprint(hasher)
+            self._fingerprint = hasher.hexdigest()
+        return self._fingerprint
+
+    def _update_fingerprint(self, hasher) -> None:
+        """Stream the vertices and hyperedges into ``hasher``."""
+        hasher.update(f"{self.vertex_list}\n".encode())
+        for hyperedge in self.hyperedge_list:
+            hasher.update(f"{hyperedge.vertices}{hyperedge.weight}\n".encode())
+
+    def _invalidate_fingerprint(self) -> None:
+        self._fingerprint = None
+
     def merge_hyperedge(self, to_merge_hyperedge_list: list[Hyperedge]) -> Hyperedge:
         """Merge vertices of each of the hyperedges in to_merge_hyperedge_list
         into a single hyperedge. The new hyperedge will appear in
@@ -315,6 +339,7 @@ class Hypergraph:
         if old_hyperedge not in self.hyperedge_list:
             raise KeyError(f"The hyperedge {old_hyperedge} is not in this hypergraph.")
 
+        self._invalidate_fingerprint()
         self.hyperedge_list.remove(old_hyperedge)
         # For every vertex in the hyperedge being removed, update
         # appropriately if it is still a neighbour to other vertices.
@@ -388,6 +413,8 @@ class Hypergraph:
 
     def draw(self):
         """Draw hypergraph, using hypernetx package."""
+        import hypernetx as hnx  # type: ignore
+
         scenes = {}
         for i, edge in enumerate(self.hyperedge_list):
             scenes[str(i)] = set(edge.vertices)
@@ -401,6 +428,7 @@ class Hypergraph:
         :type vertex: Vertex
         """
         if vertex not in self.vertex_list:
+            self._invalidate_fingerprint()
             self.vertex_list.append(vertex)
             self.hyperedge_dict[vertex] = []
             self.vertex_neighbours[vertex] = set()
@@ -466,6 +494,7 @@ class Hypergraph:
             self.vertex_neighbours[vertex].update(vertices)
             self.vertex_neighbours[vertex].remove(vertex)
 
+        self._invalidate_fingerprint()
         if hyperedge_list_index is None:
             self.hyperedge_list.append(hyperedge)
         else:
@@ -17,18 +17,19 @@ from __future__ import annotations
 from .hypergraph import Hypergraph, Hyperedge, Vertex
 from pytket import OpType, Circuit, Qubit
 from pytket.circuit import Command, Op, Unitary2qBox
-from scipy.stats import unitary_group  # type: ignore
 import numpy as np
 from pytket.passes import DecomposeBoxes
 import networkx as nx  # type: ignore
 import random
+from bisect import bisect_left, bisect_right
 from pytket_dqc.utils import (
     dqc_gateset_predicate,
     DQCPass,
 )
 from pytket_dqc.utils.gateset import to_euler_with_two_hadamards
+from pytket_dqc.utils.fingerprint import update_with_circuit
 
-from typing import TYPE_CHECKING, Union, Optional, cast
+from typing import TYPE_CHECKING, Iterable, Union, Optional, cast
 
 if TYPE_CHECKING:
     from pytket_dqc import Placement
@@ -123,6 +124,75 @@ class HypergraphCircuit(Hypergraph):
             )
         return hypergraph_circuit
 
+    @classmethod
+    def from_hyperedges(
+        cls,
+        circuit: Circuit,
+        vertex_list: list[Vertex],
+        hyperedge_list: list[Hyperedge],
+    ) -> HypergraphCircuit:
+        """Construct ``HypergraphCircuit`` instance from a circuit and its
+        hypergraph, as previously found by ``from_circuit`` and possibly
+        modified afterwards. Unlike ``from_dict``, the hypergraph is not
+        first built from the circuit, and the hyperedges are added in a
+        single pass rather than one at a time through ``add_hyperedge``.
+        The circuit is assumed to be in the valid gateset and the hyperedges
+        are not checked.
+
+        :param circuit: Circuit of the hypergraph.
+        :type circuit: Circuit
+        :param vertex_list: Vertices of the hypergraph.
+        :type vertex_list: list[Vertex]
+        :param hyperedge_list: Hyperedges of the hypergraph, in order.
+        :type hyperedge_list: list[Hyperedge]
+        :return: HypergraphCircuit instance with the given hypergraph.
+        :rtype: HypergraphCircuit
+        """
+
+        hypergraph_circuit = cls.__new__(cls)
+        Hypergraph.__init__(hypergraph_circuit)
+        hypergraph_circuit._circuit = circuit
+        hypergraph_circuit._commands = []
+
+        n_qubits = circuit.n_qubits
+        vertex_circuit_map: dict[int, dict] = {
+            i: {"type": "qubit", "node": qubit}
+            for i, qubit in enumerate(circuit.qubits)
+        }
+        for command in circuit.get_commands():
+            if command.op.type in [OpType.CZ, OpType.CU1, OpType.CX]:
+                vertex = len(vertex_circuit_map)
+                vertex_circuit_map[vertex] = {"type": "gate", "command": command}
+                hypergraph_circuit._commands.append(
+                    {
+                        "command": command,
+                        "two q gate count": vertex - n_qubits,
+                        "vertex": vertex,
+                        "type": "distributed gate",
+                    }
+                )
+            else:
+                hypergraph_circuit._commands.append(
+                    {"command": command, "type": "1q local gate"}
+                )
+        hypergraph_circuit._vertex_circuit_map = vertex_circuit_map
+
+        hypergraph_circuit.vertex_list = list(vertex_list)
+        hypergraph_circuit.hyperedge_list = list(hyperedge_list)
+        hyperedge_dict = hypergraph_circuit.hyperedge_dict
+        vertex_neighbours = hypergraph_circuit.vertex_neighbours
+        for vertex in vertex_list:
+            hyperedge_dict[vertex] = []
+            vertex_neighbours[vertex] = set()
+        for hyperedge in hyperedge_list:
+            for vertex in hyperedge.vertices:
+                hyperedge_dict[vertex].append(hyperedge)
+                vertex_neighbours[vertex].update(hyperedge.vertices)
+        for vertex, neighbours in vertex_neighbours.items():
+            neighbours.discard(vertex)
+
+        return hypergraph_circuit
+
     def place(self, placement: Placement):
         if not self.is_placement(placement):
             raise Exception("This is not a valid placement of this circuit")
@@ -144,6 +214,44 @@ class HypergraphCircuit(Hypergraph):
     def get_circuit(self):
         return self._circuit.copy()
 
+    def copy(self) -> HypergraphCircuit:
+        """Return a copy of the HypergraphCircuit whose hypergraph may be
+        modified independently of this one. The circuit and the hyperedges,
+        which are never modified in place, are shared. Unlike building a new
+        HypergraphCircuit from the circuit, the gateset is not verified
+        again and the hypergraph is not rebuilt.
+
+        :return: Copy of the HypergraphCircuit.
+        :rtype: HypergraphCircuit
+        """
+
+        hypergraph_circuit = self.__class__.__new__(self.__class__)
+        Hypergraph.__init__(hypergraph_circuit)
+        hypergraph_circuit._circuit = self._circuit
+        hypergraph_circuit._vertex_circuit_map = dict(self._vertex_circuit_map)
+        hypergraph_circuit._commands = [dict(command) for command in self._commands]
+        hypergraph_circuit._fingerprint = self._fingerprint
+
+        hypergraph_circuit.vertex_list = list(self.vertex_list)
+        hypergraph_circuit.hyperedge_list = list(self.hyperedge_list)
+        hypergraph_circuit.hyperedge_dict = {
+            vertex: list(hyperedges)
+            for vertex, hyperedges in self.hyperedge_dict.items()
+        }
+        hypergraph_circuit.vertex_neighbours = {
+            vertex: set(neighbours)
+            for vertex, neighbours in self.vertex_neighbours.items()
+        }
+
+        return hypergraph_circuit
+
+    def _update_fingerprint(self, hasher) -> None:
+        """Stream the commands of the circuit, followed by the vertices and
+        hyperedges of the hypergraph, into ``hasher``.
+        """
+        update_with_circuit(hasher, self._circuit)
+        super()._update_fingerprint(hasher)
+
     def add_hyperedge(
         self,
         vertices: list[Vertex],
@@ -231,6 +339,7 @@ class HypergraphCircuit(Hypergraph):
         """
         self.add_vertex(vertex)
         self._vertex_circuit_map[vertex] = {"type": "qubit", "node": qubit}
+        self._invalidate_fingerprint()
 
     def get_qubit_vertices(self) -> list[Vertex]:
         """Return list of vertices which correspond to qubits
@@ -256,6 +365,7 @@ class HypergraphCircuit(Hypergraph):
         """
         self.add_vertex(vertex)
         self._vertex_circuit_map[vertex] = {"type": "gate", "command": command}
+        self._invalidate_fingerprint()
 
     def is_qubit_vertex(self, vertex: Vertex) -> bool:
         """Checks if the given vertex corresponds to a qubit.
@@ -515,6 +625,9 @@ class HypergraphCircuit(Hypergraph):
         """Returns the list of gate vertices that are embedded on the
         given hyperedge.
         """
+        if not self.get_gate_vertices(hyperedge):
+            return []
+
         subcircuit = self.get_hyperedge_subcircuit(hyperedge)
         gate_vertices_in_subcircuit = []
         h_embedded_gate_vertices = []
@@ -671,6 +784,506 @@ class HypergraphCircuit(Hypergraph):
         # gates that may be implemented via EJPP packing.
         assert self.weight_one_predicate()
 
+    def apply_edit(
+        self,
+        append: Optional[Circuit] = None,
+        replace: Optional[dict[int, Op]] = None,
+        remove: Optional[Iterable[int]] = None,
+    ) -> tuple[dict[Vertex, Vertex], set[Vertex]]:
+        """Edit the circuit in place and update the hypergraph to match,
+        without building it again from scratch. Commands are referred to by
+        their index in the list of commands of the circuit before the edit,
+        which is the order in which gate vertices are numbered. The
+        replacements are applied first, then the removals and finally the
+        appended commands.
+
+        Gate vertices are renumbered so that they remain in the order of
+        the commands of the edited circuit. Only the hyperedges of qubits
+        acted on by edited commands are rebuilt. Hyperedges of these qubits
+        that are the result of merges are kept, unless an edited command
+        lies within them and either it involves a Hadamard gate or the
+        hyperedge spans a Hadamard gate. In that case the merge may no
+        longer be valid and the hyperedge is split as in ``from_circuit``.
+        Only the vertices in rebuilt or renumbered hyperedges are updated.
+
+        :param append: Commands to append at the end of the circuit. They
+            may only act on qubits of the circuit.
+        :type append: Optional[Circuit]
+        :param replace: Maps the index of a command to the operation that
+            replaces it, which acts on the same qubits.
+        :type replace: Optional[dict[int, Op]]
+        :param remove: Indices of commands to remove.
+        :type remove: Optional[Iterable[int]]
+        :raises Exception: Raised if an index does not correspond to a
+            command, if a command is both replaced and removed, if
+            ``append`` acts on new qubits or if an inserted command is not in
+            the valid gateset.
+        :return: A map from the vertices before the edit to their vertices
+            after it, which omits the vertices of removed gates, and the
+            vertices whose hyperedges were rebuilt. These are the qubit
+            vertices acted on by edited commands and the new gate vertices.
+        :rtype: tuple[dict[Vertex, Vertex], set[Vertex]]
+        """
+        replace = dict() if replace is None else replace
+        removed = set() if remove is None else set(remove)
+        for index in removed | set(replace):
+            if not 0 <= index < len(self._commands):
+                raise Exception(f"There is no command with index {index}.")
+        if removed & set(replace):
+            raise Exception("A command cannot be both replaced and removed.")
+
+        qubits = self._circuit.qubits
+        if append is not None and not set(append.qubits) <= set(qubits):
+            raise Exception("Appended commands must act on existing qubits.")
+
+        # The rest of the circuit is already in the valid gateset, so only
+        # the inserted commands are checked, before any edit is applied.
+        inserted = Circuit()
+        for qubit in qubits:
+            inserted.add_qubit(qubit)
+        for index, op in replace.items():
+            inserted.add_gate(
+                op, cast(Command, self._commands[index]["command"]).qubits
+            )
+        if append is not None:
+            for command in append.get_commands():
+                inserted.add_gate(command.op, command.qubits)
+        if not dqc_gateset_predicate.verify(inserted):
+            raise Exception("The inserted commands are not in a valid gateset.")
+
+        # Replacing an operation keeps the position of each command along the
+        # wire of its first qubit, which identifies the commands to remove in
+        # the circuit once replacements are applied
+        removed_positions = {self._wire_positions()[i] for i in removed}
+
+        vertex_map: dict[Vertex, Vertex] = {v: v for v in self.vertex_list}
+        edits: list[tuple[dict[Vertex, Vertex], set[Vertex]]] = []
+        if replace:
+            edits.append(self._replace_commands(replace))
+        if removed:
+            if replace:
+                removed = {
+                    i
+                    for i, position in enumerate(self._wire_positions())
+                    if position in removed_positions
+                }
+            edits.append(self._remove_commands(removed))
+        if append is not None:
+            edits.append(self._append_commands(append))
+
+        changed: set[Vertex] = set()
+        for edit_map, edit_changed in edits:
+            vertex_map = {
+                v: edit_map[u] for v, u in vertex_map.items() if u in edit_map
+            }
+            changed = {edit_map[v] for v in changed if v in edit_map} | edit_changed
+        return vertex_map, changed
+
+    def _replace_commands(
+        self, replace: dict[int, Op]
+    ) -> tuple[dict[Vertex, Vertex], set[Vertex]]:
+        """Replace the operation of the commands at the indices in
+        ``replace``, as described in ``apply_edit``. The operations are
+        assumed to be in the valid gateset.
+        """
+        circuit = self._rebuilt_circuit(set(), replace)
+        return self._update_after_edit(circuit, replace, set(), [])
+
+    def _remove_commands(
+        self, removed: set[int]
+    ) -> tuple[dict[Vertex, Vertex], set[Vertex]]:
+        """Remove the commands at the indices in ``removed``, as described in
+        ``apply_edit``.
+        """
+        circuit = self._rebuilt_circuit(removed, dict())
+        return self._update_after_edit(circuit, dict(), removed, [])
+
+    def _append_commands(
+        self, append: Circuit
+    ) -> tuple[dict[Vertex, Vertex], set[Vertex]]:
+        """Append the commands of ``append`` to the circuit, as described in
+        ``apply_edit``. They are assumed to be in the valid gateset and to
+        act on qubits of the circuit.
+        """
+        appended = append.get_commands()
+        circuit = self._circuit.copy()
+        for command in appended:
+            circuit.add_gate(command.op, command.qubits)
+        return self._update_after_edit(circuit, dict(), set(), appended)
+
+    def _rebuilt_circuit(self, removed: set[int], replace: dict[int, Op]) -> Circuit:
+        """Return a copy of the circuit without the commands at the indices
+        in ``removed`` and with the operations in ``replace``. pytket can
+        neither remove nor substitute a command, so the circuit is rebuilt.
+        """
+        circuit = Circuit()
+        for qubit in self._circuit.qubits:
+            circuit.add_qubit(qubit)
+        circuit.add_phase(self._circuit.phase)
+        for index, command_dict in enumerate(self._commands):
+            if index not in removed:
+                command = cast(Command, command_dict["command"])
+                circuit.add_gate(replace.get(index, command.op), command.qubits)
+        return circuit
+
+    def _wire_positions(self) -> list[tuple[Qubit, int]]:
+        """Return the first qubit of each command and its position among the
+        commands whose first qubit is the same. pytket may reorder commands
+        acting on different qubits, but the order along each wire is
+        preserved, so this identifies commands across edits.
+        """
+        position: dict[Qubit, int] = dict()
+        positions = []
+        for command_dict in self._commands:
+            first_qubit = cast(Command, command_dict["command"]).qubits[0]
+            position[first_qubit] = position.get(first_qubit, -1) + 1
+            positions.append((first_qubit, position[first_qubit]))
+        return positions
+
+    def _update_after_edit(
+        self,
+        circuit: Circuit,
+        replace: dict[int, Op],
+        removed: set[int],
+        appended: list[Command],
+    ) -> tuple[dict[Vertex, Vertex], set[Vertex]]:
+        """Replace the circuit by ``circuit``, which is the result of a single
+        kind of edit, and update the hypergraph to match.
+
+        :return: The map of vertices and the vertices whose hyperedges were
+            rebuilt, as in ``apply_edit``.
+        :rtype: tuple[dict[Vertex, Vertex], set[Vertex]]
+        """
+        n_qubits = len(self._circuit.qubits)
+        qubit_vertex = {self.get_qubit_of_vertex(v): v for v in range(n_qubits)}
+        # Find the qubits affected by the edit.
+        edits_on: dict[Vertex, list[int]] = dict()
+        for index in sorted(removed | set(replace)):
+            command = cast(Command, self._commands[index]["command"])
+            for qubit in command.qubits:
+                edits_on.setdefault(qubit_vertex[qubit], []).append(index)
+        touched = set(edits_on)
+        touched.update(qubit_vertex[q] for cmd in appended for q in cmd.qubits)
+
+        kept_merges = self._merges_to_keep(touched, edits_on, replace, qubit_vertex)
+        n_old_vertices = len(self._vertex_circuit_map)
+        vertex_map, renumbered, new_vertices, commands_on = self._renumber_commands(
+            circuit, replace, removed, appended, touched, qubit_vertex
+        )
+        qubit_hedges = {
+            qubit_v: self._rebuilt_hyperedges(
+                qubit_v, commands_on[qubit_v], kept_merges[qubit_v], vertex_map
+            )
+            for qubit_v in sorted(touched)
+        }
+        self._update_hyperedges(
+            qubit_hedges,
+            vertex_map,
+            renumbered,
+            range(len(self._vertex_circuit_map), n_old_vertices),
+        )
+
+        # New gate vertices are listed after the other gate vertices of the
+        # first qubit they act on, as in ``from_circuit``
+        if renumbered or removed:
+            self.vertex_list = [
+                vertex_map[v] for v in self.vertex_list if v in vertex_map
+            ]
+        for vertex in sorted(new_vertices):
+            owner = min(qubit_vertex[q] for q in self.get_gate_of_vertex(vertex).qubits)
+            if owner + 1 < n_qubits:
+                self.vertex_list.insert(self.vertex_list.index(owner + 1), vertex)
+            else:
+                self.vertex_list.append(vertex)
+        self._invalidate_fingerprint()
+
+        return vertex_map, touched | new_vertices
+
+    def _merges_to_keep(
+        self,
+        touched: set[Vertex],
+        edits_on: dict[Vertex, list[int]],
+        replace: dict[int, Op],
+        qubit_vertex: dict[Qubit, Vertex],
+    ) -> dict[Vertex, list[list[Vertex]]]:
+        """Find the gate vertices of the hyperedges of the qubits in
+        ``touched`` whose merges remain valid after the edit, as described in
+        ``apply_edit``.
+
+        :param touched: Qubit vertices acted on by edited commands.
+        :type touched: set[Vertex]
+        :param edits_on: Indices of the commands edited on each qubit vertex,
+            in increasing order.
+        :type edits_on: dict[Vertex, list[int]]
+        :param replace: Operations replacing commands.
+        :type replace: dict[int, Op]
+        :param qubit_vertex: Vertex of each qubit.
+        :type qubit_vertex: dict[Qubit, Vertex]
+        :return: Gate vertices, before the edit, of each hyperedge kept.
+        :rtype: dict[Vertex, list[list[Vertex]]]
+        """
+        # The same pass over the circuit finds the command of each gate
+        # vertex and the Hadamard gates on the qubits with edited commands.
+        command_index: dict[Vertex, int] = dict()
+        hadamards: dict[Vertex, list[int]] = {v: [] for v in edits_on}
+        for index, command_dict in enumerate(self._commands):
+            command = cast(Command, command_dict["command"])
+            if "vertex" in command_dict:
+                command_index[cast(Vertex, command_dict["vertex"])] = index
+            elif command.op.type == OpType.H:
+                qubit_v = qubit_vertex[command.qubits[0]]
+                if qubit_v in hadamards:
+                    hadamards[qubit_v].append(index)
+
+        new_hadamards = {i for i, op in replace.items() if op.type == OpType.H}
+        kept_merges: dict[Vertex, list[list[Vertex]]] = {v: [] for v in touched}
+        for qubit_v in touched:
+            for hedge in self.hyperedge_dict[qubit_v]:
+                gates = hedge.vertices[1:]
+                if not gates:
+                    continue
+                first = command_index[gates[0]]
+                last = command_index[gates[-1]]
+                edits = edits_on.get(qubit_v, [])
+                inside = edits[bisect_right(edits, first) : bisect_left(edits, last)]
+                if inside:
+                    h_list = hadamards[qubit_v]
+                    spans_h = bisect_right(h_list, first) < bisect_left(h_list, last)
+                    if spans_h or new_hadamards.intersection(inside):
+                        continue
+                kept_merges[qubit_v].append(gates)
+        return kept_merges
+
+    def _renumber_commands(
+        self,
+        circuit: Circuit,
+        replace: dict[int, Op],
+        removed: set[int],
+        appended: list[Command],
+        touched: set[Vertex],
+        qubit_vertex: dict[Qubit, Vertex],
+    ) -> tuple[
+        dict[Vertex, Vertex], dict[Vertex, Vertex], set[Vertex], dict[Vertex, list]
+    ]:
+        """Replace the circuit by ``circuit`` and renumber the gate vertices
+        following the order of its commands. The entries of commands whose
+        vertex and operation are unchanged are kept as they are.
+
+        :return: The map from old to new vertices, the gate vertices whose
+            number changed, the new gate vertices and the entries of the
+            commands acting on each qubit vertex in ``touched``.
+        :rtype: tuple[
+            dict[Vertex, Vertex], dict[Vertex, Vertex], set[Vertex],
+            dict[Vertex, list]
+        ]
+        """
+        wire_key: dict[tuple[Qubit, int], Optional[int]] = dict()
+        position: dict[Qubit, int] = dict()
+        for index, (first_qubit, _) in enumerate(self._wire_positions()):
+            if index not in removed:
+                position[first_qubit] = position.get(first_qubit, -1) + 1
+                wire_key[(first_qubit, position[first_qubit])] = index
+        for command in appended:
+            first_qubit = command.qubits[0]
+            position[first_qubit] = position.get(first_qubit, -1) + 1
+            wire_key[(first_qubit, position[first_qubit])] = None
+
+        n_qubits = len(qubit_vertex)
+        vertex_map: dict[Vertex, Vertex] = {v: v for v in range(n_qubits)}
+        renumbered: dict[Vertex, Vertex] = dict()
+        new_vertices: set[Vertex] = set()
+        commands: list[dict] = []
+        commands_on: dict[Vertex, list[dict]] = {v: [] for v in touched}
+        n_old_vertices = len(self._vertex_circuit_map)
+        vertex = n_qubits
+        position = dict()
+        for command in circuit.get_commands():
+            first_qubit = command.qubits[0]
+            position[first_qubit] = position.get(first_qubit, -1) + 1
+            old_index = wire_key[(first_qubit, position[first_qubit])]
+            if command.op.type == OpType.CU1:
+                if old_index is None:
+                    new_vertices.add(vertex)
+                    changed = True
+                else:
+                    old_vertex = cast(Vertex, self._commands[old_index]["vertex"])
+                    vertex_map[old_vertex] = vertex
+                    changed = old_vertex != vertex or old_index in replace
+                    if old_vertex != vertex:
+                        renumbered[old_vertex] = vertex
+                if changed:
+                    self._vertex_circuit_map[vertex] = {
+                        "type": "gate",
+                        "command": command,
+                    }
+                    commands.append(
+                        {
+                            "command": command,
+                            "two q gate count": vertex - n_qubits,
+                            "vertex": vertex,
+                            "type": "distributed gate",
+                        }
+                    )
+                else:
+                    commands.append(self._commands[cast(int, old_index)])
+                vertex += 1
+            elif old_index is None or old_index in replace:
+                commands.append({"command": command, "type": "1q local gate"})
+            else:
+                commands.append(self._commands[old_index])
+            for qubit in command.qubits:
+                if qubit_vertex[qubit] in commands_on:
+                    commands_on[qubit_vertex[qubit]].append(commands[-1])
+        for old_vertex in range(vertex, n_old_vertices):
+            del self._vertex_circuit_map[old_vertex]
+        self._circuit = circuit
+        self._commands = commands
+
+        return vertex_map, renumbered, new_vertices, commands_on
+
+    def _rebuilt_hyperedges(
+        self,
+        qubit_v: Vertex,
+        commands_on: list[dict],
+        kept_merges: list[list[Vertex]],
+        vertex_map: dict[Vertex, Vertex],
+    ) -> list[Hyperedge]:
+        """Rebuild the hyperedges of ``qubit_v`` from the entries of the
+        commands acting on it, as in ``from_circuit``, then restore the
+        merges that are still valid.
+
+        :param qubit_v: The qubit vertex.
+        :type qubit_v: Vertex
+        :param commands_on: Entries of the commands acting on ``qubit_v``,
+            in order.
+        :type commands_on: list[dict]
+        :param kept_merges: Gate vertices, before the edit, of the
+            hyperedges of ``qubit_v`` whose merges are kept.
+        :type kept_merges: list[list[Vertex]]
+        :param vertex_map: Map from vertices before the edit to after it.
+        :type vertex_map: dict[Vertex, Vertex]
+        :return: The hyperedges of ``qubit_v``, in order.
+        :rtype: list[Hyperedge]
+        """
+        hedges: list[list[Vertex]] = []
+        current = [qubit_v]
+        for command_dict in commands_on:
+            if command_dict["type"] == "distributed gate":
+                current.append(command_dict["vertex"])
+            elif command_dict["command"].op.type != OpType.Rz:
+                if len(current) > 1:
+                    hedges.append(current)
+                    current = [qubit_v]
+        if len(current) > 1 or not hedges:
+            hedges.append(current)
+
+        # Merge the hyperedges that share a kept merge, using union-find
+        parent = list(range(len(hedges)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        hedge_of = {v: i for i, vs in enumerate(hedges) for v in vs[1:]}
+        for gates in kept_merges:
+            ids = {
+                find(hedge_of[vertex_map[v]])
+                for v in gates
+                if v in vertex_map and vertex_map[v] in hedge_of
+            }
+            for i in ids:
+                parent[i] = min(ids)
+        groups: dict[int, list[Vertex]] = dict()
+        for i, vs in enumerate(hedges):
+            groups.setdefault(find(i), []).extend(vs[1:])
+        return sorted(
+            (Hyperedge([qubit_v] + sorted(g)) for g in groups.values()),
+            key=lambda hedge: hedge.vertices[1:2],
+        )
+
+    def _update_hyperedges(
+        self,
+        qubit_hedges: dict[Vertex, list[Hyperedge]],
+        vertex_map: dict[Vertex, Vertex],
+        renumbered: dict[Vertex, Vertex],
+        removed_vertices: Iterable[Vertex],
+    ):
+        """Update the hyperedges after an edit, given the rebuilt hyperedges
+        of the qubit vertices affected by it.
+
+        :param qubit_hedges: The rebuilt hyperedges of each affected qubit
+            vertex.
+        :type qubit_hedges: dict[Vertex, list[Hyperedge]]
+        :param vertex_map: Map from vertices before the edit to after it.
+        :type vertex_map: dict[Vertex, Vertex]
+        :param renumbered: The gate vertices whose number changed.
+        :type renumbered: dict[Vertex, Vertex]
+        :param removed_vertices: Vertices that no longer exist.
+        :type removed_vertices: Iterable[Vertex]
+        """
+        touched = set(qubit_hedges)
+        qubit_hedges = dict(qubit_hedges)
+
+        # Hyperedges of other qubits only change if they contain a
+        # renumbered vertex
+        renamed: dict[int, Hyperedge] = dict()
+        for old_vertex in renumbered:
+            for hedge in self.hyperedge_dict[old_vertex]:
+                if hedge.vertices[0] not in touched and id(hedge) not in renamed:
+                    renamed[id(hedge)] = Hyperedge(
+                        [vertex_map[v] for v in hedge.vertices], hedge.weight
+                    )
+
+        hyperedge_list: list[Hyperedge] = []
+        for hedge in self.hyperedge_list:
+            qubit_v = hedge.vertices[0]
+            if qubit_v in qubit_hedges:
+                hyperedge_list += qubit_hedges.pop(qubit_v)
+            elif qubit_v not in touched:
+                hyperedge_list.append(renamed.get(id(hedge), hedge))
+        self.hyperedge_list = hyperedge_list
+
+        # Only the vertices of rebuilt or renumbered hyperedges have new
+        # hyperedges or neighbours. Their hyperedges on other qubits are
+        # found from their entries before the edit.
+        old_vertex_of = {new: old for old, new in vertex_map.items()}
+        new_hedges_of: dict[Vertex, list[Hyperedge]] = dict()
+        for hedge in self.hyperedge_list:
+            if hedge.vertices[0] in touched:
+                for v in hedge.vertices:
+                    new_hedges_of.setdefault(v, []).append(hedge)
+        for hedge in renamed.values():
+            for v in hedge.vertices:
+                new_hedges_of.setdefault(v, [])
+        hyperedge_dict: dict[Vertex, list[Hyperedge]] = dict()
+        vertex_neighbours: dict[Vertex, set[Vertex]] = dict()
+        for v, touched_hedges in new_hedges_of.items():
+            vertex_hedges: list[Hyperedge] = []
+            if v in old_vertex_of:
+                vertex_hedges = [
+                    renamed.get(id(hedge), hedge)
+                    for hedge in self.hyperedge_dict[old_vertex_of[v]]
+                    if hedge.vertices[0] not in touched
+                ]
+            if vertex_hedges and touched_hedges:
+                vertex_hedges = sorted(
+                    vertex_hedges + touched_hedges, key=lambda hedge: hedge.vertices[0]
+                )
+            else:
+                vertex_hedges += touched_hedges
+            hyperedge_dict[v] = vertex_hedges
+            vertex_neighbours[v] = {
+                u for hedge in vertex_hedges for u in hedge.vertices
+            }
+            vertex_neighbours[v].discard(v)
+        for vertex in removed_vertices:
+            del self.hyperedge_dict[vertex]
+            del self.vertex_neighbours[vertex]
+        self.hyperedge_dict.update(hyperedge_dict)
+        self.vertex_neighbours.update(vertex_neighbours)
+
     def _vertex_id_predicate(self) -> bool:
         """Tests that the vertices in the hypergraph are numbered with all
         qubit vertices first and then the gate vertices in the same order
@@ -859,6 +1472,8 @@ class RandomHypergraphCircuit(HypergraphCircuit):
         :type n_layers: int
         """
 
+        from scipy.stats import unitary_group  # type: ignore
+
         circ = Circuit(n_qubits)
 
         for _ in range(n_layers):
@@ -0,0 +1,98 @@
+# Copyright 2023 Quantinuum and The University of Tokyo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from .hypergraph import Hyperedge, Vertex
+from .hypergraph_circuit import HypergraphCircuit
+from pytket import Circuit
+from typing import Optional, Union
+
+
+class PreparedCircuit:
+    """A circuit verified to be in the valid gateset and converted to its
+    hypergraph once, so that it can be given to several allocators and
+    distributors without repeating this work. Every ``allocate`` and
+    ``distribute`` method accepts a ``PreparedCircuit`` in place of a
+    circuit.
+
+    :param circuit: Circuit to be distributed.
+    :type circuit: Circuit
+    :raises Exception: Raised if the circuit is not in the valid gateset.
+    """
+
+    def __init__(self, circuit: Circuit) -> None:
+        self._hypergraph_circuit = HypergraphCircuit(circuit)
+        self._command_index: Optional[dict[Vertex, int]] = None
+
+    @property
+    def circuit(self) -> Circuit:
+        """The circuit prepared. It must not be modified."""
+        return self._hypergraph_circuit._circuit
+
+    def hypergraph_circuit(self) -> HypergraphCircuit:
+        """Return a new ``HypergraphCircuit`` of the circuit, whose
+        hypergraph may be modified freely.
+
+        :return: The hypergraph of the circuit, as built by
+            ``HypergraphCircuit``.
+        :rtype: HypergraphCircuit
+        """
+        return self._hypergraph_circuit.copy()
+
+    def get_vertex_to_command_index_map(self) -> dict[Vertex, int]:
+        """Return the map from each gate vertex to the index of its command
+        in the circuit, as given by the method of ``HypergraphCircuit`` of
+        the same name. It is only computed once and must not be modified.
+
+        :return: Index of the command of each gate vertex.
+        :rtype: dict[Vertex, int]
+        """
+        if self._command_index is None:
+            self._command_index = (
+                self._hypergraph_circuit.get_vertex_to_command_index_map()
+            )
+        return self._command_index
+
+    def __getstate__(self) -> dict:
+        # Commands are not pickled; the hypergraph is rebuilt from the
+        # circuit without verifying the gateset again
+        hypergraph_circuit = self._hypergraph_circuit
+        return {
+            "circuit": hypergraph_circuit._circuit,
+            "vertex_list": hypergraph_circuit.vertex_list,
+            "hyperedge_list": [h.to_dict() for h in hypergraph_circuit.hyperedge_list],
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self._hypergraph_circuit = HypergraphCircuit.from_hyperedges(
+            state["circuit"],
+            state["vertex_list"],
+            [Hyperedge.from_dict(h) for h in state["hyperedge_list"]],
+        )
+        self._command_index = None
+
+
+def prepare(circ: Union[Circuit, PreparedCircuit]) -> PreparedCircuit:
+    """Return ``circ`` as a ``PreparedCircuit``, preparing it if it is a
+    circuit.
+
+    :param circ: Circuit to be distributed, prepared or not.
+    :type circ: Union[Circuit, PreparedCircuit]
+    :return: The prepared circuit.
+    :rtype: PreparedCircuit
+    """
+    if isinstance(circ, PreparedCircuit):
+        return circ
+    return PreparedCircuit(circ)
@@ -0,0 +1,250 @@
+# Copyright 2023 Quantinuum and The University of Tokyo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from pytket import Circuit, OpType, Qubit
+from pytket_dqc.utils.gateset import is_start_proc, is_end_proc
+from pytket_dqc.utils.circuit_analysis import get_server_id, is_link_qubit
+from numpy import isclose
+from typing import NamedTuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .distribution import Distribution
+
+
+class StructuralViolation(NamedTuple):
+    """A structural error found by ``check_ejpp_structure``.
+
+    :param command_index: Index of the offending command in the commands of
+        the distributed circuit, or -1 if the error concerns the circuit as
+        a whole.
+    :type command_index: int
+    :param message: Description of the error.
+    :type message: str
+    """
+
+    command_index: int
+    message: str
+
+
+def check_ejpp_structure(
+    distribution: Distribution, circ: Circuit
+) -> list[StructuralViolation]:
+    """Scan ``circ``, as produced by ``distribution.to_pytket_circuit``,
+    once and check that it is structurally sound. In particular, that:
+
+    - every starting process populates a free link qubit, from a qubit
+      holding a copy of some circuit qubit in a neighbouring server,
+    - every ending process releases a link qubit in use onto a qubit
+      holding a copy of the same circuit qubit,
+    - no gate acts on a link qubit that is not in use,
+    - every CU1 gate acts on qubits of a single server, and each CU1 gate
+      of the original circuit is implemented exactly once, on copies of its
+      qubits, in the server it is placed in by ``distribution``.
+
+    The number of Hadamard gates applied to each link qubit is tracked: it
+    is odd while the link qubit is within an H-embedding unit. CU1 gates
+    acting on such link qubits are the corrections required by embedding,
+    rather than gates of the original circuit, and link qubits may not be
+    released while within an embedding unit.
+
+    Unlike ``check_equivalence``, this does not prove that the circuits are
+    equivalent, but it runs in linear time and identifies the offending
+    command.
+
+    :param distribution: The distribution ``circ`` implements.
+    :type distribution: Distribution
+    :param circ: The distributed circuit to be checked.
+    :type circ: Circuit
+
+    :return: The errors found, in the order they were found. Empty if
+        ``circ`` is structurally sound.
+    :rtype: list[StructuralViolation]
+    """
+
+    hyp_circ = distribution.circuit
+    placement_map = distribution.placement.placement
+    qubit_mapping = distribution.get_qubit_mapping()
+    coupling = {frozenset(edge) for edge in distribution.network.server_coupling}
+    violations: list[StructuralViolation] = []
+
+    # Parse the name of each qubit only once
+    server_of: dict[Qubit, int] = dict()
+    link_qubits = set()
+    for qubit in circ.qubits:
+        try:
+            server_of[qubit] = get_server_id(qubit)
+        except (AssertionError, ValueError, IndexError):
+            violations.append(
+                StructuralViolation(-1, f"Qubit {qubit} is not a hardware qubit.")
+            )
+            continue
+        if is_link_qubit(qubit):
+            link_qubits.add(qubit)
+    if violations:
+        return violations
+
+    # The circuit qubit each hardware qubit holds a copy of. Link qubits are
+    # only present while in use.
+    holds: dict[Qubit, Qubit] = {hw: q for q, hw in qubit_mapping.items()}
+    h_parity: dict[Qubit, int] = dict()
+
+    # The gate vertices of the original CU1 gates acting on each pair of
+    # circuit qubits, in the order of the original circuit
+    pending: dict[frozenset, list[int]] = dict()
+    for vertex in hyp_circ.vertex_list:
+        if not hyp_circ.is_qubit_vertex(vertex):
+            pair = frozenset(hyp_circ.get_gate_of_vertex(vertex).qubits)
+            pending.setdefault(pair, []).append(vertex)
+
+    for index, command in enumerate(circ.get_commands()):
+        qubits = command.qubits
+
+        if is_start_proc(command):
+            source, link = qubits
+            if link not in link_qubits:
+                violations.append(
+                    StructuralViolation(
+                        index, f"Starting process onto {link}, not a link qubit."
+                    )
+                )
+            elif link in holds:
+                violations.append(
+                    StructuralViolation(
+                        index, f"Starting process onto {link}, already in use."
+                    )
+                )
+            elif source not in holds:
+                violations.append(
+                    StructuralViolation(
+                        index, f"Starting process from {source}, not in use."
+                    )
+                )
+            else:
+                if frozenset([server_of[source], server_of[link]]) not in coupling:
+                    violations.append(
+                        StructuralViolation(
+                            index,
+                            f"Starting process between servers {server_of[source]}"
+                            f" and {server_of[link]}, which are not connected.",
+                        )
+                    )
+                holds[link] = holds[source]
+                h_parity[link] = 0
+            continue
+
+        if is_end_proc(command):
+            link, target = qubits
+            if link not in link_qubits or link not in holds:
+                violations.append(
+                    StructuralViolation(
+                        index, f"Ending process from {link}, not a link in use."
+                    )
+                )
+                continue
+            if holds.get(target) != holds[link]:
+                violations.append(
+                    StructuralViolation(
+                        index,
+                        f"Ending process from {link}, holding {holds[link]}, "
+                        f"onto {target}, which does not hold it.",
+                    )
+                )
+            if h_parity[link] % 2:
+                violations.append(
+                    StructuralViolation(
+                        index,
+                        f"Ending process from {link} within an H-embedding unit.",
+                    )
+                )
+            del holds[link]
+            del h_parity[link]
+            continue
+
+        if command.op.type == OpType.CustomGate:
+            violations.append(
+                StructuralViolation(
+                    index, f"Unsupported command {command.op.get_name()}."
+                )
+            )
+            continue
+
+        unused = [q for q in qubits if q not in holds]
+        if unused:
+            violations.append(
+                StructuralViolation(
+                    index,
+                    f"{command.op.get_name()} acts on {unused[0]}, "
+                    "which holds no circuit qubit.",
+                )
+            )
+            continue
+
+        if command.op.type == OpType.H and qubits[0] in link_qubits:
+            h_parity[qubits[0]] += 1
+
+        elif command.op.type == OpType.CU1:
+            q0, q1 = qubits
+            if server_of[q0] != server_of[q1]:
+                violations.append(
+                    StructuralViolation(
+                        index,
+                        f"CU1 acts on servers {server_of[q0]} and {server_of[q1]}.",
+                    )
+                )
+                continue
+            # Corrections of H-embedding act on link qubits within an
+            # embedding unit; no gate of the original circuit does
+            if any(h_parity.get(q, 0) % 2 for q in qubits):
+                continue
+
+            phase = command.op.params[0]
+            candidates = pending.get(frozenset([holds[q0], holds[q1]]), [])
+            match = None
+            for i, vertex in enumerate(candidates):
+                gate_phase = hyp_circ.get_gate_of_vertex(vertex).op.params[0]
+                if isclose(float(gate_phase), float(phase)):
+                    match = candidates.pop(i)
+                    break
+            if match is None:
+                violations.append(
+                    StructuralViolation(
+                        index,
+                        f"CU1 on copies of {holds[q0]} and {holds[q1]} does not "
+                        "correspond to a gate of the original circuit.",
+                    )
+                )
+            elif placement_map[match] != server_of[q0]:
+                violations.append(
+                    StructuralViolation(
+                        index,
+                        f"Gate vertex {match} is placed in server "
+                        f"{placement_map[match]}, but implemented in server "
+                        f"{server_of[q0]}.",
+                    )
+                )
+
+    for link in holds:
+        if link in link_qubits:
+            violations.append(
+                StructuralViolation(-1, f"Link qubit {link} is never released.")
+            )
+    for vertices in pending.values():
+        for vertex in vertices:
+            violations.append(
+                StructuralViolation(-1, f"Gate vertex {vertex} is not implemented.")
+            )
+
+    return violations
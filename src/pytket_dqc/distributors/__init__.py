@@ -23,3 +23,6 @@ from .partitioning_heterogeneous import (  # noqa:F401
     PartitioningHeterogeneousEmbedding,
     PartitioningAnnealing,
 )
+from .windowed import Windowed  # noqa:F401
+from .portfolio import PortfolioDistributor, PipelineResult  # noqa:F401
+from .cache import CachedDistributor, DistributionCache  # noqa:F401
@@ -0,0 +1,249 @@
+# Copyright 2023 Quantinuum and The University of Tokyo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+from .distributor import Distributor
+from pytket_dqc import NISQNetwork, Distribution, HypergraphCircuit
+from pytket_dqc.circuits import PreparedCircuit
+from pytket_dqc.placement import Placement
+from pytket_dqc.utils.fingerprint import circuit_fingerprint
+from pytket import Circuit
+from typing import Any, Optional, Union
+
+# Attributes in which distributors and allocators record the outcome of
+# their last call. They are not part of their configuration.
+_RESULT_ATTRIBUTES = ("report", "portfolio_report")
+
+
+class DistributionCache:
+    """On-disk store of distributions, indexed by the hash of the job that
+    produced them. Each entry is a file holding ``Distribution.to_dict``
+    as JSON. When the total size of the entries exceeds ``max_size``, the
+    least recently used entries are evicted.
+
+    The size of the entries is scanned from the directory when the cache is
+    created and updated as entries are stored, so that the directory is
+    only scanned again when entries may need evicting. Entries stored by
+    other processes sharing the directory are only accounted for from that
+    point.
+
+    :param directory: Directory where entries are stored. It is created if
+        it does not exist.
+    :type directory: str
+    :param max_size: Maximum total size of the entries, in bytes.
+    :type max_size: int
+    """
+
+    def __init__(self, directory: str, max_size: int = 2**30) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+        self._sizes: dict[str, int] = dict()
+        self._total_size = 0
+        self.evict()
+
+    def key(
+        self,
+        circ: Union[Circuit, PreparedCircuit],
+        network: NISQNetwork,
+        distributor: Distributor,
+        kwargs: dict,
+    ) -> str:
+        """Return the hash identifying a distribution job. It only depends
+        on the fingerprints of the circuit and network, the class of the
+        distributor and the kwargs given to it, so that it can be computed
+        before building the hypergraph of the circuit.
+
+        :param circ: Circuit to be distributed.
+        :type circ: Union[Circuit, PreparedCircuit]
+        :param network: Network onto which the circuit is distributed.
+        :type network: NISQNetwork
+        :param distributor: Distributor used.
+        :type distributor: Distributor
+        :param kwargs: Kwargs given to the `distribute` method.
+        :type kwargs: dict
+        :raises Exception: Raised if some kwarg has no deterministic
+            representation.
+        :return: Hexadecimal SHA-256 digest of the job.
+        :rtype: str
+        """
+
+        if isinstance(circ, PreparedCircuit):
+            circ = circ.circuit
+        job = {
+            "circuit": circuit_fingerprint(circ),
+            "network": network.fingerprint(),
+            "distributor": _canonical(distributor),
+            "kwargs": kwargs,
+        }
+        return hashlib.sha256(_encode(job).encode()).hexdigest()
+
+    def get(self, key: str, network: NISQNetwork) -> Optional[Distribution]:
+        """Return the distribution stored under ``key``, or None if there is
+        none. The distribution is given ``network`` rather than a copy of it.
+        Marks the entry as recently used.
+
+        :param key: Hash of the job, as given by ``key``.
+        :type key: str
+        :param network: Network of the distribution.
+        :type network: NISQNetwork
+        :return: The distribution stored, if any.
+        :rtype: Optional[Distribution]
+        """
+
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                distribution_dict = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        os.utime(path)
+
+        return Distribution(
+            HypergraphCircuit.from_dict(distribution_dict["circuit"]),
+            Placement.from_dict(distribution_dict["placement"]),
+            network,
+        )
+
+    def put(self, key: str, distribution: Distribution) -> None:
+        """Store ``distribution`` under ``key`` and evict the least recently
+        used entries if the cache exceeds ``max_size``. The entry is written
+        to a temporary file first, so that concurrent readers never see a
+        partially written entry.
+
+        :param key: Hash of the job, as given by ``key``.
+        :type key: str
+        :param distribution: Distribution to store.
+        :type distribution: Distribution
+        """
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(distribution.to_dict(), f)
+            size = f.tell()
+        os.replace(tmp_path, self._path(key))
+
+        name = os.path.basename(self._path(key))
+        self._total_size += size - self._sizes.get(name, 0)
+        self._sizes[name] = size
+        if self._total_size > self.max_size:
+            self.evict()
+
+    def evict(self) -> None:
+        """Delete the least recently used entries until the total size of
+        the cache is at most ``max_size``. The directory is scanned to find
+        the size and last use of every entry.
+        """
+
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        self._sizes = {name: size for _, size, name in entries}
+        total = sum(self._sizes.values())
+        for _, size, name in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            del self._sizes[name]
+            total -= size
+        self._total_size = total
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+
+class CachedDistributor(Distributor):
+    """Distributor looking up the result of a job in a
+    :class:`.DistributionCache` before running ``distributor``, and storing
+    the result afterwards. This is only sound when ``distributor`` is
+    deterministic given its kwargs, for instance when a ``seed`` is given.
+
+    :param distributor: The distributor whose results are cached.
+    :type distributor: Distributor
+    :param cache: The store of distributions.
+    :type cache: DistributionCache
+    """
+
+    def __init__(self, distributor: Distributor, cache: DistributionCache) -> None:
+        self.distributor = distributor
+        self.cache = cache
+
+    def distribute(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
+        """Method producing a distribution of the given circuit
+        onto the given network.
+
+        Note that kwargs are passed on to the `distribute` method of
+        ``distributor`` and are part of the key of the cache entry.
+
+        :param circ: Circuit to be distributed
+        :type circ: Union[Circuit, PreparedCircuit]
+        :param network: Network onto which circuit should be distributed
+        :type network: NISQNetwork
+        :return: Distribution of circ onto network.
+        :rtype: Distribution
+        """
+
+        key = self.cache.key(circ, network, self.distributor, kwargs)
+        distribution = self.cache.get(key, network)
+        if distribution is None:
+            distribution = self.distributor.distribute(circ, network, **kwargs)
+            self.cache.put(key, distribution)
+        return distribution
+
+
+def _canonical(obj: Any) -> Any:
+    """JSON serialisable representation of the objects that may be given as
+    kwargs, such as distributors, refiners, circuits and qubits.
+
+    :raises Exception: Raised if ``obj`` has no deterministic representation.
+    """
+    if hasattr(obj, "to_dict"):
+        return {"type": type(obj).__qualname__, "dict": obj.to_dict()}
+    if hasattr(obj, "to_list"):
+        return {"type": type(obj).__qualname__, "list": obj.to_list()}
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    if hasattr(type(obj), "__members__"):
+        return {"type": type(obj).__qualname__, "name": obj.name}
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=_encode)
+    if hasattr(obj, "__dict__") and not callable(obj):
+        config = {k: v for k, v in vars(obj).items() if k not in _RESULT_ATTRIBUTES}
+        return {"type": type(obj).__qualname__, "vars": config}
+    raise Exception(
+        f"Objects of type {type(obj).__qualname__} cannot be part of the key "
+        + "of a cache entry."
+    )
+
+
+def _encode(obj: Any) -> str:
+    """Deterministic JSON encoding of ``obj``."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=_canonical)
@@ -16,9 +16,11 @@ from pytket_dqc.refiners import (
     VertexCover,
 )
 from pytket import Circuit
+from typing import Union
 from .distributor import Distributor
 from .partitioning_heterogeneous import PartitioningHeterogeneous
 from pytket_dqc import NISQNetwork, Distribution
+from pytket_dqc.circuits import PreparedCircuit
 from pytket_dqc.refiners import (
     NeighbouringDTypeMerge,
     IntertwinedDTypeMerge,
@@ -34,7 +36,9 @@ class CoverEmbedding(Distributor):
     is the simplest one considering embedding in the first instance.
     """
 
-    def distribute(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def distribute(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         """Method producing a distribution of the given circuit
         onto the given network.
 
@@ -43,7 +47,7 @@ class CoverEmbedding(Distributor):
         distributor.
 
         :param circ: Circuit to be distributed
-        :type circ: Circuit
+        :type circ: Union[Circuit, PreparedCircuit]
         :param network: Network onto which circuit should be distributed
         :type network: NISQNetwork
         :return: Distribution of circ onto network.
@@ -68,7 +72,9 @@ class CoverEmbeddingSteiner(Distributor):
     to make use of Steiner trees.
     """
 
-    def distribute(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def distribute(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         """Abstract method producing a distribution of the given circuit
         onto the given network.
 
@@ -76,7 +82,7 @@ class CoverEmbeddingSteiner(Distributor):
         the `distribute` method of :class:`.CoverEmbedding`.
 
         :param circ: Circuit to be distributed
-        :type circ: Circuit
+        :type circ: Union[Circuit, PreparedCircuit]
         :param network: Network onto which circuit should be distributed
         :type network: NISQNetwork
         :return: Distribution of circ onto network.
@@ -100,7 +106,9 @@ class CoverEmbeddingSteinerDetached(Distributor):
     :class:`.BipartiteEmbeddingSteiner` to make use of detached gates.
     """
 
-    def distribute(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def distribute(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         """Abstract method producing a distribution of the given circuit
         onto the given network.
 
@@ -109,7 +117,7 @@ class CoverEmbeddingSteinerDetached(Distributor):
         the refine method of :class:`.DetachedGates`
 
         :param circ: Circuit to be distributed
-        :type circ: Circuit
+        :type circ: Union[Circuit, PreparedCircuit]
         :param network: Network onto which circuit should be distributed
         :type network: NISQNetwork
         :return: Distribution of circ onto network.
@@ -15,13 +15,17 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from pytket_dqc.circuits import Distribution, HypergraphCircuit
+from pytket_dqc.placement import Placement
 
-from typing import TYPE_CHECKING
+from typing import Iterable, Iterator, Optional, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from pytket_dqc.circuits.distribution import Distribution
     from pytket_dqc.networks import NISQNetwork
     from pytket import Circuit
+    from pytket_dqc.circuits import PreparedCircuit
 
 
 class Distributor(ABC):
@@ -33,15 +37,116 @@ class Distributor(ABC):
         pass
 
     @abstractmethod
-    def distribute(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def distribute(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         """Abstract method producing a distribution of the given circuit
         onto the given network.
 
         :param circ: Circuit to be distributed
-        :type circ: Circuit
+        :type circ: Union[Circuit, PreparedCircuit]
         :param network: Network onto which circuit should be distributed
         :type network: NISQNetwork
         :return: Distribution of circ onto network.
         :rtype: Distribution
         """
         pass
+
+    def distribute_batch(
+        self, circuits: Iterable[Circuit], network: NISQNetwork, **kwargs
+    ) -> Iterator[tuple[int, Distribution]]:
+        """Generator of the distributions of each of the given circuits
+        onto the same network. Structures that depend only on the network,
+        such as its distance matrix, Steiner trees and tket Architecture,
+        are built once (once per worker process if ``num_workers`` is given)
+        and shared by all circuits.
+
+        Note that kwargs, other than those listed below, are passed on to
+        the `distribute` method.
+
+        :param circuits: Circuits to be distributed.
+        :type circuits: Iterable[Circuit]
+        :param network: Network onto which circuits should be distributed.
+        :type network: NISQNetwork
+
+        :key num_workers: Number of worker processes among which the
+            circuits are distributed. At most twice as many circuits are
+            submitted at a time, and more are drawn from ``circuits`` as
+            results come back. Default is None, meaning circuits are
+            distributed serially in the current process.
+        :key ordered: Whether results are yielded in the order of
+            ``circuits``. If False, they are yielded as they complete.
+            Default is True.
+
+        :return: Pairs of the index of a circuit in ``circuits`` and its
+            distribution. All distributions share ``network``.
+        :rtype: Iterator[tuple[int, Distribution]]
+        """
+
+        num_workers = kwargs.pop("num_workers", None)
+        ordered = kwargs.pop("ordered", True)
+
+        if num_workers is None:
+            network.precompute()
+            for i, circ in enumerate(circuits):
+                yield i, self.distribute(circ, network, **kwargs)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=_init_batch_worker,
+            initargs=(network,),
+        ) as executor:
+            remaining = enumerate(circuits)
+            pending: dict[Future, int] = dict()
+
+            def refill() -> None:
+                for i, circ in islice(remaining, 2 * num_workers - len(pending)):
+                    future = executor.submit(_distribute_in_worker, self, circ, kwargs)
+                    pending[future] = i
+
+            refill()
+            while pending:
+                if ordered:
+                    future = min(pending, key=pending.__getitem__)
+                else:
+                    future = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+                circuit_dict, placement_dict = future.result()
+                index = pending.pop(future)
+                # Keep the workers busy while the result is being consumed
+                refill()
+                yield (
+                    index,
+                    Distribution(
+                        HypergraphCircuit.from_dict(circuit_dict),
+                        Placement.from_dict(placement_dict),
+                        network,
+                    ),
+                )
+
+
+# The network shared by the circuits distributed in a worker process of
+# ``Distributor.distribute_batch``.
+_batch_network: Optional[NISQNetwork] = None
+
+
+def _init_batch_worker(network: NISQNetwork) -> None:
+    """Build the network-level structures once per worker process."""
+    global _batch_network
+    network.precompute()
+    _batch_network = network
+
+
+def _distribute_in_worker(
+    distributor: Distributor, circ: Circuit, kwargs: dict
+) -> tuple[dict, dict]:
+    """Distribute ``circ`` onto the network of the worker process. Defined at
+    module level so that it may be sent to worker processes.
+
+    :return: The dictionary representations of the circuit and placement of
+        the distribution found.
+    :rtype: tuple[dict, dict]
+    """
+    assert _batch_network is not None
+    distribution = distributor.distribute(circ, _batch_network, **kwargs)
+    return distribution.circuit.to_dict(), distribution.placement.to_dict()
@@ -14,6 +14,7 @@
 
 from .distributor import Distributor
 from pytket_dqc import NISQNetwork, Distribution
+from pytket_dqc.circuits import PreparedCircuit
 from pytket_dqc.refiners import (
     RepeatRefiner,
     EagerHTypeMerge,
@@ -21,12 +22,15 @@ from pytket_dqc.refiners import (
 )
 from pytket_dqc.allocators import HypergraphPartitioning, Annealing
 from pytket import Circuit
+from typing import Union
 
 
 class PartitioningAnnealing(Distributor):
     """Distributor using the :class:`.Annealing` allocator."""
 
-    def distribute(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def distribute(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         """Method producing a distribution of the given circuit
         onto the given network.
 
@@ -34,7 +38,7 @@ class PartitioningAnnealing(Distributor):
         :class:`.Annealing`.
 
         :param circ: Circuit to be distributed
-        :type circ: Circuit
+        :type circ: Union[Circuit, PreparedCircuit]
         :param network: Network onto which circuit should be distributed
         :type network: NISQNetwork
         :return: Distribution of circ onto network.
@@ -49,7 +53,9 @@ class PartitioningHeterogeneous(Distributor):
     to adapt the result to heterogeneous networks.
     """
 
-    def distribute(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def distribute(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         """Method producing a distribution of the given circuit
         onto the given network.
 
@@ -58,7 +64,7 @@ class PartitioningHeterogeneous(Distributor):
         :class:`.BoundaryReallocation`.
 
         :param circ: Circuit to be distributed
-        :type circ: Circuit
+        :type circ: Union[Circuit, PreparedCircuit]
         :param network: Network onto which circuit should be distributed
         :type network: NISQNetwork
         :return: Distribution of circ onto network.
@@ -77,7 +83,9 @@ class PartitioningHeterogeneousEmbedding(Distributor):
     to make use of embedding.
     """
 
-    def distribute(self, circ: Circuit, network: NISQNetwork, **kwargs) -> Distribution:
+    def distribute(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
         """Method producing a distribution of the given circuit
         onto the given network.
 
@@ -85,7 +93,7 @@ class PartitioningHeterogeneousEmbedding(Distributor):
         :class:`.PartitioningHeterogeneousEmbedding`.
 
         :param circ: Circuit to be distributed
-        :type circ: Circuit
+        :type circ: Union[Circuit, PreparedCircuit]
         :param network: Network onto which circuit should be distributed
         :type network: NISQNetwork
         :return: Distribution of circ onto network.
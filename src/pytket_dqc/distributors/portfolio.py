@@ -0,0 +1,219 @@
+# Copyright 2023 Quantinuum and The University of Tokyo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import time
+import multiprocessing
+from .distributor import Distributor
+from .cover_embedding import (
+    CoverEmbedding,
+    CoverEmbeddingSteiner,
+    CoverEmbeddingSteinerDetached,
+)
+from .partitioning_heterogeneous import (
+    PartitioningAnnealing,
+    PartitioningHeterogeneous,
+    PartitioningHeterogeneousEmbedding,
+)
+from pytket_dqc import NISQNetwork, Distribution
+from pytket_dqc.circuits import Hyperedge, HypergraphCircuit, PreparedCircuit, prepare
+from pytket_dqc.placement import Placement
+from pytket import Circuit
+from typing import NamedTuple, Optional, Union, cast
+
+
+class PipelineResult(NamedTuple):
+    """Outcome of one of the pipelines run by :class:`.PortfolioDistributor`.
+
+    :param name: Class name of the distributor.
+    :type name: str
+    :param status: One of ``"valid"``, ``"invalid"`` (the distribution
+        found is not valid), ``"failed"`` (the distributor raised an
+        exception) or ``"timeout"`` (cancelled at the deadline).
+    :type status: str
+    :param cost: Ebit cost of the distribution found. None unless
+        ``status`` is ``"valid"``.
+    :type cost: Optional[int]
+    :param time: Wall clock time in seconds taken by the pipeline. For
+        cancelled pipelines, the time until they were cancelled.
+    :type time: float
+    :param error: Message of the exception raised by the distributor. None
+        unless ``status`` is ``"failed"``.
+    :type error: Optional[str]
+    """
+
+    name: str
+    status: str
+    cost: Optional[int]
+    time: float
+    error: Optional[str] = None
+
+
+class PortfolioDistributor(Distributor):
+    """Distributor running several distributors on the same circuit and
+    network, each in its own worker process, and returning the cheapest
+    valid distribution found.
+
+    :param distributors: The distributors to run. Default is all of
+        :class:`.PartitioningAnnealing`, :class:`.PartitioningHeterogeneous`,
+        :class:`.PartitioningHeterogeneousEmbedding`,
+        :class:`.CoverEmbedding`, :class:`.CoverEmbeddingSteiner` and
+        :class:`.CoverEmbeddingSteinerDetached`.
+    :type distributors: Optional[list[Distributor]]
+    :param report: One entry per distributor, in order, describing the
+        last call to ``distribute``.
+    :type report: list[PipelineResult]
+    """
+
+    def __init__(self, distributors: Optional[list[Distributor]] = None) -> None:
+        if distributors is None:
+            distributors = [
+                PartitioningAnnealing(),
+                PartitioningHeterogeneous(),
+                PartitioningHeterogeneousEmbedding(),
+                CoverEmbedding(),
+                CoverEmbeddingSteiner(),
+                CoverEmbeddingSteinerDetached(),
+            ]
+        self.distributors = distributors
+        self.report: list[PipelineResult] = []
+
+    def distribute(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
+        """Method producing a distribution of the given circuit
+        onto the given network. Ties in cost are broken by the order of
+        ``distributors``.
+
+        Note that kwargs, other than those listed below, are passed on to
+        the `distribute` method of each distributor.
+
+        :param circ: Circuit to be distributed
+        :type circ: Union[Circuit, PreparedCircuit]
+        :param network: Network onto which circuit should be distributed
+        :type network: NISQNetwork
+
+        :key time_limit: Time in seconds after which the pipelines that
+            have not finished are cancelled. Default is None, meaning all
+            pipelines run to completion.
+        :key num_workers: Number of worker processes. Default is None,
+            meaning one per distributor. Since workers cannot start
+            processes of their own, ``num_workers`` is not passed on.
+
+        :raises Exception: Raised if no pipeline found a valid distribution.
+        :return: Distribution of circ onto network.
+        :rtype: Distribution
+        """
+
+        time_limit = kwargs.pop("time_limit", None)
+        num_workers = kwargs.pop("num_workers", None)
+        if num_workers is None:
+            num_workers = len(self.distributors)
+
+        # The circuit is validated and converted once, rather than once per
+        # pipeline
+        circ = prepare(circ)
+
+        start = time.monotonic()
+        deadline = None if time_limit is None else start + time_limit
+
+        self.report = []
+        found: list[Optional[tuple[dict, Optional[list[dict]]]]] = []
+        pool = multiprocessing.Pool(processes=num_workers)
+        try:
+            async_results = [
+                pool.apply_async(_run_pipeline, (distributor, circ, network, kwargs))
+                for distributor in self.distributors
+            ]
+            for distributor, async_result in zip(self.distributors, async_results):
+                name = type(distributor).__name__
+                timeout = (
+                    None if deadline is None else max(deadline - time.monotonic(), 0)
+                )
+                try:
+                    result, status, cost, elapsed, error = async_result.get(timeout)
+                except multiprocessing.TimeoutError:
+                    result, status, cost, error = None, "timeout", None, None
+                    elapsed = time.monotonic() - start
+                found.append(result)
+                self.report.append(PipelineResult(name, status, cost, elapsed, error))
+        finally:
+            # Cancels any pipeline still running
+            pool.terminate()
+            pool.join()
+
+        valid = [i for i, result in enumerate(self.report) if result.status == "valid"]
+        if not valid:
+            raise Exception("None of the distributors found a valid distribution.")
+        best = min(valid, key=lambda i: cast(int, self.report[i].cost))
+        best_result = found[best]
+        assert best_result is not None
+        placement_dict, hyperedge_dicts = best_result
+
+        # The distribution is rebuilt from the prepared circuit and the
+        # network of the caller, rather than sent back in full
+        hyp_circ = circ.hypergraph_circuit()
+        if hyperedge_dicts is not None:
+            hyp_circ = HypergraphCircuit.from_hyperedges(
+                hyp_circ.get_circuit(),
+                hyp_circ.vertex_list,
+                [Hyperedge.from_dict(hyperedge) for hyperedge in hyperedge_dicts],
+            )
+        return Distribution(hyp_circ, Placement.from_dict(placement_dict), network)
+
+
+def _run_pipeline(
+    distributor: Distributor,
+    circ: PreparedCircuit,
+    network: NISQNetwork,
+    kwargs: dict,
+) -> tuple[
+    Optional[tuple[dict, Optional[list[dict]]]],
+    str,
+    Optional[int],
+    float,
+    Optional[str],
+]:
+    """Run one distributor of a portfolio. Defined at module level so that
+    it may be sent to worker processes.
+
+    :return: If the distribution found is valid, the dictionary
+        representation of its placement and, if they differ from those of
+        ``circ``, of its hyperedges. Then the status, the cost, the time
+        taken and the message of the exception raised, if any.
+    :rtype: tuple[
+        Optional[tuple[dict, Optional[list[dict]]]],
+        str,
+        Optional[int],
+        float,
+        Optional[str],
+    ]
+    """
+    start = time.perf_counter()
+    try:
+        distribution = distributor.distribute(circ, network, **kwargs)
+    except Exception as exc:
+        return None, "failed", None, time.perf_counter() - start, str(exc)
+
+    if not distribution.is_valid():
+        return None, "invalid", None, time.perf_counter() - start, None
+    cost = distribution.cost()
+    # Refiners may have merged or split hyperedges
+    hyperedge_list = distribution.circuit.hyperedge_list
+    hyperedge_dicts = None
+    if hyperedge_list != circ.hypergraph_circuit().hyperedge_list:
+        hyperedge_dicts = [hyperedge.to_dict() for hyperedge in hyperedge_list]
+    result = (distribution.placement.to_dict(), hyperedge_dicts)
+    return result, "valid", cost, time.perf_counter() - start, None
@@ -0,0 +1,277 @@
+# Copyright 2023 Quantinuum and The University of Tokyo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from pytket import Circuit, Qubit
+from pytket.circuit import Command
+from pytket_dqc import NISQNetwork, Distribution, HypergraphCircuit
+from pytket_dqc.circuits import Hyperedge, PreparedCircuit
+from pytket_dqc.placement import Placement
+from pytket_dqc.refiners import (
+    BoundaryReallocation,
+    VertexCover,
+    NeighbouringDTypeMerge,
+    IntertwinedDTypeMerge,
+    SequenceRefiner,
+    RepeatRefiner,
+    DetachedGates,
+)
+from .distributor import Distributor
+from .cover_embedding import CoverEmbeddingSteinerDetached
+from typing import Iterable, Iterator, Optional, Union
+
+
+class Windowed(Distributor):
+    """Distributes a circuit in windows of consecutive commands, so that
+    only the hypergraph and placement of one window are held in memory at
+    a time. This allows very deep circuits to be distributed, at the cost
+    of ending every EJPP process at the end of each window.
+
+    The first window is distributed using a :class:`.Distributor`, which
+    decides the server of each qubit. Each of the following windows is
+    distributed by refining the placement of its gates with a
+    :class:`.Refiner`.
+
+    Note that the server of each qubit is fixed by the first window and
+    never changes afterwards, since moving a qubit would require
+    teleportation between windows. If the interactions of the qubits change
+    over the circuit, later windows may therefore be distributed at a
+    higher cost than if they had been distributed on their own.
+    """
+
+    def distribute(
+        self, circ: Union[Circuit, PreparedCircuit], network: NISQNetwork, **kwargs
+    ) -> Distribution:
+        """Distribute ``circ`` window by window, and gather the windows into
+        a single distribution of ``circ``. Its hyperedges are split at the
+        boundaries between windows. Unlike `distribute_windows`, the
+        hypergraph of the whole circuit is held in memory.
+
+        Note that kwargs are passed on to `distribute_windows`.
+
+        :param circ: Circuit to be distributed.
+        :type circ: Union[Circuit, PreparedCircuit]
+        :param network: Network onto which circuit should be distributed.
+        :type network: NISQNetwork
+        :return: Distribution of circ onto network.
+        :rtype: Distribution
+        """
+
+        if isinstance(circ, PreparedCircuit):
+            circ = circ.circuit
+        n_qubits = circ.n_qubits
+
+        # Gate vertices of each window are shifted by the number of gate
+        # vertices of the previous windows
+        offset = 0
+        qubit_hyperedges: list[list[Hyperedge]] = [[] for _ in range(n_qubits)]
+        placement_dict: dict[int, int] = dict()
+        for distribution in self.distribute_windows(circ, network, **kwargs):
+            dist_circ = distribution.circuit
+            for vertex, server in distribution.placement.placement.items():
+                if dist_circ.is_qubit_vertex(vertex):
+                    placement_dict[vertex] = server
+                else:
+                    placement_dict[vertex + offset] = server
+            for hyperedge in dist_circ.hyperedge_list:
+                qubit = dist_circ.get_qubit_vertex(hyperedge)
+                gates = [v + offset for v in hyperedge.vertices if v != qubit]
+                if gates:
+                    qubit_hyperedges[qubit].append(
+                        Hyperedge([qubit] + gates, hyperedge.weight)
+                    )
+            offset += len(dist_circ.vertex_list) - n_qubits
+
+        hyperedge_list = []
+        for qubit, hyperedges in enumerate(qubit_hyperedges):
+            hyperedge_list += hyperedges if hyperedges else [Hyperedge([qubit])]
+        dist_circ = HypergraphCircuit.from_hyperedges(
+            circ, list(range(n_qubits + offset)), hyperedge_list
+        )
+        return Distribution(dist_circ, Placement(placement_dict), network)
+
+    def distribute_windows(
+        self,
+        commands: Union[Circuit, Iterable[Command]],
+        network: NISQNetwork,
+        **kwargs,
+    ) -> Iterator[Distribution]:
+        """Generator of the distributions of each window of commands. The
+        commands are only consumed as the windows are requested.
+
+        Note that kwargs are passed on to the `distribute` method of the
+        distributor and to the `refine` method of the refiner.
+
+        :param commands: Circuit to be distributed, or an iterable of its
+            commands in order.
+        :type commands: Union[Circuit, Iterable[Command]]
+        :param network: Network onto which the circuit should be distributed.
+        :type network: NISQNetwork
+
+        :key qubits: The qubits of the circuit. Required if ``commands`` is
+            not a Circuit.
+        :key window_size: The maximum number of commands in each window.
+            Default is 1000.
+        :key distributor: Distributor used on the first window. Default
+            is :class:`.CoverEmbeddingSteinerDetached`.
+        :key refiner: Refiner used on the following windows, whose gates
+            are initially placed in the server of their first qubit. It is
+            given the qubit vertices as ``fixed_vertices`` and must not move
+            them. Default is :class:`.BoundaryReallocation` followed by the
+            refinements of :class:`.CoverEmbeddingSteinerDetached`.
+
+        :raises Exception: Raised if the qubits are not given.
+        :raises Exception: Raised if the refiner moves a qubit.
+        :return: The distribution of each window, in order. They all place
+            each qubit in the same server.
+        :rtype: Iterator[Distribution]
+        """
+
+        if isinstance(commands, Circuit):
+            qubits = commands.qubits
+        elif kwargs.get("qubits", None) is not None:
+            qubits = kwargs["qubits"]
+        else:
+            raise Exception("The qubits of the circuit must be provided.")
+
+        window_size = kwargs.get("window_size", 1000)
+        if window_size < 1:
+            raise Exception("The window size must be positive.")
+
+        qubit_server: Optional[dict[Qubit, int]] = None
+        window: list[Command] = []
+        for command in commands:
+            window.append(command)
+            if len(window) == window_size:
+                distribution = self.distribute_window(
+                    window, qubits, network, qubit_server, **kwargs
+                )
+                qubit_server = self._qubit_server(distribution)
+                yield distribution
+                window = []
+        # A circuit without commands is distributed as a single empty window
+        if window or qubit_server is None:
+            yield self.distribute_window(
+                window, qubits, network, qubit_server, **kwargs
+            )
+
+    def distribute_stream(
+        self,
+        commands: Union[Circuit, Iterable[Command]],
+        network: NISQNetwork,
+        **kwargs,
+    ) -> Iterator[Circuit]:
+        """Generator of the distributed circuit of each window of commands,
+        as given by ``to_pytket_circuit``. Their computation qubits match
+        across windows, so appending them in order gives the distributed
+        circuit. Each window may use a different number of link qubits.
+
+        Note that kwargs are passed on to `distribute_windows`.
+
+        :param commands: Circuit to be distributed, or an iterable of its
+            commands in order.
+        :type commands: Union[Circuit, Iterable[Command]]
+        :param network: Network onto which the circuit should be distributed.
+        :type network: NISQNetwork
+
+        :key satisfy_bound: Passed on to ``to_pytket_circuit``. Default is
+            True.
+        :key allow_update: Passed on to ``to_pytket_circuit``. Default is
+            False.
+        :key verify: Passed on to ``to_pytket_circuit``. Default is
+            ``"structural"``.
+
+        :return: The distributed circuit of each window, in order.
+        :rtype: Iterator[Circuit]
+        """
+
+        satisfy_bound = kwargs.get("satisfy_bound", True)
+        allow_update = kwargs.get("allow_update", False)
+        verify = kwargs.get("verify", "structural")
+        for distribution in self.distribute_windows(commands, network, **kwargs):
+            yield distribution.to_pytket_circuit(
+                satisfy_bound=satisfy_bound, allow_update=allow_update, verify=verify
+            )
+
+    def distribute_window(
+        self,
+        window: list[Command],
+        all_qubits: list[Qubit],
+        network: NISQNetwork,
+        qubit_server: Optional[dict[Qubit, int]],
+        **kwargs,
+    ) -> Distribution:
+        """Distribute a single window of commands.
+
+        :param window: The commands in the window.
+        :type window: list[Command]
+        :param all_qubits: The qubits of the circuit.
+        :type all_qubits: list[Qubit]
+        :param network: Network onto which the window should be distributed.
+        :type network: NISQNetwork
+        :param qubit_server: The server of each qubit, as decided by the
+            previous windows. If None, the distributor decides it.
+        :type qubit_server: Optional[dict[Qubit, int]]
+        :return: Distribution of the window.
+        :rtype: Distribution
+        """
+
+        circ = Circuit()
+        for qubit in all_qubits:
+            circ.add_qubit(qubit)
+        for command in window:
+            circ.add_gate(command.op, command.qubits)
+
+        if qubit_server is None:
+            distributor = kwargs.get("distributor", CoverEmbeddingSteinerDetached())
+            return distributor.distribute(circ, network, **kwargs)
+
+        dist_circ = HypergraphCircuit(circ)
+        qubit_vertices = dist_circ.get_qubit_vertices()
+        placement_dict = {
+            vertex: qubit_server[dist_circ.get_qubit_of_vertex(vertex)]
+            for vertex in qubit_vertices
+        }
+        for vertex in dist_circ.vertex_list:
+            if vertex not in placement_dict:
+                first_qubit = dist_circ.get_gate_of_vertex(vertex).qubits[0]
+                placement_dict[vertex] = qubit_server[first_qubit]
+        distribution = Distribution(dist_circ, Placement(placement_dict), network)
+
+        refine_kwargs = {**kwargs, "fixed_vertices": qubit_vertices}
+        refiner = kwargs.get("refiner", None)
+        if refiner is not None:
+            refiner.refine(distribution, **refine_kwargs)
+        else:
+            BoundaryReallocation().refine(distribution, **refine_kwargs)
+            VertexCover().refine(distribution, **refine_kwargs)
+            RepeatRefiner(
+                SequenceRefiner([NeighbouringDTypeMerge(), IntertwinedDTypeMerge()])
+            ).refine(distribution)
+            DetachedGates().refine(distribution, **kwargs)
+
+        if self._qubit_server(distribution) != qubit_server:
+            raise Exception("The refiner must not move qubits between servers.")
+
+        return distribution
+
+    def _qubit_server(self, distribution: Distribution) -> dict[Qubit, int]:
+        """Return the server of each qubit in ``distribution``."""
+        dist_circ = distribution.circuit
+        placement = distribution.placement.placement
+        return {
+            dist_circ.get_qubit_of_vertex(v): placement[v]
+            for v in dist_circ.get_qubit_vertices()
+        }
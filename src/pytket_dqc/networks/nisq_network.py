@@ -20,9 +20,10 @@ from pytket.placement import NoiseAwarePlacement
 from pytket.architecture import Architecture
 from pytket.circuit import Node
 from pytket_dqc.circuits.hypergraph_circuit import HypergraphCircuit
-from typing import Tuple, Union, cast, Optional
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
+from typing import Iterator, Tuple, Union, cast, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
 
 class NISQNetwork(ServerNetwork):
@@ -100,7 +101,7 @@ class NISQNetwork(ServerNetwork):
             )
 
         # Check that the resulting network is connected.
-        assert nx.is_connected(self.get_nisq_nx())
+        assert nx.is_connected(self.get_compact_nx())
 
     def __eq__(self, other):
         """Check equality based on equality of components"""
@@ -164,6 +165,34 @@ class NISQNetwork(ServerNetwork):
             server_ebit_mem=server_ebit_mem,
         )
 
+    def _server_labels(self, relabel_invariant: bool) -> dict[int, str]:
+        """Describe each server by its qubits, or only by their number if
+        ``relabel_invariant``, and by its communication capacity.
+        """
+        return {
+            server: (
+                f"{len(qubits) if relabel_invariant else qubits}"
+                f";{self.server_ebit_mem[server]}"
+            )
+            for server, qubits in self.server_qubits.items()
+        }
+
+    def _cache_keys(self) -> list[str]:
+        return super()._cache_keys() + ["_architecture", "_link_errors", "_compact_nx"]
+
+    def _clear_cache(self) -> None:
+        super()._clear_cache()
+        self._architecture: Optional[Tuple[Architecture, dict[Node, int]]] = None
+        self._link_errors: Optional[dict[Tuple[Node, Node], int]] = None
+        self._compact_nx: Optional[nx.Graph] = None
+
+    def precompute(self) -> None:
+        """Build the network-level structures that do not depend on the
+        circuit being distributed, including the tket Architecture.
+        """
+        super().precompute()
+        self.get_architecture()
+
     def can_implement(self, dist_circ: HypergraphCircuit) -> bool:
         if len(self.get_qubit_list()) < len(dist_circ.get_qubit_vertices()):
             return False
@@ -196,12 +225,23 @@ class NISQNetwork(ServerNetwork):
         :rtype: Tuple[Architecture, dict[Node, int]]
         """
 
-        G = self.get_nisq_nx()
-        arc = Architecture([(Node(u), Node(v)) for u, v in G.edges])
-        # Map from architecture nodes to network qubits
-        node_qubit_map = {Node(u): u for u in G.nodes}
+        if self._architecture is None:
+            # Map from architecture nodes to network qubits
+            node_qubit_map = {Node(q): q for q in self.get_qubit_list()}
+            qubit_node_map = {q: node for node, q in node_qubit_map.items()}
+            # The edges are generated directly, rather than through
+            # ``get_nisq_nx``, to avoid building a second graph of the
+            # same size
+            arc = Architecture(
+                [
+                    (qubit_node_map[u], qubit_node_map[v])
+                    for u, v, _ in self._nisq_edges()
+                ]
+            )
+            self._architecture = (arc, node_qubit_map)
 
-        return arc, node_qubit_map
+        arc, node_qubit_map = self._architecture
+        return arc, dict(node_qubit_map)
 
     def get_placer(self) -> Tuple[Architecture, dict[Node, int], NoiseAwarePlacement]:
         """Return `tket NoiseAwarePlacement
@@ -223,51 +263,96 @@ class NISQNetwork(ServerNetwork):
         :rtype: Tuple[ Architecture, dict[Node, int], NoiseAwarePlacement ]
         """
 
-        G = self.get_nisq_nx()
-        link_errors = {}
-        # For each edge in network graph, add noise corresponding
-        # to edge weight.
-        for u, v in G.edges:
-            edge_data = G.get_edge_data(u, v)
-            link_errors[(Node(u), Node(v))] = edge_data["weight"]
-
         arc, node_qubit_map = self.get_architecture()
 
+        if self._link_errors is None:
+            qubit_node_map = {q: node for node, q in node_qubit_map.items()}
+            # For each edge in network graph, add noise corresponding
+            # to edge weight.
+            self._link_errors = {
+                (qubit_node_map[u], qubit_node_map[v]): weight
+                for u, v, weight in self._nisq_edges()
+            }
+
         return (
             arc,
             node_qubit_map,
-            NoiseAwarePlacement(arc=arc, link_errors=link_errors),
+            NoiseAwarePlacement(arc=arc, link_errors=dict(self._link_errors)),
         )
 
     def get_nisq_nx(self) -> nx.Graph:
-        """Return networkx graph corresponding to network.
+        """Return networkx graph corresponding to network. Note that the
+        qubits in each server are all connected to each other, so that the
+        graph has a number of edges quadratic in the size of the servers.
+        Consider using ``get_compact_nx`` for large servers.
 
         :return: networkx graph corresponding to network.
         :rtype: nx.Graph
         """
 
         G = nx.Graph()
+        for u, v, weight in self._nisq_edges():
+            G.add_edge(u, v, color="blue" if weight else "red", weight=weight)
+        return G
 
+    def get_compact_nx(self) -> nx.Graph:
+        """Return networkx graph with the same connectivity and distances
+        between qubits as ``get_nisq_nx``, but where the qubits in each
+        server are connected only to the first qubit of the server, rather
+        than to each other. It has a number of edges linear in the number of
+        qubits. The graph is cached and must not be modified.
+
+        :return: networkx graph whose servers are stars.
+        :rtype: nx.Graph
+        """
+
+        if self._compact_nx is None:
+            G = nx.Graph()
+            for qubits in self.server_qubits.values():
+                G.add_node(qubits[0])
+                for qubit in qubits[1:]:
+                    G.add_edge(qubits[0], qubit, color="red", weight=0)
+            for u, v in self._server_links():
+                G.add_edge(u, v, color="blue", weight=1)
+            self._compact_nx = G
+        return self._compact_nx
+
+    def _server_links(self) -> Iterator[Tuple[int, int]]:
+        """Generate an edge between the first qubits of each pair of
+        connected servers. Edges are directed from the qubit that
+        ``get_nisq_nx`` adds to its graph first, as networkx does, since the
+        direction of the edges of an ``Architecture`` matters to equality.
+        """
+        # Position of each qubit in the order in which it is added to the
+        # graph of ``get_nisq_nx``
+        rank: dict[int, int] = dict()
+        for qubits in self.server_qubits.values():
+            if len(qubits) > 1:
+                rank[qubits[0]] = len(rank)
+        seen = set()
+        for u, v in self.server_coupling:
+            edge = (self.server_qubits[u][0], self.server_qubits[v][0])
+            for qubit in edge:
+                rank.setdefault(qubit, len(rank))
+            if frozenset(edge) not in seen:
+                seen.add(frozenset(edge))
+                yield cast(Tuple[int, int], tuple(sorted(edge, key=rank.__getitem__)))
+
+    def _nisq_edges(self) -> Iterator[Tuple[int, int, int]]:
+        """Generate the edges of ``get_nisq_nx`` and their weights."""
         # For each server, add a connection between each of the qubits
         # internal to the server.
         for qubits in self.server_qubits.values():
-            for qubit_connection in combinations(qubits, 2):
-                G.add_edge(*qubit_connection, color="red", weight=0)
-
+            for u, v in combinations(qubits, 2):
+                yield u, v, 0
         # Add edges between one in one server to one qubit in another server
         # if the two servers are connected.
-        for u, v in self.server_coupling:
-            G.add_edge(
-                self.server_qubits[u][0],
-                self.server_qubits[v][0],
-                color="blue",
-                weight=1,
-            )
-
-        return G
+        for u, v in self._server_links():
+            yield u, v, 1
 
     def draw_nisq_network(self) -> Figure:
         """Draw network using netwrokx draw method."""
+        import matplotlib.pyplot as plt
 
         G = self.get_nisq_nx()
         colors = [G[u][v]["color"] for u, v in G.edges()]
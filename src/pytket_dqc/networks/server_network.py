@@ -14,13 +14,23 @@
 
 from __future__ import annotations
 
+import numpy as np
 import networkx as nx  # type: ignore
+from collections import OrderedDict
+from pytket_dqc.utils.graph_tools import steiner_tree
+from pytket_dqc.utils.fingerprint import new_hasher
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from pytket_dqc.placement import Placement
 
+# Steiner trees are only cached for at most ``_STEINER_MAX_KEY_SIZE``
+# servers, as ``GainManager`` does by default, and the least recently used
+# tree is dropped once ``_STEINER_CACHE_SIZE`` trees are cached.
+_STEINER_CACHE_SIZE = 4096
+_STEINER_MAX_KEY_SIZE = 5
+
 
 class ServerNetwork:
     """Class for the management of networks of quantum computers."""
@@ -52,6 +62,87 @@ class ServerNetwork:
             return self.server_coupling == other.server_coupling
         return False
 
+    def __setattr__(self, name, value) -> None:
+        """Clear the cached network-level structures whenever a public
+        attribute is assigned, since they may no longer be valid.
+        """
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self._clear_cache()
+
+    def __getstate__(self) -> dict:
+        """Drop the cached network-level structures when pickling, so that
+        they are rebuilt by the receiving process if needed.
+        """
+        state = self.__dict__.copy()
+        for key in self._cache_keys():
+            del state[key]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._clear_cache()
+
+    def _cache_keys(self) -> list[str]:
+        return ["_server_nx", "_distance_matrix", "_steiner_cache", "_fingerprint"]
+
+    def _clear_cache(self) -> None:
+        """Initialise the caches of network-level structures. These are
+        built on first use and shared by every distribution onto this
+        network, which is assumed not to be modified after construction.
+        """
+        self._server_nx: Optional[nx.Graph] = None
+        self._distance_matrix: Optional[np.ndarray] = None
+        self._steiner_cache: OrderedDict[frozenset[int], nx.Graph] = OrderedDict()
+        self._fingerprint: dict[bool, str] = dict()
+
+    def fingerprint(self, relabel_invariant: bool = False) -> str:
+        """Return a fingerprint of the network, computed by streaming its
+        coupling and the description of each server into a hash. It does
+        not depend on the order in which couplings are listed. The
+        fingerprint is cached and cleared when an attribute of the network
+        is assigned; modifying its lists or dictionaries in place is not
+        detected.
+
+        :param relabel_invariant: If True, networks that only differ in the
+            labels of their servers and qubits have the same fingerprint.
+            This uses the Weisfeiler-Lehman graph hash, so that distinct
+            networks may rarely share a fingerprint. Default is False.
+        :type relabel_invariant: bool
+        :return: Hexadecimal digest of the network.
+        :rtype: str
+        """
+
+        if relabel_invariant not in self._fingerprint:
+            labels = self._server_labels(relabel_invariant)
+            hasher = new_hasher()
+            if relabel_invariant:
+                G = self.get_server_nx()
+                nx.set_node_attributes(G, labels, "label")
+                wl_hash = nx.weisfeiler_lehman_graph_hash(G, node_attr="label")
+                hasher.update(wl_hash.encode())
+            else:
+                for u, v in sorted(tuple(sorted(e)) for e in self.server_coupling):
+                    hasher.update(f"{u},{v}\n".encode())
+                for server in sorted(labels):
+                    hasher.update(f"{server}:{labels[server]}\n".encode())
+            self._fingerprint[relabel_invariant] = hasher.hexdigest()
+        return self._fingerprint[relabel_invariant]
+
+    def _server_labels(self, relabel_invariant: bool) -> dict[int, str]:
+        """Return the description of each server included in the
+        fingerprint of the network.
+        """
+        return {server: "" for server in self.get_server_list()}
+
+    def precompute(self) -> None:
+        """Build the network-level structures that do not depend on the
+        circuit being distributed, so that they are shared by all later
+        distributions onto this network. Steiner trees are cached as they
+        are requested.
+        """
+        self.get_distance_matrix()
+
     def is_placement(self, placement: Placement) -> bool:
         """Checks that placement is valid for this network. In particular
         check that all of the servers used by the placement are indeed in
@@ -100,6 +191,53 @@ class ServerNetwork:
             G.add_edge(edge[0], edge[1])
         return G
 
+    def get_distance_matrix(self) -> np.ndarray:
+        """Return the matrix of distances between servers, whose rows and
+        columns follow the order of ``get_server_list``. The matrix is
+        cached and must not be modified.
+
+        :return: Matrix of shortest path lengths between servers.
+        :rtype: np.ndarray
+        """
+
+        if self._distance_matrix is None:
+            self._distance_matrix = nx.floyd_warshall_numpy(
+                self._cached_server_nx(), nodelist=self.get_server_list()
+            )
+        return self._distance_matrix
+
+    def get_steiner_tree(self, servers: list[int]) -> nx.Graph:
+        """Return the Steiner tree of the server network connecting
+        ``servers``, as given by ``steiner_tree``. Trees connecting few
+        servers are kept in a least recently used cache and must not be
+        modified.
+
+        :param servers: Servers to be connected by the tree.
+        :type servers: list[int]
+        :return: Steiner tree connecting ``servers``.
+        :rtype: nx.Graph
+        """
+
+        key = frozenset(servers)
+        if len(key) > _STEINER_MAX_KEY_SIZE:
+            return steiner_tree(self._cached_server_nx(), list(servers))
+        try:
+            self._steiner_cache.move_to_end(key)
+            return self._steiner_cache[key]
+        except KeyError:
+            pass
+        tree = steiner_tree(self._cached_server_nx(), list(servers))
+        self._steiner_cache[key] = tree
+        if len(self._steiner_cache) > _STEINER_CACHE_SIZE:
+            self._steiner_cache.popitem(last=False)
+        return tree
+
+    def _cached_server_nx(self) -> nx.Graph:
+        """Return the cached graph of the server network."""
+        if self._server_nx is None:
+            self._server_nx = self.get_server_nx()
+        return self._server_nx
+
     def draw_server_network(self) -> None:
         """Draw server network using networkx draw method."""
 
@@ -28,6 +28,7 @@ from pytket.circuit import Command, OpType, Op
 from pytket_dqc.utils import (
     is_distributable,
     to_euler_with_two_hadamards,
+    IndexedBipartiteGraph,
 )
 
 logger = logging.getLogger()
@@ -1123,6 +1124,35 @@ class PacMan:
         )
         return graph, bipartitions[1]
 
+    def get_indexed_graph_merged(self) -> IndexedBipartiteGraph:
+        """Get the same graph as ``get_nx_graph_merged``, with merged packets
+        mapped to integer IDs and adjacency stored in CSR format, so that
+        the minimum vertex cover can be found without NetworkX.
+        """
+        edges = set()
+        for qubit_vertex in self.hypergraph_circuit.get_qubit_vertices():
+            for merged_packet in self.merged_packets[qubit_vertex]:
+                for connected_merged_packet in self.get_connected_merged_packets(
+                    merged_packet
+                ):
+                    edges.add((merged_packet, connected_merged_packet))
+        return IndexedBipartiteGraph.from_edges(edges)
+
+    def get_indexed_graph_conflict(self) -> IndexedBipartiteGraph:
+        """Get the same graph as ``get_nx_graph_conflict``, with hopping
+        packets mapped to integer IDs and adjacency stored in CSR format.
+        """
+        potential_conflict_edges = set()
+        checked_hopping_packets = set()
+        for qubit_vertex in self.hypergraph_circuit.get_qubit_vertices():
+            for hopping_packet in self.hopping_packets[qubit_vertex]:
+                for conflict_hopping in self.get_conflict_hoppings(hopping_packet):
+                    if conflict_hopping in checked_hopping_packets:
+                        continue
+                    potential_conflict_edges.add((hopping_packet, conflict_hopping))
+                checked_hopping_packets.add(hopping_packet)
+        return IndexedBipartiteGraph.from_edges(potential_conflict_edges)
+
     # TODO: Deprecated. Remove once Tim has finished helping Junyi
     def get_mvc_merged_graph(self) -> set[MergedPacket]:
         """Get the minimum vertex cover of the merged graph."""
@@ -20,7 +20,6 @@ if TYPE_CHECKING:
     from pytket_dqc.networks import NISQNetwork
     from pytket_dqc.circuits import HypergraphCircuit
 
-from pytket_dqc.utils import steiner_tree
 from pytket_dqc.utils import direct_from_origin
 
 
@@ -123,7 +122,6 @@ class Placement:
         servers_used = [
             value for key, value in self.placement.items() if key in hyperedge
         ]
-        server_graph = network.get_server_nx()
 
         # The Steiner tree problem is NP-complete. Indeed the networkx
         # steiner_tree is solving a problem which gives an upper bound on
@@ -131,7 +129,7 @@ class Placement:
         # output, which we rely on. In particular we assume the call to this
         # function made when calculating costs gives the same output as the
         # call that is made when the circuit is built and outputted.
-        steiner_server_graph = steiner_tree(server_graph, servers_used)
+        steiner_server_graph = network.get_steiner_tree(servers_used)
         qubit_server = self.placement[qubit_node]
         return direct_from_origin(steiner_server_graph, qubit_server)
 
@@ -14,11 +14,12 @@
 
 from __future__ import annotations
 
+import heapq
 import random
 from pytket_dqc.allocators import GainManager
 from pytket_dqc.refiners import Refiner
 
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pytket_dqc import Distribution
@@ -53,6 +54,13 @@ class BoundaryReallocation(Refiner):
 
         :key fixed_vertices: A list of vertices that cannot be reallocated.
             Default is [].
+        :key active_vertices: If provided, the first round only considers
+            the boundary vertices in this collection, and each following
+            round only considers the boundary vertices that are neighbours
+            of those moved in the previous round. This localises refinement
+            to a region, such as the one returned by
+            ``Distribution.transfer_placement`` when warm starting. Default
+            is None, meaning all boundary vertices are considered every round.
         :key num_rounds: Max number of refinement rounds. Default is 10.
         :key stop_parameter: Real number in [0,1]. If proportion of moves
             in a round is smaller than this number, do no more rounds. Default
@@ -60,12 +68,21 @@ class BoundaryReallocation(Refiner):
         :key seed: Seed for randomness. Default is None.
         :key cache_limit: The maximum size of the set of servers whose cost is
             stored in cache. Default value is 5.
+        :key reallocation_alg: Either "label_propagation" for the algorithm
+            described above or "fm" for the algorithm described in
+            ``fm_refine``. Default is "label_propagation".
+        :key fm_patience: Only used by "fm". Number of consecutive moves
+            without improving on the best cost found in the pass after which
+            the pass is stopped. Default is 50.
 
         :return: Distribution where the placement updated.
         :rtype: Distribution
         """
 
         fixed_vertices = kwargs.get("fixed_vertices", [])
+        active_region = kwargs.get("active_vertices", None)
+        if active_region is not None:
+            active_region = set(active_region)
         num_rounds = kwargs.get("num_rounds", 10)
         stop_parameter = kwargs.get("stop_parameter", 0.05)
         seed = kwargs.get("seed", None)
@@ -79,6 +96,24 @@ class BoundaryReallocation(Refiner):
         if cache_limit is not None:
             gain_manager.set_max_key_size(cache_limit)
 
+        reallocation_alg = kwargs.get("reallocation_alg", "label_propagation")
+        if reallocation_alg == "fm":
+            return self.fm_refine(
+                gain_manager,
+                fixed_vertices=fixed_vertices,
+                active_vertices=active_region,
+                num_rounds=num_rounds,
+                fm_patience=kwargs.get("fm_patience", 50),
+            )
+        elif reallocation_alg != "label_propagation":
+            raise Exception(
+                "You must provide a reallocation_alg. Either:\n"
+                + '\t\t"label_propagation" -> '
+                + "greedy moves of boundary vertices in random order\n"
+                + '\t\t"fm" -> '
+                + "Fiduccia-Mattheyses passes with rollback\n"
+            )
+
         round_id = 0
         proportion_moved: float = 1
         refinement_made = False
@@ -88,6 +123,9 @@ class BoundaryReallocation(Refiner):
             active_vertices = dist_circ.get_boundary(placement)
             # Filter out gates that are fixed
             active_vertices = [v for v in active_vertices if v not in fixed_vertices]
+            if active_region is not None:
+                active_vertices = [v for v in active_vertices if v in active_region]
+                active_region = set()
 
             moves = 0
             for vertex in active_vertices:
@@ -117,44 +155,19 @@ class BoundaryReallocation(Refiner):
                     best_swap_vertex = None
                     if not gain_manager.is_move_valid(vertex, server):
                         # The only vertices we can swap with are qubit ones
-                        # so that the occupancy of the server is maintained
-
-                        vs = placement.get_vertices_in(server)
-                        valid_swaps = [
-                            vertex for vertex in vs if dist_circ.is_qubit_vertex(vertex)
-                        ]
-
-                        # To obtain the gain accurately, we move ``vertex`` to
-                        # ``server`` first and move it back at the end. This is
-                        # possible because ``move`` is an unsafe function, i.e.
-                        # it does not require that the move is valid.
-                        gain_manager.move_vertex(vertex, server, recalculate_cost=False)
-
-                        best_swap_gain = float("-inf")
-                        for swap_vertex in valid_swaps:
-                            swap_gain = gain_manager.move_vertex_gain(
-                                swap_vertex, current_server
-                            )
-
-                            if (
-                                best_swap_vertex is None
-                                or swap_gain > best_swap_gain
-                                or swap_gain == best_swap_gain
-                                and random.choice([True, False])
-                            ):
-                                best_swap_gain = swap_gain
-                                best_swap_vertex = swap_vertex
-                        # Restore ``vertex`` to its original server.
-                        gain_manager.move_vertex(
-                            vertex, current_server, recalculate_cost=False
-                        )
+                        # so that the occupancy of the server is maintained.
+                        # ``GainManager`` keeps these ranked by their gain.
+                        (
+                            best_swap_vertex,
+                            best_swap_gain,
+                        ) = gain_manager.best_swap_partner(vertex, server)
 
                         # Since no server has capacity 0, we should always
                         # find a vertex to swap with
                         assert best_swap_vertex is not None
                         # The gain of this swap is the sum of the gains of
                         # both moves
-                        gain = gain + int(best_swap_gain)
+                        gain = gain + best_swap_gain
 
                     if (
                         best_server is None
@@ -184,6 +197,12 @@ class BoundaryReallocation(Refiner):
                         # to swap to make it valid
                         gain_manager.move_vertex(best_best_swap, current_server)
                     refinement_made = True
+                    if active_region is not None:
+                        active_region.update(dist_circ.vertex_neighbours[vertex])
+                        if best_best_swap is not None:
+                            active_region.update(
+                                dist_circ.vertex_neighbours[best_best_swap]
+                            )
                     # Either if we swap or we don't, we count it as one move
                     # since this is meant to count 'rounds with change' rather
                     # than literal moves
@@ -197,3 +216,113 @@ class BoundaryReallocation(Refiner):
         assert gain_manager.distribution is distribution
 
         return refinement_made
+
+    def fm_refine(self, gain_manager: GainManager, **kwargs) -> bool:
+        """Refinement in the style of Fiduccia-Mattheyses. Each pass keeps a
+        priority queue of the best valid move of each boundary vertex, keyed
+        by its gain. The best move is applied even if its gain is negative,
+        and the vertex is locked for the rest of the pass; only the gains of
+        the neighbours of the moved vertex are then recalculated. At the end
+        of the pass, the moves applied after the lowest cost was reached are
+        undone. Since moves with negative gain are allowed within a pass,
+        this may escape local optima that ``refine`` gets stuck in.
+
+        Moves that would exceed the capacity of a server are not considered;
+        unlike ``refine``, no swaps are attempted.
+
+        :param gain_manager: Manager of the distribution to refine.
+        :type gain_manager: GainManager
+
+        :key fixed_vertices: A list of vertices that cannot be reallocated.
+            Default is [].
+        :key active_vertices: If provided, the priority queue is initially
+            filled only with the boundary vertices in this collection.
+            Default is None.
+        :key num_rounds: Max number of passes. Default is 10.
+        :key fm_patience: Number of consecutive moves without improving on
+            the best cost found in the pass after which the pass is stopped.
+            Default is 50.
+
+        :return: Whether the placement was changed.
+        :rtype: bool
+        """
+        fixed_vertices = set(kwargs.get("fixed_vertices", []))
+        active_vertices = kwargs.get("active_vertices", None)
+        num_rounds = kwargs.get("num_rounds", 10)
+        fm_patience = kwargs.get("fm_patience", 50)
+
+        dist_circ = gain_manager.distribution.circuit
+        placement = gain_manager.distribution.placement
+
+        def best_move(vertex: int) -> Optional[tuple[int, int]]:
+            current_server = gain_manager.current_server(vertex)
+            best = None
+            for server in {
+                placement.placement[v] for v in dist_circ.vertex_neighbours[vertex]
+            }:
+                if server == current_server or not gain_manager.is_move_valid(
+                    vertex, server
+                ):
+                    continue
+                gain = gain_manager.move_vertex_gain(vertex, server)
+                if best is None or gain > best[0]:
+                    best = (gain, server)
+            return best
+
+        refinement_made = False
+        for _ in range(num_rounds):
+            locked: set[int] = set()
+            # Entries are only valid if their version is the latest one
+            version: dict[int, int] = dict()
+            queue: list[tuple[int, float, int, int, int]] = []
+
+            def push(vertex: int):
+                version[vertex] = version.get(vertex, 0) + 1
+                move = best_move(vertex)
+                if move is not None:
+                    gain, server = move
+                    heapq.heappush(
+                        queue, (-gain, random.random(), vertex, server, version[vertex])
+                    )
+
+            for vertex in dist_circ.get_boundary(placement):
+                if vertex not in fixed_vertices and (
+                    active_vertices is None or vertex in active_vertices
+                ):
+                    push(vertex)
+
+            moves: list[tuple[int, int]] = []
+            total_gain = 0
+            best_gain = 0
+            best_prefix = 0
+            while queue and len(moves) - best_prefix < fm_patience:
+                neg_gain, _, vertex, server, entry_version = heapq.heappop(queue)
+                if vertex in locked or entry_version != version[vertex]:
+                    continue
+                # Capacities may have changed since the entry was pushed
+                if not gain_manager.is_move_valid(vertex, server):
+                    push(vertex)
+                    continue
+
+                moves.append((vertex, gain_manager.current_server(vertex)))
+                gain_manager.move_vertex(vertex, server)
+                locked.add(vertex)
+                total_gain -= neg_gain
+                if total_gain > best_gain:
+                    best_gain = total_gain
+                    best_prefix = len(moves)
+
+                for neighbour in dist_circ.vertex_neighbours[vertex]:
+                    if neighbour not in locked and neighbour not in fixed_vertices:
+                        push(neighbour)
+
+            # Roll back to the best prefix of moves
+            for vertex, server in reversed(moves[best_prefix:]):
+                gain_manager.move_vertex(vertex, server)
+
+            if best_prefix == 0:
+                break
+            refinement_made = True
+
+        assert gain_manager.distribution.is_valid()
+        return refinement_made
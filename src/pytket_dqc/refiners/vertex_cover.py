@@ -14,14 +14,16 @@
 
 from __future__ import annotations
 
+import time
+from concurrent.futures import ProcessPoolExecutor
 import networkx as nx  # type: ignore
 from networkx.algorithms import bipartite  # type: ignore
 from pytket_dqc.refiners import Refiner
-from pytket_dqc.packing import PacMan, MergedPacket
+from pytket_dqc.packing import PacMan, MergedPacket, HoppingPacket
 from pytket_dqc.placement import Placement
 from pytket_dqc.circuits import Hyperedge
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 
 if TYPE_CHECKING:
     from pytket_dqc import Distribution
@@ -46,12 +48,24 @@ class VertexCover(Refiner):
         :key vertex_cover_alg: The choice of algorithm to be used to find the
             vertex covers that decide the placement of gates. Either:
             "all_brute_force" to do an exhaustive search of all minimum vertex
-            covers or "networkx" to use NetworkX to find a single min cover.
+            covers, "networkx" to use NetworkX to find a single min cover or
+            "hopcroft_karp" to find a single min cover using the same approach
+            as "networkx" but on an integer-indexed copy of the packet graphs.
+        :key num_workers: Only used by "all_brute_force". Number of worker
+            processes among which the connected components of the packet
+            graph are distributed. Default is None, meaning that components
+            are processed serially in the current process.
+        :key component_time_budget: Only used by "all_brute_force". Maximum
+            time in seconds spent on the exhaustive search of each connected
+            component. If exceeded, the cover of that component is found
+            using NetworkX's matching-based algorithm instead. Default is
+            None, meaning no limit.
         """
         vertex_cover_alg = kwargs.get("vertex_cover_alg", "networkx")
         if vertex_cover_alg not in [
             "all_brute_force",
             "networkx",
+            "hopcroft_karp",
         ]:
             raise Exception(
                 "You must provide a vertex_cover_alg. Either:\n"
@@ -59,14 +73,18 @@ class VertexCover(Refiner):
                 + "exhaustive search of all minimum vertex covers\n"
                 + '\t\t"networkx" -> '
                 + "use NetworkX's algorithm to find a vertex cover\n"
+                + '\t\t"hopcroft_karp" -> '
+                + "use the integer-indexed Hopcroft-Karp algorithm\n"
             )
 
         pacman = PacMan(distribution.circuit, distribution.placement)
         # Decide on a cover using either approach
         if vertex_cover_alg == "all_brute_force":
-            cover = self.exhaustive_refine(distribution, pacman)
+            cover = self.exhaustive_refine(distribution, pacman, **kwargs)
         elif vertex_cover_alg == "networkx":
             cover = self.networkx_refine(distribution, pacman)
+        elif vertex_cover_alg == "hopcroft_karp":
+            cover = self.hopcroft_karp_refine(distribution, pacman)
 
         # Obtain a fresh HypergraphCircuit where no hyperedges are merged
         new_hyp_circ = pacman.get_hypergraph_from_packets()
@@ -116,9 +134,14 @@ class VertexCover(Refiner):
         return True
 
     def exhaustive_refine(
-        self, distribution: Distribution, pacman: PacMan
+        self, distribution: Distribution, pacman: PacMan, **kwargs
     ) -> list[MergedPacket]:
         """Refinement where all minimum vertex covers are found exhaustively.
+        Each connected component of the graph of merged packets is solved
+        independently; optionally, components are farmed out to a pool of
+        worker processes, largest first. The results are merged in the
+        original order of the components, so the output does not depend on
+        the order in which workers finish.
 
         :param distribution: The distribution to be updated
         :type distribution: Distribution
@@ -126,44 +149,102 @@ class VertexCover(Refiner):
         :type pacman: PacMan
         :return: The list of selected merged packets to implement
         :rtype: list[MergedPacket]
+
+        :key num_workers: Number of worker processes. Default is None,
+            meaning components are processed serially.
+        :key component_time_budget: Maximum time in seconds spent on the
+            exhaustive search of each component, after which the
+            matching-based cover is used for it instead. Default is None.
         """
-        merged_graph, _ = pacman.get_nx_graph_merged()
-        conflict_graph, _ = pacman.get_nx_graph_conflict()
+        num_workers = kwargs.get("num_workers", None)
+        time_budget = kwargs.get("component_time_budget", None)
 
-        # Find the vertex covers of each connected component separately
-        full_valid_cover: list[MergedPacket] = []
-        for subgraph in [
+        merged_graph, m_topnodes = pacman.get_nx_graph_merged()
+        conflict_graph, c_topnodes = pacman.get_nx_graph_conflict()
+
+        # Map each packet to the merged packet containing it, so that we can
+        # find which hopping packets belong to each connected component
+        containing_merged_packet = {
+            packet: merged_packet
+            for merged_packets in pacman.merged_packets.values()
+            for merged_packet in merged_packets
+            for packet in merged_packet
+        }
+        # Group the hopping packets by the merged packet that would contain
+        # them, keeping their original order through their index
+        hopping_packets_of: dict[MergedPacket, list[tuple[int, HoppingPacket]]] = dict()
+        all_hopping_packets = (
+            hop_packet
+            for packet_list in pacman.hopping_packets.values()
+            for hop_packet in packet_list
+        )
+        for index, (p0, p1) in enumerate(all_hopping_packets):
+            merged_packet = containing_merged_packet[p0]
+            if p1 in merged_packet:
+                hopping_packets_of.setdefault(merged_packet, []).append(
+                    (index, (p0, p1))
+                )
+
+        # Gather the data required to solve each connected component. Only
+        # picklable data is gathered, so that it can be sent to workers.
+        subgraphs = [
             merged_graph.subgraph(c) for c in nx.connected_components(merged_graph)
-        ]:
-            # Step 1. Find all minimum vertex coverings of subgraph
-            min_covers: list[set[MergedPacket]] = get_min_covers(list(subgraph.edges))
-
-            # Find the best way to remove conflicts for each cover
-            best_cover = None
-            best_conflict_removal = None
-            for cover in min_covers:
-                # Step 2. Find all the hopping packets in ``cover``
-                hop_packets = pacman.get_hopping_packets_within(cover)
-                # Step 3. Find the best way to remove conflicts on ``cover``
-                true_conflicts_g = conflict_graph.subgraph(hop_packets)
-                conflict_covers = get_min_covers(list(true_conflicts_g.edges))
-                # Pick one of the conflict_covers, all are optimal; there's
-                # always at least one
-                assert len(conflict_covers) > 0
-                conflict_removal = conflict_covers[0]
-                # Step 4. Find the best among cover after conflict removal
-                # fmt: off
-                if (
-                    best_conflict_removal is None or
-                    len(conflict_removal) < len(best_conflict_removal)
-                ):
-                    best_cover = cover
-                    best_conflict_removal = conflict_removal
-                # fmt: on
-            assert best_cover is not None
-            assert best_conflict_removal is not None
-
-            # Step 5. Update ``best_cover`` by splitting according to
+        ]
+        jobs: list[
+            tuple[
+                list[tuple[MergedPacket, MergedPacket]],
+                dict[HoppingPacket, MergedPacket],
+                list[tuple[HoppingPacket, HoppingPacket]],
+            ]
+        ] = []
+        for subgraph in subgraphs:
+            # The hopping packets that may appear within a cover of this
+            # component, along with the merged packet that would contain them
+            candidates = sorted(
+                (index, hop_packet, merged_packet)
+                for merged_packet in subgraph
+                for index, hop_packet in hopping_packets_of.get(merged_packet, [])
+            )
+            hop_candidates = {
+                hop_packet: merged_packet for _, hop_packet, merged_packet in candidates
+            }
+            conflict_edges = [
+                (u, v) for u, v in conflict_graph.subgraph(hop_candidates.keys()).edges
+            ]
+            jobs.append((list(subgraph.edges), hop_candidates, conflict_edges))
+
+        # Solve the components, largest first
+        results: list[Optional[tuple[set[MergedPacket], set[HoppingPacket]]]]
+        order = sorted(range(len(jobs)), key=lambda i: -len(jobs[i][0]))
+        if num_workers is None or num_workers <= 1 or len(jobs) <= 1:
+            results = [None] * len(jobs)
+            for i in order:
+                results[i] = _exhaustive_component_cover(*jobs[i], time_budget)
+        else:
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                futures = {
+                    i: executor.submit(
+                        _exhaustive_component_cover, *jobs[i], time_budget
+                    )
+                    for i in order
+                }
+                results = [futures[i].result() for i in range(len(jobs))]
+
+        full_valid_cover: list[MergedPacket] = []
+        for subgraph, (_, hop_candidates, _), result in zip(subgraphs, jobs, results):
+            # If the time budget was exceeded, fall back to the matching-based
+            # approach used by ``networkx_refine``
+            if result is None:
+                result = _matching_component_cover(
+                    subgraph,
+                    m_topnodes,
+                    hop_candidates,
+                    conflict_graph,
+                    c_topnodes,
+                )
+            best_cover, best_conflict_removal = result
+
+            # Update ``best_cover`` by splitting according to
             # ``best_conflict_removal``
             for p0, p1 in best_conflict_removal:
                 # Retrieve the merged packet containing this conflict
@@ -227,17 +308,67 @@ class VertexCover(Refiner):
 
         return cover
 
+    def hopcroft_karp_refine(
+        self, distribution: Distribution, pacman: PacMan
+    ) -> list[MergedPacket]:
+        """Refinement following the same approach as ``networkx_refine``,
+        but where packets are mapped to integer IDs so that the matchings
+        are found by Hopcroft-Karp over CSR adjacency arrays rather than
+        over NetworkX's dictionaries of packets. Only one vertex cover is
+        found.
+
+        :param distribution: The distribution to be updated
+        :type distribution: Distribution
+        :param pacman: The packet manager used during refinement
+        :type pacman: PacMan
+        :return: The list of selected merged packets to implement
+        :rtype: list[MergedPacket]
+        """
+        merged_graph = pacman.get_indexed_graph_merged()
+        conflict_graph = pacman.get_indexed_graph_conflict()
+
+        # Find a vertex cover
+        cover = merged_graph.minimum_vertex_cover()
+        # Find all of the hopping packets in ``cover``
+        hop_packets = pacman.get_hopping_packets_within(cover)
+
+        # Find a way to remove the conflicts on ``cover``
+        true_conflict_graph = conflict_graph.subgraph(hop_packets)
+        conflict_removal = true_conflict_graph.minimum_vertex_cover()
 
-def get_min_covers(edges: list[tuple[Any, Any]]) -> list[set[Any]]:
+        # Update ``cover`` by splitting according to ``conflict_removal``
+        for p0, p1 in conflict_removal:
+            merged_packet = pacman.get_containing_merged_packet(p0)
+            assert merged_packet == pacman.get_containing_merged_packet(p1)
+            packet_a, packet_b = pacman.get_split_packets(merged_packet, (p0, p1))
+            cover.remove(merged_packet)
+            cover.add(packet_a)
+            cover.add(packet_b)
+
+        return list(cover)
+
+
+def get_min_covers(
+    edges: list[tuple[Any, Any]], deadline: Optional[float] = None
+) -> list[set[Any]]:
     """Recursive function that finds all minimum vertex covers of the given
     edges. Its complexity is at most O(2^c) where c is the size of the worst
     cover.
+
+    :param edges: The edges of the graph to cover.
+    :type edges: list[tuple[Any, Any]]
+    :param deadline: A value of ``time.monotonic()`` after which the search
+        is abandoned. Default is None, meaning no deadline.
+    :type deadline: Optional[float]
+    :raises TimeoutError: If ``deadline`` is reached during the search.
     """
 
     def get_covers(edges: list[tuple[Any, Any]]) -> list[set[Any]]:
         """All minimum vertex covers are guaranteed to be found by this
         recursive function, some extra non-minimal covers are also found.
         """
+        if deadline is not None and time.monotonic() > deadline:
+            raise TimeoutError("Deadline reached while searching for covers.")
         if not edges:
             # Return a singleton list with the minimum cover: the trivial one
             return [set()]
@@ -265,3 +396,98 @@ def get_min_covers(edges: list[tuple[Any, Any]]) -> list[set[Any]]:
     # Even in the case of no edges, we get the empty cover
     assert len(min_covers) > 0
     return min_covers
+
+
+def _exhaustive_component_cover(
+    edges: list[tuple[MergedPacket, MergedPacket]],
+    hop_candidates: dict[HoppingPacket, MergedPacket],
+    conflict_edges: list[tuple[HoppingPacket, HoppingPacket]],
+    time_budget: Optional[float] = None,
+) -> Optional[tuple[set[MergedPacket], set[HoppingPacket]]]:
+    """Find the best minimum vertex cover of a connected component of the
+    graph of merged packets, along with the best way to remove the conflicts
+    in it. This is a module level function so that it can be sent to worker
+    processes.
+
+    :param edges: The edges of the connected component.
+    :type edges: list[tuple[MergedPacket, MergedPacket]]
+    :param hop_candidates: Maps each hopping packet that may appear in a
+        cover of the component to the merged packet that contains it.
+    :type hop_candidates: dict[HoppingPacket, MergedPacket]
+    :param conflict_edges: The edges of the conflict graph between the
+        hopping packets in ``hop_candidates``.
+    :type conflict_edges: list[tuple[HoppingPacket, HoppingPacket]]
+    :param time_budget: Maximum time in seconds to spend on the search.
+        Default is None, meaning no limit.
+    :type time_budget: Optional[float]
+    :return: The best cover and its conflict removal, or None if the time
+        budget was exceeded.
+    :rtype: Optional[tuple[set[MergedPacket], set[HoppingPacket]]]
+    """
+    deadline = None
+    if time_budget is not None:
+        deadline = time.monotonic() + time_budget
+
+    try:
+        # Step 1. Find all minimum vertex coverings of the component
+        min_covers: list[set[MergedPacket]] = get_min_covers(edges, deadline)
+
+        # Find the best way to remove conflicts for each cover
+        best_cover = None
+        best_conflict_removal = None
+        for cover in min_covers:
+            # Step 2. Find all the hopping packets in ``cover``
+            hop_packets = {
+                hop for hop, merged in hop_candidates.items() if merged in cover
+            }
+            # Step 3. Find the best way to remove conflicts on ``cover``
+            true_conflicts = [
+                (u, v)
+                for u, v in conflict_edges
+                if u in hop_packets and v in hop_packets
+            ]
+            conflict_covers = get_min_covers(true_conflicts, deadline)
+            # Pick one of the conflict_covers, all are optimal; there's
+            # always at least one
+            assert len(conflict_covers) > 0
+            conflict_removal = conflict_covers[0]
+            # Step 4. Find the best among cover after conflict removal
+            # fmt: off
+            if (
+                best_conflict_removal is None or
+                len(conflict_removal) < len(best_conflict_removal)
+            ):
+                best_cover = cover
+                best_conflict_removal = conflict_removal
+            # fmt: on
+    except TimeoutError:
+        return None
+
+    assert best_cover is not None
+    assert best_conflict_removal is not None
+    return best_cover, best_conflict_removal
+
+
+def _matching_component_cover(
+    subgraph: nx.Graph,
+    m_topnodes: set[MergedPacket],
+    hop_candidates: dict[HoppingPacket, MergedPacket],
+    conflict_graph: nx.Graph,
+    c_topnodes: set[HoppingPacket],
+) -> tuple[set[MergedPacket], set[HoppingPacket]]:
+    """Find a minimum vertex cover of a connected component of the graph of
+    merged packets, and a way to remove the conflicts in it, using NetworkX's
+    matching-based algorithm, as in ``VertexCover.networkx_refine``.
+    """
+    top_nodes = {node for node in subgraph.nodes if node in m_topnodes}
+    matching = bipartite.maximum_matching(subgraph, top_nodes=top_nodes)
+    cover = bipartite.to_vertex_cover(subgraph, matching, top_nodes=top_nodes)
+
+    hop_packets = {hop for hop, merged in hop_candidates.items() if merged in cover}
+    true_conflict_graph = conflict_graph.subgraph(hop_packets)
+    tc_topnodes = {node for node in true_conflict_graph.nodes if node in c_topnodes}
+    matching = bipartite.maximum_matching(true_conflict_graph, top_nodes=tc_topnodes)
+    conflict_removal = bipartite.to_vertex_cover(
+        true_conflict_graph, matching, top_nodes=tc_topnodes
+    )
+    return cover, conflict_removal
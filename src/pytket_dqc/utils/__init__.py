@@ -17,6 +17,7 @@ from .gateset import (  # noqa:F401
     dqc_gateset_predicate,
     DQCPass,
     to_euler_with_two_hadamards,
+    clear_decomposition_caches,
 )
 
 from .op_analysis import (  # noqa:F401
@@ -32,12 +33,25 @@ from .graph_tools import (  # noqa:F401
     steiner_tree,
 )
 
+from .bipartite import IndexedBipartiteGraph  # noqa:F401
+
 from .circuit_analysis import (  # noqa:F401
     ConstraintException,
+    DistributedCircuitAnalysis,
+    LinkEvent,
+    analyse_distributed_circuit,
     ebit_cost,
     ebit_memory_required,
 )
 
-from .verification import check_equivalence  # noqa:F401
+from .verification import (  # noqa:F401
+    check_equivalence,
+    check_equivalence_segmented,
+    check_equivalence_statevector,
+    SegmentResult,
+    SegmentedEquivalenceReport,
+)
+
+from .qasm import to_qasm_str, write_qasm, qasm_lines  # noqa:F401
 
-from .qasm import to_qasm_str  # noqa:F401
+from .fingerprint import circuit_fingerprint  # noqa:F401
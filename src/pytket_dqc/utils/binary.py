@@ -0,0 +1,110 @@
+# Copyright 2023 Quantinuum and The University of Tokyo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import json
+import struct
+import numpy as np
+
+# Files start with ``MAGIC``, followed by the format version and the length
+# of a JSON header, both as little endian unsigned 32 bit integers. The
+# header gives the dtype, shape and offset of each array. Arrays are stored
+# contiguously after the header, each aligned to ``ALIGNMENT`` bytes, so
+# that they can be read as views of a memory-mapped file.
+MAGIC = b"DQCBIN\x00\x00"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_arrays(path: str, arrays: dict[str, np.ndarray]) -> None:
+    """Write named arrays to ``path`` in the binary format read by
+    ``read_arrays``.
+
+    :param path: Path of the file to write.
+    :type path: str
+    :param arrays: The arrays to write, by name.
+    :type arrays: dict[str, np.ndarray]
+    """
+
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+
+    # Offsets are relative to the start of the data section
+    index = dict()
+    offset = 0
+    for name, array in arrays.items():
+        index[name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps(index).encode()
+    data_start = _aligned(_PREAMBLE.size + len(header))
+
+    with open(path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + index[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+
+
+def read_arrays(path: str, mmap: bool = True) -> dict[str, np.ndarray]:
+    """Read the named arrays written by ``write_arrays``.
+
+    :param path: Path of the file to read.
+    :type path: str
+    :param mmap: Whether to memory-map the file, in which case the arrays
+        are read-only views of the file and no data is copied until used.
+        Default is True.
+    :type mmap: bool
+    :raises Exception: Raised if the file is not in this format, or if it
+        was written by an unsupported version of the format.
+    :return: The arrays, by name.
+    :rtype: dict[str, np.ndarray]
+    """
+
+    buffer: np.ndarray
+    if mmap:
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
+
+    magic, version, header_len = _PREAMBLE.unpack(buffer[: _PREAMBLE.size].tobytes())
+    if magic != MAGIC:
+        raise Exception(f"{path} is not a pytket-dqc binary file.")
+    if version != FORMAT_VERSION:
+        raise Exception(
+            f"{path} uses version {version} of the binary format, "
+            f"but only version {FORMAT_VERSION} is supported."
+        )
+    header_end = _PREAMBLE.size + header_len
+    index = json.loads(buffer[_PREAMBLE.size : header_end].tobytes())
+    data_start = _aligned(header_end)
+
+    arrays = dict()
+    for name, entry in index.items():
+        dtype = np.dtype(entry["dtype"])
+        shape = tuple(entry["shape"])
+        start = data_start + entry["offset"]
+        nbytes = dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+        arrays[name] = buffer[start : start + nbytes].view(dtype).reshape(shape)
+    return arrays
@@ -0,0 +1,293 @@
+# Copyright 2023 Quantinuum and The University of Tokyo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import numpy as np
+from typing import Any, Hashable, Iterable, Sequence
+
+
+class IndexedBipartiteGraph:
+    """A bipartite graph whose nodes are mapped to dense integer IDs and
+    whose adjacency is stored in compressed sparse row (CSR) format. Nodes
+    are only hashed when the graph is built and when results are mapped back
+    to them; the algorithms themselves work on the integer arrays.
+
+    The inverse map from nodes to IDs is available as ``node_index``.
+
+    :param nodes: Maps each integer ID to its node.
+    :type nodes: list[Hashable]
+    :param indptr: The neighbours of node ``i`` are
+        ``indices[indptr[i]:indptr[i+1]]``.
+    :type indptr: np.ndarray
+    :param indices: Concatenation of the neighbourhoods of all nodes.
+    :type indices: np.ndarray
+    :param is_top: Whether each node is in the top half of the bipartition.
+    :type is_top: np.ndarray
+    """
+
+    def __init__(
+        self,
+        nodes: list[Hashable],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        is_top: np.ndarray,
+    ):
+        self.nodes: list[Hashable] = nodes
+        self.node_index: dict[Hashable, int] = {n: i for i, n in enumerate(nodes)}
+        self.indptr: np.ndarray = indptr
+        self.indices: np.ndarray = indices
+        self.is_top: np.ndarray = is_top
+
+    @classmethod
+    def from_edges(
+        cls, edges: Iterable[tuple[Hashable, Hashable]]
+    ) -> IndexedBipartiteGraph:
+        """Build the graph from a collection of edges. Each connected
+        component is split into top and bottom halves by a breadth first
+        search; isolated nodes are not included.
+
+        :param edges: The edges of the graph. Duplicates are ignored.
+        :type edges: Iterable[tuple[Hashable, Hashable]]
+        :raises Exception: Raised if the graph is not bipartite.
+        :return: The graph with integer IDs assigned in order of appearance.
+        :rtype: IndexedBipartiteGraph
+        """
+        nodes: list[Hashable] = []
+        node_index: dict[Hashable, int] = dict()
+        us: list[int] = []
+        vs: list[int] = []
+        for edge in edges:
+            ids = []
+            for node in edge:
+                if node not in node_index:
+                    node_index[node] = len(nodes)
+                    nodes.append(node)
+                ids.append(node_index[node])
+            us.append(ids[0])
+            vs.append(ids[1])
+
+        n = len(nodes)
+        # Store each edge in both directions and remove duplicates
+        src = np.array(us + vs, dtype=np.int64)
+        dst = np.array(vs + us, dtype=np.int64)
+        if len(src) > 0:
+            pairs = np.unique(np.stack([src, dst], axis=1), axis=0)
+            src, dst = pairs[:, 0], pairs[:, 1]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        indices = dst
+
+        # Two-colour each connected component
+        colour = [-1] * n
+        ptr = indptr.tolist()
+        adj = indices.tolist()
+        for root in range(n):
+            if colour[root] != -1:
+                continue
+            colour[root] = 0
+            queue = [root]
+            for u in queue:
+                for v in adj[ptr[u] : ptr[u + 1]]:
+                    if colour[v] == -1:
+                        colour[v] = 1 - colour[u]
+                        queue.append(v)
+                    elif colour[v] == colour[u]:
+                        raise Exception("The graph given is not bipartite.")
+
+        return cls(nodes, indptr, indices, np.array(colour, dtype=np.int8) == 1)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def top_nodes(self) -> set[Any]:
+        """Return the set of nodes in the top half of the bipartition."""
+        return {self.nodes[i] for i in np.flatnonzero(self.is_top)}
+
+    def edges(self) -> list[tuple[Any, Any]]:
+        """Return the list of edges, each given once from its top node."""
+        ptr = self.indptr.tolist()
+        adj = self.indices.tolist()
+        return [
+            (self.nodes[u], self.nodes[v])
+            for u in np.flatnonzero(self.is_top).tolist()
+            for v in adj[ptr[u] : ptr[u + 1]]
+        ]
+
+    def subgraph(self, nodes: Iterable[Hashable]) -> IndexedBipartiteGraph:
+        """Return the subgraph induced by ``nodes``. Nodes that are not in
+        this graph are ignored. The bipartition is inherited from this graph,
+        and the relative order of the integer IDs is preserved.
+        """
+        keep = np.zeros(len(self.nodes), dtype=bool)
+        for node in nodes:
+            i = self.node_index.get(node)
+            if i is not None:
+                keep[i] = True
+        old_ids = np.flatnonzero(keep)
+        new_id = np.full(len(self.nodes), -1, dtype=np.int64)
+        new_id[old_ids] = np.arange(len(old_ids))
+
+        degrees = np.diff(self.indptr)
+        src = np.repeat(np.arange(len(self.nodes)), degrees)
+        mask = keep[src] & keep[self.indices]
+        indices = new_id[self.indices[mask]]
+        indptr = np.zeros(len(old_ids) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(new_id[src[mask]], minlength=len(old_ids)), out=indptr[1:]
+        )
+
+        return IndexedBipartiteGraph(
+            [self.nodes[i] for i in old_ids.tolist()],
+            indptr,
+            indices,
+            self.is_top[old_ids],
+        )
+
+    def maximum_matching(self) -> np.ndarray:
+        """Find a maximum matching using the Hopcroft-Karp algorithm.
+
+        :return: An array ``match`` where ``match[i]`` is the ID of the node
+            matched with node ``i``, or -1 if ``i`` is unmatched.
+        :rtype: np.ndarray
+        """
+        return np.array(
+            hopcroft_karp(
+                self.indptr.tolist(), self.indices.tolist(), self.is_top.tolist()
+            ),
+            dtype=np.int64,
+        )
+
+    def minimum_vertex_cover(self) -> set[Any]:
+        """Find a minimum vertex cover from a maximum matching, using the
+        constructive proof of König's theorem. This is the same approach
+        as NetworkX's ``bipartite.to_vertex_cover``.
+
+        :return: The set of nodes in the cover.
+        :rtype: set[Hashable]
+        """
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        is_top = self.is_top.tolist()
+        match = hopcroft_karp(indptr, indices, is_top)
+        cover_ids = konig_cover(indptr, indices, is_top, match)
+        return {self.nodes[i] for i in cover_ids}
+
+
+def hopcroft_karp(
+    indptr: list[int], indices: list[int], is_top: Sequence[bool]
+) -> list[int]:
+    """Hopcroft-Karp maximum matching over a CSR adjacency.
+
+    :param indptr: CSR row pointers.
+    :type indptr: list[int]
+    :param indices: CSR column indices.
+    :type indices: list[int]
+    :param is_top: Whether each node is in the top half of the bipartition.
+    :type is_top: Sequence[bool]
+    :return: ``match[i]`` is the node matched with ``i``, or -1 if none.
+    :rtype: list[int]
+    """
+    n = len(indptr) - 1
+    match = [-1] * n
+    top = [u for u in range(n) if is_top[u]]
+    inf = n + 1
+
+    while True:
+        # Breadth first search from the free top nodes, layering the graph
+        dist = [inf] * n
+        queue = [u for u in top if match[u] == -1]
+        for u in queue:
+            dist[u] = 0
+        found_free = False
+        for u in queue:
+            for v in indices[indptr[u] : indptr[u + 1]]:
+                w = match[v]
+                if w == -1:
+                    found_free = True
+                elif dist[w] == inf:
+                    dist[w] = dist[u] + 1
+                    queue.append(w)
+        if not found_free:
+            break
+
+        # Depth first search along the layers, augmenting vertex-disjoint
+        # shortest paths. It is done iteratively to avoid recursion limits.
+        ptr = indptr[:-1].copy()
+        for root in top:
+            if match[root] != -1:
+                continue
+            stack = [root]
+            via: list[int] = []
+            while stack:
+                u = stack[-1]
+                advanced = False
+                while ptr[u] < indptr[u + 1]:
+                    v = indices[ptr[u]]
+                    ptr[u] += 1
+                    w = match[v]
+                    if w == -1:
+                        # Augment along the path in ``stack``
+                        via.append(v)
+                        for x, y in zip(stack, via):
+                            match[x] = y
+                            match[y] = x
+                        stack = []
+                        advanced = True
+                        break
+                    elif dist[w] == dist[u] + 1:
+                        via.append(v)
+                        stack.append(w)
+                        advanced = True
+                        break
+                if not advanced:
+                    # Dead end: no augmenting path goes through ``u``
+                    dist[u] = inf
+                    stack.pop()
+                    if via:
+                        via.pop()
+
+    return match
+
+
+def konig_cover(
+    indptr: list[int], indices: list[int], is_top: Sequence[bool], match: list[int]
+) -> list[int]:
+    """Given a maximum matching, find a minimum vertex cover following
+    König's theorem: if Z is the set of nodes reachable from unmatched top
+    nodes via alternating paths, the cover is (Top - Z) + (Bottom & Z).
+
+    :return: The sorted list of node IDs in the cover.
+    :rtype: list[int]
+    """
+    n = len(indptr) - 1
+    visited = [False] * n
+    queue = [u for u in range(n) if is_top[u] and match[u] == -1]
+    for u in queue:
+        visited[u] = True
+    for u in queue:
+        if is_top[u]:
+            # Follow edges not in the matching
+            for v in indices[indptr[u] : indptr[u + 1]]:
+                if v != match[u] and not visited[v]:
+                    visited[v] = True
+                    queue.append(v)
+        else:
+            # Follow the edge in the matching
+            w = match[u]
+            if w != -1 and not visited[w]:
+                visited[w] = True
+                queue.append(w)
+
+    return [u for u in range(n) if bool(is_top[u]) != visited[u]]
@@ -12,7 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from pytket import Circuit, OpType
+from pytket import Circuit, OpType, Qubit
+from typing import NamedTuple
 
 
 class ConstraintException(Exception):
@@ -27,15 +28,135 @@ class ConstraintException(Exception):
         self.v_gate = None
 
 
+class LinkEvent(NamedTuple):
+    """Change in the number of ebits linked to a server.
+
+    :param command_index: Index of the command causing the change.
+    :type command_index: int
+    :param server: The server whose link qubits changed.
+    :type server: int
+    :param occupancy: Number of ebits linked to the server after the change.
+    :type occupancy: int
+    """
+
+    command_index: int
+    server: int
+    occupancy: int
+
+
+class DistributedCircuitAnalysis(NamedTuple):
+    """Report produced by ``analyse_distributed_circuit``.
+
+    :param ebit_cost: Number of ebits consumed by the circuit.
+    :type ebit_cost: int
+    :param ebit_memory_required: Maximum number of ebits simultaneously
+        linked to each server.
+    :type ebit_memory_required: dict[int, int]
+    :param all_cu1_local: Whether all CU1 gates act on qubits of the same
+        server.
+    :type all_cu1_local: bool
+    :param non_local_cu1: Indices of the CU1 commands acting on qubits of
+        different servers.
+    :type non_local_cu1: list[int]
+    :param link_usage: Number of ebits shared between each pair of servers,
+        given as a pair in increasing order.
+    :type link_usage: dict[tuple[int, int], int]
+    :param link_occupancy: Timeline of the number of ebits linked to each
+        server, with one entry per starting and ending process.
+    :type link_occupancy: list[LinkEvent]
+    """
+
+    ebit_cost: int
+    ebit_memory_required: dict[int, int]
+    all_cu1_local: bool
+    non_local_cu1: list[int]
+    link_usage: dict[tuple[int, int], int]
+    link_occupancy: list[LinkEvent]
+
+
+def analyse_distributed_circuit(circ: Circuit) -> DistributedCircuitAnalysis:
+    """Scan a circuit produced by ``Distribution.to_pytket_circuit`` once,
+    and report its ebit cost, the ebit memory each server requires, whether
+    its CU1 gates are local and how its links between servers are used.
+    Qubits whose names do not follow the naming of distributed circuits
+    are not assigned to a server, and CU1 gates acting on them are not
+    checked, so that the ebit cost of any circuit may be found.
+
+    :param circ: The circuit to be analysed.
+    :type circ: Circuit
+
+    :return: The analysis of the circuit.
+    :rtype: DistributedCircuitAnalysis
+    """
+
+    # The name of a qubit is only parsed once, and only if the qubit takes
+    # part in a CU1 gate or an EJPP process
+    qubit_info: dict[Qubit, tuple[int, bool]] = dict()
+
+    def info(qubit: Qubit) -> tuple[int, bool]:
+        if qubit not in qubit_info:
+            qubit_info[qubit] = (get_server_id(qubit), is_link_qubit(qubit))
+        return qubit_info[qubit]
+
+    memory = {info(qubit)[0]: 0 for qubit in circ.qubits if _is_server_qubit(qubit)}
+    current = {server: 0 for server in memory}
+    non_local_cu1 = []
+    link_usage: dict[tuple[int, int], int] = dict()
+    link_occupancy = []
+    starting_count = 0
+    ending_count = 0
+    telep_count = 0
+
+    def use_link(qubits: list) -> None:
+        servers = sorted(info(q)[0] for q in qubits)
+        pair = (servers[0], servers[1])
+        link_usage[pair] = link_usage.get(pair, 0) + 1
+
+    for index, command in enumerate(circ.get_commands()):
+        op_type = command.op.type
+        if op_type == OpType.CU1:
+            q0, q1 = command.qubits
+            if not (_is_server_qubit(q0) and _is_server_qubit(q1)):
+                continue
+            if info(q0)[0] != info(q1)[0]:
+                non_local_cu1.append(index)
+        elif op_type == OpType.CustomGate:
+            name = command.op.get_name()
+            if name == "starting_process":
+                link_qubit = command.qubits[1]
+                server, is_link = info(link_qubit)
+                assert is_link
+                starting_count += 1
+                use_link(command.qubits)
+                current[server] += 1
+                memory[server] = max(memory[server], current[server])
+                link_occupancy.append(LinkEvent(index, server, current[server]))
+            elif name == "ending_process":
+                link_qubit = command.qubits[0]
+                server, is_link = info(link_qubit)
+                assert is_link
+                ending_count += 1
+                current[server] -= 1
+                link_occupancy.append(LinkEvent(index, server, current[server]))
+            elif name == "teleportation":
+                telep_count += 1
+                use_link(command.qubits)
+
+    assert starting_count == ending_count
+
+    return DistributedCircuitAnalysis(
+        ebit_cost=starting_count + telep_count,
+        ebit_memory_required=memory,
+        all_cu1_local=not non_local_cu1,
+        non_local_cu1=non_local_cu1,
+        link_usage=link_usage,
+        link_occupancy=link_occupancy,
+    )
+
+
 def all_cu1_local(circ: Circuit) -> bool:
     """Checks that all of the CU1 gates in the circuit are local."""
-    cu1_gates = [gate for gate in circ.get_commands() if gate.op.type == OpType.CU1]
-    for gate in cu1_gates:
-        q0 = gate.qubits[0]
-        q1 = gate.qubits[1]
-        if get_server_id(q0) != get_server_id(q1):
-            return False
-    return True
+    return analyse_distributed_circuit(circ).all_cu1_local
 
 
 def ebit_memory_required(circ: Circuit) -> dict[int, int]:
@@ -51,37 +172,7 @@ def ebit_memory_required(circ: Circuit) -> dict[int, int]:
         there are 3 ebits simultaneously sharing a qubit with server 2.
     :rtype: dict[int, int]
     """
-    ebit_memory_required = dict()
-    current = dict()
-
-    # Find all server IDs and initialise their ebit memory to 0
-    for qubit in circ.qubits:
-        server_id = get_server_id(qubit)
-        ebit_memory_required[server_id] = 0
-        current[server_id] = 0
-
-    # Scan the circuit for starting and ending EJPP processes and update
-    #   the ebit memory requirement accordingly
-    for command in circ.get_commands():
-        # Increase the current memory if an EJPP process starts
-        if command.op.get_name() == "starting_process":
-            link_qubit = command.qubits[1]
-            assert is_link_qubit(link_qubit)
-            server_id = get_server_id(link_qubit)
-            current[server_id] += 1
-
-            # Check if the ebit memory needs to be increased
-            if current[server_id] > ebit_memory_required[server_id]:
-                ebit_memory_required[server_id] += 1
-
-        # Decrease the current memory if an EJPP process ends
-        elif command.op.get_name() == "ending_process":
-            link_qubit = command.qubits[0]
-            assert is_link_qubit(link_qubit)
-            server_id = get_server_id(link_qubit)
-            current[server_id] -= 1
-
-    return ebit_memory_required
+    return analyse_distributed_circuit(circ).ebit_memory_required
 
 
 # TODO: This is checked by parsing the name of the qubit.
@@ -95,6 +186,13 @@ def is_link_qubit(qubit) -> bool:
     return len(qubit_name) > 2
 
 
+def _is_server_qubit(qubit: Qubit) -> bool:
+    """Whether the name of ``qubit`` follows the naming of the qubits of
+    circuits produced by ``Distribution.to_pytket_circuit``.
+    """
+    return qubit.reg_name.startswith("server_")
+
+
 # TODO: The way the server ID is obtained is by parsing the name of
 # the qubit. Is there a better way to access this information?
 def get_server_id(qubit) -> int:
@@ -121,19 +219,4 @@ def ebit_cost(circ: Circuit) -> int:
     :return: The number of ebits consumed by the circuit.
     :rtype: int
     """
-
-    starting_count = 0
-    ending_count = 0
-    telep_count = 0
-
-    for command in circ.get_commands():
-        if command.op.get_name() == "starting_process":
-            starting_count += 1
-        elif command.op.get_name() == "ending_process":
-            ending_count += 1
-        elif command.op.get_name() == "teleportation":
-            telep_count += 1
-
-    assert starting_count == ending_count
-
-    return starting_count + telep_count
+    return analyse_distributed_circuit(circ).ebit_cost
@@ -0,0 +1,57 @@
+# Copyright 2023 Quantinuum and The University of Tokyo
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import hashlib
+from pytket import Circuit
+
+
+def new_hasher() -> hashlib.blake2b:
+    """Return the rolling hash used by all fingerprints."""
+    return hashlib.blake2b(digest_size=16)
+
+
+def update_with_circuit(hasher: hashlib.blake2b, circ: Circuit) -> None:
+    """Stream the qubits and commands of ``circ`` into ``hasher``. The
+    names of the qubits are hashed once, and commands refer to qubits by
+    their index in ``circ.qubits``. Distributions and qubit mappings refer
+    to qubits by name, so circuits whose qubits are named differently must
+    not share a hash.
+
+    :param hasher: The hash to be updated.
+    :type hasher: hashlib.blake2b
+    :param circ: The circuit to be hashed.
+    :type circ: Circuit
+    """
+    qubit_index = {qubit: i for i, qubit in enumerate(circ.qubits)}
+    hasher.update(f"{[qubit.to_list() for qubit in qubit_index]}\n".encode())
+    for command in circ.get_commands():
+        op = command.op
+        qubits = ",".join(str(qubit_index[q]) for q in command.qubits)
+        hasher.update(f"{op.type.name}{op.params}{qubits}\n".encode())
+
+
+def circuit_fingerprint(circ: Circuit) -> str:
+    """Return a fingerprint of ``circ``, which is equal for circuits with
+    the same qubits and the same commands acting on them.
+
+    :param circ: The circuit to be fingerprinted.
+    :type circ: Circuit
+    :return: Hexadecimal digest of the commands of the circuit.
+    :rtype: str
+    """
+    hasher = new_hasher()
+    update_with_circuit(hasher, circ)
+    return hasher.hexdigest()
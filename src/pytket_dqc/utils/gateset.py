@@ -14,6 +14,7 @@
 
 import numpy as np
 import logging
+from collections import OrderedDict
 
 from pytket.predicates import (
     GateSetPredicate,
@@ -32,8 +33,7 @@ from pytket.passes import (
     BasePass,
 )
 from pytket.circuit import CustomGateDef, Op, Command
-from typing import Optional
-import sympy  # type: ignore
+from typing import Any, Callable, Hashable, Optional
 
 logging.basicConfig(level=logging.INFO)
 
@@ -47,6 +47,67 @@ dqc_2_qubit = {
 }
 dqc_gateset = dqc_1_qubit.union(dqc_2_qubit)
 
+# Ops used by the decompositions below. Ops are immutable, so these are
+# shared rather than created anew on every call.
+_ID_RZ = Op.create(OpType.Rz, [0])
+_S = Op.create(OpType.Rz, [0.5])
+_HADAMARD = Op.create(OpType.H)
+
+# Parameters are rounded to multiples of ``_PARAM_QUANTUM`` half-turns to
+# form the keys of the caches of decompositions, so that parameters that
+# only differ by floating point error share an entry.
+_PARAM_QUANTUM = 1e-12
+_DECOMPOSITION_CACHE_SIZE = 4096
+
+
+class _DecompositionCache:
+    """Least recently used cache of decompositions, holding at most
+    ``max_size`` entries.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the entry of ``key``, calling ``compute`` to create it if
+        there is none.
+        """
+        try:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        except KeyError:
+            pass
+        value = compute()
+        self._entries[key] = value
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_tk1_cache = _DecompositionCache(_DECOMPOSITION_CACHE_SIZE)
+_tk2_cache = _DecompositionCache(_DECOMPOSITION_CACHE_SIZE)
+_euler_cache = _DecompositionCache(_DECOMPOSITION_CACHE_SIZE)
+
+
+def _quantise(params) -> Optional[tuple[int, ...]]:
+    """Key of numeric parameters, or None if any of them is symbolic."""
+    if not all(isinstance(p, (int, float)) for p in params):
+        return None
+    return tuple(round(p / _PARAM_QUANTUM) for p in params)
+
+
+def clear_decomposition_caches() -> None:
+    """Empty the caches of ``tk1_to_euler``, ``tk2_to_cu1`` and
+    ``to_euler_with_two_hadamards``.
+    """
+    _tk1_cache.clear()
+    _tk2_cache.clear()
+    _euler_cache.clear()
+
 
 def check_function(circ):
     return NoSymbolsPredicate().verify(circ) and GateSetPredicate(dqc_gateset).verify(
@@ -78,7 +139,17 @@ def tk2_to_cu1(a, b, c) -> Circuit:
     Note: Unfortunately, pytket does not currently support a simple
     interface to write rebase passes other than those based on replacing
     TK2 gates and CX gates; in this case, we are using the former.
+
+    Note: Decompositions of numeric parameters are cached, so that
+    repeated gates are only decomposed once.
     """
+    key = _quantise((a, b, c))
+    if key is None:
+        return _tk2_to_cu1(a, b, c)
+    return _tk2_cache.get(key, lambda: _tk2_to_cu1(a, b, c)).copy()
+
+
+def _tk2_to_cu1(a, b, c) -> Circuit:
     circ = Circuit(2)
     # The ZZPhase(c) gate
     circ.add_gate(OpType.CU1, -2 * c, [0, 1]).Rz(c, 0).Rz(c, 1)
@@ -96,7 +167,17 @@ def tk2_to_cu1(a, b, c) -> Circuit:
 def tk1_to_euler(a, b, c) -> Circuit:
     """Given a TK1 gate Rz(a)*Rx(b)*Rz(c), return an equivalent circuit
     using Rz and Rx gates.
+
+    Note: Decompositions of numeric parameters are cached, so that
+    repeated gates are only decomposed once.
     """
+    key = _quantise((a, b, c))
+    if key is None:
+        return _tk1_to_euler(a, b, c)
+    return _tk1_cache.get(key, lambda: _tk1_to_euler(a, b, c)).copy()
+
+
+def _tk1_to_euler(a, b, c) -> Circuit:
     # NOTE: The correctness of these gate replacements has been checked by
     # composing the new circuit with the adjoint of the original one. Such a
     # test was done for each of the cases (with appropriate values of ``b``)
@@ -114,7 +195,9 @@ def tk1_to_euler(a, b, c) -> Circuit:
     # We then use the decomposition of H = Rz(0.5)*Rx(0.5)*Rz(0.5) and
     # H = Rz(-0.5)*Rx(-0.5)*Rz(-0.5) to introduce the H gates as needed.
 
-    if any(type(x) is sympy.core.mul.Mul for x in [a, b, c]):
+    from sympy.core.mul import Mul  # type: ignore
+
+    if any(type(x) is Mul for x in [a, b, c]):
         raise Exception("Symbolic parameters are not supported")
 
     circ = Circuit(1)
@@ -142,11 +225,23 @@ def to_euler_with_two_hadamards(ops: list[Op]) -> list[Op]:
     that is of the form [Rz, H, Rz, H, Rz].
 
     NOTE: Global Phases are not preserved.
+    NOTE: Decompositions are cached, keyed by the type and parameters of
+    each op, so that repeated sequences of gates are only decomposed once.
     """
 
+    key = []
+    for op in ops:
+        params = _quantise(op.params)
+        if params is None:
+            return _to_euler_with_two_hadamards(ops)
+        key.append((op.type, params))
+    return list(_euler_cache.get(tuple(key), lambda: _to_euler_with_two_hadamards(ops)))
+
+
+def _to_euler_with_two_hadamards(ops: list[Op]) -> list[Op]:
     hadamard_indices = [i for i, op in enumerate(ops) if op.type == OpType.H]
-    id_rz = Op.create(OpType.Rz, [0])
-    hadamard = Op.create(OpType.H)
+    id_rz = _ID_RZ
+    hadamard = _HADAMARD
     hadamard_count = len(hadamard_indices)
 
     # The following should be guranteed by DQCPass()
@@ -176,7 +271,7 @@ def to_euler_with_two_hadamards(ops: list[Op]) -> list[Op]:
 
     else:
         assert len(ops) <= 3, "There can only be up to 3 ops in this decomposition."
-        s_op = Op.create(OpType.Rz, [0.5])
+        s_op = _S
 
         # The list is just [H]
         if len(ops) == 1:
@@ -208,7 +303,7 @@ def to_euler_with_two_hadamards(ops: list[Op]) -> list[Op]:
                 second_new_phase_op,
             ]
 
-    logging.debug(f"Converted {ops} for {new_ops}")
+    logging.debug("Converted %s for %s", ops, new_ops)
 
     assert len(new_ops) == 5
     assert all(
@@ -12,7 +12,97 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
 from pytket import OpType, Circuit
+from typing import IO, Iterator, Union
+
+_HEADER = [
+    "OPENQASM 2.0;\n",
+    'include "qelib1.inc";\n',
+    "\n",
+    "gate starting_process q,e\n",
+    "{\n",
+    "\tbarrier q,e;\n",
+    "}\n",
+    "gate ending_process e,q\n",
+    "{\n",
+    "\tbarrier e,q;\n",
+    "}\n",
+    "\n",
+]
+
+
+def qasm_lines(circ: Circuit) -> Iterator[str]:
+    """Generator of the lines of the QASM representation of the circuit,
+    each ending in a newline, where the starting and ending processes are
+    represented as custom gates. Lines are produced as the commands of the
+    circuit are iterated over.
+
+    :param circ: The circuit in pytket format.
+    :type circ: Circuit
+
+    :return: The lines of the QASM output.
+    :rtype: Iterator[str]
+    """
+
+    yield from _HEADER
+    for register in circ.q_registers:
+        yield f"qreg {register.name}[{register.size}];\n"
+    yield "\n"
+
+    gate_names: dict[OpType, str] = dict()
+    for command in circ.get_commands():
+        op = command.op
+        args = command.args
+        if op.type == OpType.CustomGate:
+            custom_name = op.get_name()
+            if custom_name in ["starting_process", "ending_process"]:
+                yield f"{custom_name} {args[0]},{args[1]};\n"
+                continue
+
+        name = gate_names.get(op.type)
+        if name is None:
+            name = op.type.name.lower()
+            gate_names[op.type] = name
+        if op.type in [OpType.Rz, OpType.CU1]:
+            params = "".join(f"{param}*pi" for param in op.params)
+            name = f"{name}({params})"
+        yield f"{name} {','.join(str(arg) for arg in args)};\n"
+
+
+def write_qasm(
+    circ: Circuit, f: Union[IO[str], IO[bytes]], buffer_size: int = 1 << 16
+) -> None:
+    """Write the QASM representation of the circuit to a file-like object,
+    in chunks of about ``buffer_size`` characters, so that memory use does
+    not grow with the size of the circuit. The output is the same as that
+    of ``to_qasm_str``.
+
+    :param circ: The circuit in pytket format.
+    :type circ: Circuit
+    :param f: Text or binary file-like object to write to. Binary objects
+        are written UTF-8 encoded text.
+    :type f: Union[IO[str], IO[bytes]]
+    :param buffer_size: Approximate number of characters written at a time.
+    :type buffer_size: int
+    """
+
+    binary = isinstance(f, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(
+        f, "mode", ""
+    )
+    chunk: list[str] = []
+    chunk_size = 0
+    for line in qasm_lines(circ):
+        chunk.append(line)
+        chunk_size += len(line)
+        if chunk_size >= buffer_size:
+            text = "".join(chunk)
+            f.write(text.encode() if binary else text)  # type: ignore
+            chunk = []
+            chunk_size = 0
+    if chunk:
+        text = "".join(chunk)
+        f.write(text.encode() if binary else text)  # type: ignore
 
 
 def to_qasm_str(circ: Circuit):
@@ -26,41 +116,4 @@ def to_qasm_str(circ: Circuit):
     :rtype: str
     """
 
-    qasm_str = "OPENQASM 2.0;"
-    qasm_str += '\ninclude "qelib1.inc";'
-    qasm_str += "\n"
-    qasm_str += "\ngate starting_process q,e"
-    qasm_str += "\n{"
-    qasm_str += "\n\tbarrier q,e;"
-    qasm_str += "\n}"
-    qasm_str += "\ngate ending_process e,q"
-    qasm_str += "\n{"
-    qasm_str += "\n\tbarrier e,q;"
-    qasm_str += "\n}"
-    qasm_str += "\n"
-
-    for register in circ.q_registers:
-        qasm_str += f"\nqreg {register.name}[{register.size}];"
-    qasm_str += "\n"
-
-    for command in circ.get_commands():
-        if command.op.get_name() == "starting_process":
-            qasm_str += f"\nstarting_process {command.args[0]},{command.args[1]};"
-        elif command.op.get_name() == "ending_process":
-            qasm_str += f"\nending_process {command.args[0]},{command.args[1]};"
-        else:
-            qasm_str += "\n"
-            qasm_str += command.op.type.name.lower()
-
-            if command.op.type in [OpType.Rz, OpType.CU1]:
-                qasm_str += "("
-                for param in command.op.params:
-                    qasm_str += f"{param}*pi"
-                qasm_str += ")"
-
-            qasm_str += f" {command.args[0]}"
-            for arg in command.args[1:]:
-                qasm_str += f",{arg}"
-            qasm_str += ";"
-
-    return qasm_str + "\n"
+    return "".join(qasm_lines(circ))
@@ -12,12 +12,68 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from __future__ import annotations
+
+import math
+import numpy as np
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from pytket import Circuit, OpType, Qubit
+from pytket.circuit import Command
 from pytket.passes import AutoRebase
 
-from pytket.extensions.pyzx import tk_to_pyzx
-import pyzx as zx
 from .gateset import is_start_proc, is_end_proc
+from typing import NamedTuple, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pyzx as zx
+
+
+class SegmentResult(NamedTuple):
+    """Outcome of the verification of one segment by
+    ``check_equivalence_segmented``.
+
+    :param segment_index: Position of the segment.
+    :type segment_index: int
+    :param first_command: Index of the first command of the segment in the
+        commands of the distributed circuit.
+    :type first_command: int
+    :param last_command: Index of the last command of the segment in the
+        commands of the distributed circuit.
+    :type last_command: int
+    :param n_commands: Number of commands of the distributed circuit in the
+        segment. One qubit gates are assigned to the segment of the
+        previous command on their qubit, so the commands of a segment need
+        not be contiguous.
+    :type n_commands: int
+    :param equivalent: Whether the segment was proven to be equivalent to
+        the corresponding segment of the original circuit.
+    :type equivalent: bool
+    """
+
+    segment_index: int
+    first_command: int
+    last_command: int
+    n_commands: int
+    equivalent: bool
+
+
+class SegmentedEquivalenceReport(NamedTuple):
+    """Report produced by ``check_equivalence_segmented``.
+
+    :param equivalent: Whether every segment was proven to be equivalent,
+        which proves the circuits to be equivalent.
+    :type equivalent: bool
+    :param segments: The result of each segment, in order.
+    :type segments: list[SegmentResult]
+    """
+
+    equivalent: bool
+    segments: list[SegmentResult]
+
+    def failed_segments(self) -> list[SegmentResult]:
+        """Return the segments that could not be proven equivalent."""
+        return [segment for segment in self.segments if not segment.equivalent]
 
 
 def check_equivalence(
@@ -54,6 +110,8 @@ def check_equivalence(
     :return: Whether the circuits are proven to be equivalent.
     :rtype: bool
     """
+    # Imported here, since loading PyZX is slow
+    import pyzx as zx
 
     # Note: the implementation is based on the code for verify_equality from
     # https://github.com/Quantomatic/pyzx/blob/master/pyzx/circuit/__init__.py
@@ -97,6 +155,7 @@ def to_pyzx(circuit: Circuit, mask: list[Qubit]) -> zx.graph.base.BaseGraph:
         to the intended order of wires in the output ZX-diagram.
     :type mask: list[Qubit]
     """
+    from pytket.extensions.pyzx import tk_to_pyzx
 
     # We need that the logical qubits in ``mask`` are on the top
     # wires of the circuit, ordered as in ``mask``.
@@ -178,3 +237,406 @@ def to_pyzx(circuit: Circuit, mask: list[Qubit]) -> zx.graph.base.BaseGraph:
     assert len(zx_graph.inputs()) == len(mask)
     assert len(zx_graph.outputs()) == len(mask)
     return zx_graph
+
+
+def check_equivalence_segmented(
+    circ1: Circuit,
+    circ2: Circuit,
+    qubit_mapping: dict[Qubit, Qubit],
+    segment_size: int = 1000,
+    num_workers: Optional[int] = None,
+) -> SegmentedEquivalenceReport:
+    """Check the equivalence of a circuit ``circ1`` and its distributed
+    version ``circ2``, as produced by ``Distribution.to_pytket_circuit``,
+    by splitting both circuits into segments and checking each pair of
+    segments with ``check_equivalence``. If every segment is equivalent,
+    so are the circuits. Otherwise, the report identifies the segments
+    that could not be proven equivalent.
+
+    ``circ2`` is cut at points where no link qubit is alive and where the
+    next gate on each workspace qubit is not an EJPP process, so that the
+    one qubit gates rewritten by embeddings never straddle a cut. The
+    segments of ``circ1`` are found by matching the two qubit gates acting
+    on each of its qubits with those in ``circ2``, where a link qubit acts
+    on behalf of the qubit it shares. If the segments found for the two
+    qubits of a gate disagree, the segments in between are merged.
+
+    :param circ1: The original circuit.
+    :type circ1: Circuit
+    :param circ2: The distributed circuit.
+    :type circ2: Circuit
+    :param qubit_mapping: A mapping from qubits of ``circ1`` to qubits of
+        ``circ2``, as given by ``Distribution.get_qubit_mapping``.
+    :type qubit_mapping: dict[Qubit, Qubit]
+    :param segment_size: Minimum number of commands of ``circ2`` in each
+        segment, except for the last one. Default is 1000.
+    :type segment_size: int
+    :param num_workers: Number of worker processes among which segments
+        are checked. Default is None, meaning segments are checked serially
+        in the current process.
+    :type num_workers: Optional[int]
+
+    :return: Report of the verification of each segment.
+    :rtype: SegmentedEquivalenceReport
+    """
+
+    commands1 = circ1.get_commands()
+    commands2 = circ2.get_commands()
+    segment1, segment2, n_segments = _find_segments(
+        commands1, commands2, qubit_mapping, segment_size
+    )
+
+    # Bucket the commands of each circuit by segment in a single pass
+    commands1_of: list[list[Command]] = [[] for _ in range(n_segments)]
+    for command, seg in zip(commands1, segment1):
+        commands1_of[seg].append(command)
+    indices2_of: list[list[int]] = [[] for _ in range(n_segments)]
+    for i, seg in enumerate(segment2):
+        indices2_of[seg].append(i)
+
+    jobs = []
+    for segment in range(n_segments):
+        sub1 = Circuit()
+        for qubit in circ1.qubits:
+            sub1.add_qubit(qubit)
+        for command in commands1_of[segment]:
+            sub1.add_gate(command.op, command.qubits)
+        sub2 = Circuit()
+        sub2_qubits = set(qubit_mapping.values())
+        for qubit in qubit_mapping.values():
+            sub2.add_qubit(qubit)
+        for i in indices2_of[segment]:
+            command = commands2[i]
+            for qubit in command.qubits:
+                if qubit not in sub2_qubits:
+                    sub2_qubits.add(qubit)
+                    sub2.add_qubit(qubit)
+            sub2.add_gate(command.op, command.qubits)
+        jobs.append((sub1.to_dict(), sub2.to_dict()))
+
+    mapping_list = [(q1.to_list(), q2.to_list()) for q1, q2 in qubit_mapping.items()]
+    if num_workers is None:
+        results = [_check_segment(c1, c2, mapping_list) for c1, c2 in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            results = list(
+                executor.map(
+                    _check_segment,
+                    [c1 for c1, _ in jobs],
+                    [c2 for _, c2 in jobs],
+                    [mapping_list] * len(jobs),
+                )
+            )
+
+    segments = []
+    for segment, equivalent in enumerate(results):
+        indices = indices2_of[segment]
+        segments.append(
+            SegmentResult(
+                segment_index=segment,
+                first_command=indices[0] if indices else -1,
+                last_command=indices[-1] if indices else -1,
+                n_commands=len(indices),
+                equivalent=equivalent,
+            )
+        )
+    return SegmentedEquivalenceReport(all(results), segments)
+
+
+def _check_segment(circ1_dict: dict, circ2_dict: dict, mapping_list: list) -> bool:
+    """Check the equivalence of a pair of segments. Defined at module level
+    so that it may be sent to worker processes.
+    """
+    qubit_mapping = {
+        Qubit.from_list(q1): Qubit.from_list(q2) for q1, q2 in mapping_list
+    }
+    return check_equivalence(
+        Circuit.from_dict(circ1_dict), Circuit.from_dict(circ2_dict), qubit_mapping
+    )
+
+
+def _find_segments(
+    commands1: list[Command],
+    commands2: list[Command],
+    qubit_mapping: dict[Qubit, Qubit],
+    segment_size: int,
+) -> tuple[list[int], list[int], int]:
+    """Assign each command of the original and distributed circuits to a
+    segment, as described in ``check_equivalence_segmented``.
+
+    :return: The segment of each command of ``commands1``, the segment of
+        each command of ``commands2`` and the number of segments. If the
+        circuits cannot be matched, everything is in a single segment.
+    :rtype: tuple[list[int], list[int], int]
+    """
+
+    def is_process(command: Command) -> bool:
+        return is_start_proc(command) or is_end_proc(command)
+
+    # Find the cut points of the distributed circuit
+    workspace = set(qubit_mapping.values())
+    multi_qubit: dict[Qubit, list[int]] = {q: [] for q in workspace}
+    candidates = []
+    alive = 0
+    for index, command in enumerate(commands2):
+        if is_start_proc(command):
+            alive += 1
+        elif is_end_proc(command):
+            alive -= 1
+        if len(command.qubits) > 1:
+            for qubit in command.qubits:
+                if qubit in workspace:
+                    multi_qubit[qubit].append(index)
+        if alive == 0:
+            candidates.append(index + 1)
+
+    def is_safe(cut: int) -> bool:
+        for indices in multi_qubit.values():
+            i = bisect_left(indices, cut)
+            if i < len(indices) and is_process(commands2[indices[i]]):
+                return False
+        return True
+
+    cuts: list[int] = []
+    for cut in candidates:
+        if cut - (cuts[-1] if cuts else 0) >= segment_size and cut < len(commands2):
+            if is_safe(cut):
+                cuts.append(cut)
+
+    # Assign segments to the distributed circuit, following each link qubit
+    # back to the logical qubit it shares
+    logical_of = {q2: q1 for q1, q2 in qubit_mapping.items()}
+    wire_segment: dict[Qubit, int] = dict()
+    segment2 = []
+    two_qubit_segments: dict[Qubit, list[int]] = {q: [] for q in qubit_mapping}
+    try:
+        for index, command in enumerate(commands2):
+            if len(command.qubits) == 1:
+                segment = wire_segment.get(command.qubits[0], 0)
+            else:
+                segment = bisect_right(cuts, index)
+            segment2.append(segment)
+            for qubit in command.qubits:
+                wire_segment[qubit] = segment
+
+            if is_process(command):
+                if is_start_proc(command):
+                    logical_of[command.qubits[1]] = logical_of[command.qubits[0]]
+            elif len(command.qubits) == 2:
+                for qubit in command.qubits:
+                    two_qubit_segments[logical_of[qubit]].append(segment)
+    except KeyError:
+        return [0] * len(commands1), [0] * len(commands2), 1
+
+    # Match the two qubit gates of the original circuit, merging segments
+    # where the two qubits of a gate disagree
+    merged = [False] * (len(cuts) + 1)
+    count = {q: 0 for q in qubit_mapping}
+    pending = []
+    for command in commands1:
+        if len(command.qubits) == 1:
+            continue
+        segments = []
+        for qubit in command.qubits:
+            if count[qubit] >= len(two_qubit_segments[qubit]):
+                return [0] * len(commands1), [0] * len(commands2), 1
+            segments.append(two_qubit_segments[qubit][count[qubit]])
+            count[qubit] += 1
+        pending.append(segments)
+        for boundary in range(min(segments) + 1, max(segments) + 1):
+            merged[boundary] = True
+    if any(count[q] != len(two_qubit_segments[q]) for q in qubit_mapping):
+        return [0] * len(commands1), [0] * len(commands2), 1
+
+    # Renumber the segments once merged
+    group = []
+    current = 0
+    for segment in range(len(cuts) + 1):
+        if segment > 0 and not merged[segment]:
+            current += 1
+        group.append(current)
+    segment2 = [group[segment] for segment in segment2]
+
+    segment1 = []
+    wire_segment = dict()
+    two_qubit_gates = iter(pending)
+    for command in commands1:
+        if len(command.qubits) == 1:
+            segment = wire_segment.get(command.qubits[0], 0)
+        else:
+            segment = group[next(two_qubit_gates)[0]]
+        segment1.append(segment)
+        for qubit in command.qubits:
+            wire_segment[qubit] = segment
+
+    return segment1, segment2, current + 1
+
+
+def check_equivalence_statevector(
+    circ1: Circuit,
+    circ2: Circuit,
+    qubit_mapping: dict[Qubit, Qubit],
+    confidence: float = 0.999,
+    batch_size: int = 16,
+    tolerance: float = 1e-6,
+    seed: Optional[int] = None,
+) -> bool:
+    """Check the equivalence of two circuits by simulating both on the same
+    random input states, drawn from the Haar measure, and comparing the
+    output states. Unlike ``check_equivalence``, returning False proves
+    that the circuits are different, while returning True is a
+    probabilistic statement.
+
+    EJPP processes are simulated as in ``to_pyzx``: a starting process
+    applies a CX gate onto a fresh link qubit and an ending process applies
+    a CX gate onto the link qubit and then projects it to state 0. The
+    projection is only lossless if the link qubit is a copy of the qubit it
+    shares when ended, which is checked.
+
+    States are simulated in batches of ``batch_size``, stopping at the
+    first batch with a mismatch. A single Haar random state tells almost
+    any pair of different circuits apart. Conservatively assuming each
+    state only does so with probability 1/2, ``ceil(log2(1/(1 - confidence)))``
+    states are simulated.
+
+    NOTE: memory grows as ``2 ** (n + l)`` per state, where ``n`` is the
+    number of qubits in ``qubit_mapping`` and ``l`` the maximum number of
+    link qubits simultaneously in use, so this is only practical for
+    circuits of up to around 20 qubits.
+
+    :param circ1: The first of the two circuits to be compared for equality
+    :type circ1: Circuit
+    :param circ2: The second of the two circuits to be compared for equality
+    :type circ2: Circuit
+    :param qubit_mapping: A mapping from qubits of `circ1` to qubits of
+        `circ2`. Qubits not included must be link qubits, populated by
+        starting processes.
+    :type qubit_mapping: dict[Qubit, Qubit]
+    :param confidence: Probability with which different circuits are
+        reported as such, under the assumption above. Default is 0.999.
+    :type confidence: float
+    :param batch_size: Number of states simulated at once. Default is 16.
+    :type batch_size: int
+    :param tolerance: Numerical tolerance of the comparison of states.
+        Default is 1e-6.
+    :type tolerance: float
+    :param seed: Seed of the random input states. Default is None.
+    :type seed: Optional[int]
+
+    :return: Whether the circuits produced the same output state, up to
+        global phase, for every input state tried.
+    :rtype: bool
+    """
+
+    qubits1 = list(qubit_mapping.keys())
+    qubits2 = list(qubit_mapping.values())
+    if len(set(qubits2)) != len(qubits2):
+        raise Exception("The qubit mapping must be 1-to-1.")
+    if not 0 < confidence < 1:
+        raise Exception("The confidence must be strictly between 0 and 1.")
+
+    n_states = max(1, math.ceil(-math.log2(1 - confidence)))
+    n_qubits = len(qubits1)
+    rng = np.random.default_rng(seed)
+    unitaries: dict[tuple, np.ndarray] = dict()
+
+    while n_states > 0:
+        size = min(batch_size, n_states)
+        n_states -= size
+
+        # Haar random states, with the batch as the first axis
+        shape = (size,) + (2,) * n_qubits
+        states = rng.normal(size=shape) + 1j * rng.normal(size=shape)
+        norms = np.sqrt(np.sum(np.abs(states) ** 2, axis=tuple(range(1, n_qubits + 1))))
+        states /= norms.reshape((size,) + (1,) * n_qubits)
+
+        out1 = _simulate(circ1, qubits1, states, unitaries, tolerance)
+        out2 = _simulate(circ2, qubits2, states, unitaries, tolerance)
+        if out1 is None or out2 is None:
+            return False
+
+        # Compare up to global phase through the overlap of each pair
+        axes = tuple(range(1, n_qubits + 1))
+        overlaps = np.abs(np.sum(np.conj(out1) * out2, axis=axes))
+        if not np.all(np.abs(overlaps - 1) < tolerance):
+            return False
+
+    return True
+
+
+_CX = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex)
+
+
+def _simulate(
+    circuit: Circuit,
+    mask: list[Qubit],
+    states: np.ndarray,
+    unitaries: dict[tuple, np.ndarray],
+    tolerance: float,
+) -> Optional[np.ndarray]:
+    """Apply ``circuit`` to a batch of ``states``, whose axes after the
+    first follow the order of ``mask``. Link qubits are appended as new
+    axes while in use.
+
+    :return: The output states, or None if an ending process lost weight
+        when projecting its link qubit.
+    :rtype: Optional[np.ndarray]
+    """
+
+    # The axis of each qubit currently in use
+    axis = {q: i + 1 for i, q in enumerate(mask)}
+
+    def apply(matrix: np.ndarray, qubits: list[Qubit]) -> None:
+        nonlocal states
+        k = len(qubits)
+        targets = [axis[q] for q in qubits]
+        tensor = matrix.reshape((2,) * (2 * k))
+        states = np.tensordot(tensor, states, axes=(list(range(k, 2 * k)), targets))
+        # ``tensordot`` puts the output axes first; move them back
+        states = np.moveaxis(states, list(range(k)), targets)
+
+    for command in circuit.get_commands():
+        qubits = command.qubits
+        if is_start_proc(command):
+            if qubits[0] not in axis:
+                raise Exception("Attempting to act on a discarded qubit")
+            if qubits[1] in axis:
+                raise Exception("Starting process onto a link qubit in use")
+            if qubits[1] in mask:
+                raise Exception("Violated: q in mask <=> q not ancilla")
+            states = np.stack([states, np.zeros_like(states)], axis=-1)
+            axis[qubits[1]] = states.ndim - 1
+            apply(_CX, [qubits[0], qubits[1]])
+
+        elif is_end_proc(command):
+            if not all(q in axis for q in qubits):
+                raise Exception("Attempting to act on a discarded qubit")
+            apply(_CX, [qubits[1], qubits[0]])
+            removed = axis.pop(qubits[0])
+            lost = np.take(states, 1, axis=removed)
+            if np.sum(np.abs(lost) ** 2) > tolerance * len(states):
+                return None
+            states = np.take(states, 0, axis=removed)
+            for q, i in axis.items():
+                if i > removed:
+                    axis[q] = i - 1
+
+        elif command.op.type == OpType.CustomGate:
+            raise Exception(f"CustomGate {command.op.get_name()} not supported!")
+
+        elif command.op.type == OpType.Barrier:
+            continue
+
+        else:
+            if not all(q in axis for q in qubits):
+                raise Exception("Attempting to act on a discarded qubit")
+            op = command.op
+            key = (op.type, tuple(float(p) for p in op.params))
+            if key not in unitaries:
+                unitaries[key] = op.get_unitary()
+            apply(unitaries[key], qubits)
+
+    if len(axis) != len(mask):
+        raise Exception("Some link qubits are never released")
+    # Order the axes as in ``mask``
+    return np.moveaxis(states, [axis[q] for q in mask], list(range(1, len(mask) + 1)))
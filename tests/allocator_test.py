@@ -5,9 +5,11 @@ from pytket_dqc.allocators import (
     Routing,
     HypergraphPartitioning,
     Brute,
+    Multilevel,
 )
 from pytket_dqc.allocators.annealing import acceptance_criterion
 from pytket_dqc import HypergraphCircuit, Distribution
+from pytket_dqc.circuits import PreparedCircuit
 from pytket import Circuit
 from pytket_dqc.networks import NISQNetwork
 from pytket_dqc.allocators.ordered import order_reducing_size
@@ -104,6 +106,47 @@ def test_annealing_distribute():
     assert distribution.cost() == 3
 
 
+def test_annealing_warm_start():
+    network = NISQNetwork(
+        [[0, 1], [1, 2], [2, 3]],
+        {0: [0, 1], 1: [2, 3], 2: [4, 5], 3: [6, 7]},
+    )
+    circ = Circuit(8)
+    for layer in range(3):
+        for q in range(8):
+            circ.add_gate(OpType.CU1, 0.5, [q, (q + 2 * layer + 1) % 8]).H(q)
+
+    allocator = Annealing()
+    previous = allocator.allocate(circ, network, seed=0, iterations=2000)
+
+    # Nothing changed, so the previous placement is kept
+    distribution = allocator.allocate(
+        circ, network, seed=0, initial_distribution=previous
+    )
+    assert distribution.placement == previous.placement
+
+    new_circ = circ.copy()
+    new_circ.add_gate(OpType.CU1, 0.5, [0, 7])
+    distribution = allocator.allocate(
+        new_circ, network, seed=0, iterations=200, initial_distribution=previous
+    )
+    assert distribution.is_valid()
+    _, region = previous.transfer_placement(distribution.circuit)
+    # Gate vertices outside of the affected region are not moved
+    for v in distribution.circuit.vertex_list:
+        if v not in region and not distribution.circuit.is_qubit_vertex(v):
+            assert (
+                distribution.placement.placement[v] == previous.placement.placement[v]
+            )
+
+    with pytest.raises(Exception):
+        allocator.allocate(
+            circ,
+            NISQNetwork([[0, 1]], {0: [0, 1, 2, 3], 1: [4, 5, 6, 7]}),
+            initial_distribution=previous,
+        )
+
+
 def test_acceptance_criterion():
     assert acceptance_criterion(1, 10) >= 1
     assert acceptance_criterion(-1, 10) < 1
@@ -147,12 +190,196 @@ def test_graph_partitioning_make_valid():
 
     distribution = Distribution(dist_circ, bad_placement, network)
     allocator.make_valid(distribution, seed=1)
+    # Moving qubit 3 rather than qubit 0 out of server 2 is cheaper, since
+    # all of the gates of qubit 3 remain in server 2
     good_placement = Placement(
-        {0: 0, 1: 2, 2: 2, 3: 2, 4: 2, 5: 2, 6: 2, 7: 2, 8: 2, 9: 2}
+        {0: 2, 1: 2, 2: 2, 3: 0, 4: 2, 5: 2, 6: 2, 7: 2, 8: 2, 9: 2}
     )
 
     assert distribution.is_valid()
     assert distribution.placement == good_placement
+    assert distribution.cost() == 1
+
+
+def test_graph_partitioning_process_mapping():
+    network = NISQNetwork(
+        [[0, 1], [1, 2], [2, 3]],
+        {0: [0, 1], 1: [2, 3], 2: [4, 5], 3: [6, 7]},
+    )
+    # Blocks 0 and 3 interact heavily, but are at opposite ends of the line
+    circ = Circuit(8)
+    for _ in range(3):
+        circ.add_gate(OpType.CU1, 1.0, [0, 6]).H(0).H(6)
+        circ.add_gate(OpType.CU1, 1.0, [1, 7]).H(1).H(7)
+    circ.add_gate(OpType.CU1, 1.0, [2, 4])
+    dist_circ = HypergraphCircuit(circ)
+
+    block_of_qubit = {0: 0, 1: 0, 2: 1, 3: 1, 4: 2, 5: 2, 6: 3, 7: 3}
+    block_placement = {v: block_of_qubit[v] for v in dist_circ.get_qubit_vertices()}
+    for v in dist_circ.vertex_list:
+        if not dist_circ.is_qubit_vertex(v):
+            qubit = dist_circ.get_gate_of_vertex(v).qubits[0]
+            block_placement[v] = block_of_qubit[dist_circ.get_vertex_of_qubit(qubit)]
+    placement = Placement(block_placement)
+    distribution = Distribution(dist_circ, placement, network)
+    assert distribution.is_valid()
+
+    allocator = HypergraphPartitioning()
+    mapped = allocator.map_blocks_to_servers(dist_circ, network, placement)
+    mapped_distribution = Distribution(dist_circ, mapped, network)
+    assert mapped_distribution.is_valid()
+    assert mapped_distribution.cost() < distribution.cost()
+    # Blocks are relabelled as a whole
+    for u in dist_circ.vertex_list:
+        for v in dist_circ.vertex_list:
+            assert (placement.placement[u] == placement.placement[v]) == (
+                mapped.placement[u] == mapped.placement[v]
+            )
+
+    # An assignment that is already good is left untouched
+    assert allocator.map_blocks_to_servers(dist_circ, network, mapped) == mapped
+
+
+def test_graph_partitioning_portfolio():
+    network = NISQNetwork(
+        [[0, 1], [1, 2], [2, 3]],
+        {0: [0, 1], 1: [2, 3], 2: [4, 5], 3: [6, 7]},
+    )
+    circ = Circuit(8)
+    for layer in range(4):
+        for q in range(8):
+            circ.add_gate(OpType.CU1, 0.5, [q, (q + 2 * layer + 1) % 8]).H(q)
+
+    allocator = HypergraphPartitioning()
+    distribution = allocator.allocate(circ, network, seeds=[0, 1, 2])
+    assert distribution.is_valid()
+
+    report = allocator.portfolio_report
+    assert [candidate.seed for candidate in report] == [0, 1, 2]
+    assert all(candidate.time >= 0 for candidate in report)
+    assert distribution.cost() == min(candidate.cost for candidate in report)
+    for candidate in report:
+        single = HypergraphPartitioning().allocate(circ, network, seed=candidate.seed)
+        assert single.cost() == candidate.cost
+
+    # Running the portfolio in worker processes gives the same result
+    parallel_distribution = allocator.allocate(
+        circ, network, seeds=[0, 1, 2], num_workers=2
+    )
+    assert parallel_distribution.placement == distribution.placement
+    assert [c.cost for c in allocator.portfolio_report] == [c.cost for c in report]
+
+
+def test_prepared_circuit():
+    network = NISQNetwork(
+        [[0, 1], [1, 2], [2, 3]],
+        {0: [0, 1], 1: [2, 3], 2: [4, 5], 3: [6, 7]},
+    )
+    circ = Circuit(8)
+    for layer in range(4):
+        for q in range(8):
+            circ.add_gate(OpType.CU1, 0.5, [q, (q + 2 * layer + 1) % 8]).H(q)
+
+    prepared = PreparedCircuit(circ)
+    assert prepared.circuit == circ
+    assert prepared.hypergraph_circuit() == HypergraphCircuit(circ)
+    assert (
+        prepared.get_vertex_to_command_index_map()
+        == HypergraphCircuit(circ).get_vertex_to_command_index_map()
+    )
+
+    # Each allocator gives the same distribution whether or not the
+    # circuit is prepared, and never modifies the prepared hypergraph
+    for allocator, kwargs in [
+        (Random(), {"seed": 0}),
+        (Ordered(), {}),
+        (HypergraphPartitioning(), {"seed": 0}),
+        (Annealing(), {"seed": 0, "iterations": 100}),
+        (Multilevel(), {"seed": 0}),
+    ]:
+        distribution = allocator.allocate(prepared, network, **kwargs)
+        assert distribution.is_valid()
+        expected = allocator.allocate(circ, network, **kwargs)
+        assert distribution.placement == expected.placement
+    assert prepared.hypergraph_circuit() == HypergraphCircuit(circ)
+
+    # Prepared circuits are sent to worker processes
+    distribution = HypergraphPartitioning().allocate(
+        prepared, network, seeds=[0, 1], num_workers=2
+    )
+    assert distribution.is_valid()
+
+    invalid_circ = Circuit(2).CRz(0.5, 0, 1)
+    with pytest.raises(Exception):
+        PreparedCircuit(invalid_circ)
+
+
+def test_multilevel():
+    network = NISQNetwork(
+        [[0, 1], [1, 2], [2, 3]],
+        {0: [0, 1], 1: [2, 3], 2: [4, 5], 3: [6, 7]},
+    )
+    circ = Circuit(8)
+    for layer in range(4):
+        for q in range(8):
+            circ.add_gate(OpType.CU1, 0.5, [q, (q + 2 * layer + 1) % 8]).H(q)
+
+    allocator = Multilevel()
+    distribution = allocator.allocate(circ, network, seed=0)
+    assert distribution.is_valid()
+    assert distribution.cost() < Random().allocate(circ, network, seed=0).cost()
+
+    # Qubit vertices not acted on by any gate are placed too
+    distribution = allocator.allocate(Circuit(3), network, seed=0)
+    assert distribution.is_valid()
+    assert set(distribution.placement.placement.keys()) == {0, 1, 2}
+
+    distribution = allocator.allocate(Circuit(0), network, seed=0)
+    assert distribution.placement == Placement(dict())
+
+    with pytest.raises(Exception):
+        allocator.allocate(Circuit(9), network)
+
+
+def test_multilevel_coarsening():
+    network = NISQNetwork(
+        [[0, 1], [1, 2]],
+        {0: [0, 1, 2, 3], 1: [4, 5, 6, 7], 2: [8, 9, 10, 11]},
+    )
+    # Three groups of four qubits that only interact within the group
+    circ = Circuit(12)
+    for _ in range(3):
+        for group in range(3):
+            for i in range(4):
+                q = 4 * group + i
+                circ.add_gate(OpType.CU1, 0.5, [q, 4 * group + (i + 1) % 4]).H(q)
+
+    distribution = Multilevel().allocate(circ, network, seed=1, coarsening_limit=3)
+    assert distribution.is_valid()
+    assert distribution.cost() == 0
+
+
+def test_graph_partitioning_warm_start():
+    network = NISQNetwork([[0, 1], [0, 2]], {0: [0], 1: [1, 2], 2: [3, 4, 5]})
+    circ = (
+        Circuit(3).add_gate(OpType.CU1, 1.0, [0, 1]).add_gate(OpType.CU1, 1.0, [1, 2])
+    )
+    dist_circ = HypergraphCircuit(circ)
+    previous = Distribution(
+        dist_circ, Placement({0: 2, 1: 2, 2: 2, 3: 2, 4: 2}), network
+    )
+
+    # A new qubit no longer fits in server 2, so KaHyPar is not called but
+    # the transferred placement is made valid
+    new_circ = Circuit(4)
+    for cmd in circ.get_commands():
+        new_circ.add_gate(cmd.op, cmd.qubits)
+    new_circ.add_gate(OpType.CU1, 1.0, [2, 3])
+    distribution = HypergraphPartitioning().allocate(
+        new_circ, network, initial_distribution=previous
+    )
+    assert distribution.is_valid()
+    assert distribution.placement.placement[3] == 1
 
 
 @pytest.mark.skip(reason="Circuit contains CX gates that are not supported.")
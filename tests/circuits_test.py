@@ -2,7 +2,7 @@ import pickle
 import warnings
 import json
 import pytest
-from pytket import Circuit
+from pytket import Circuit, Qubit
 from pytket_dqc.placement import Placement
 from pytket_dqc.circuits import (
     RegularGraphHypergraphCircuit,
@@ -10,6 +10,7 @@ from pytket_dqc.circuits import (
     Hypergraph,
     Hyperedge,
     Distribution,
+    check_ejpp_structure,
 )
 from pytket_dqc.circuits.hypergraph import Vertex
 
@@ -17,10 +18,13 @@ from pytket_dqc.utils.gateset import (
     start_proc,
     end_proc,
     telep_proc,
+    is_end_proc,
 )
 from pytket_dqc.allocators import Brute, Random, HypergraphPartitioning
 from pytket_dqc.utils import (
+    circuit_fingerprint,
     check_equivalence,
+    check_equivalence_segmented,
     DQCPass,
     ConstraintException,
     ebit_memory_required,
@@ -1637,6 +1641,96 @@ def test_to_pytket_circuit_with_random_circ():
     )
 
 
+def test_check_equivalence_segmented():
+    # Randomly generated circuit of type random, depth 6 and 6 qubits
+    with open("tests/test_circuits/to_pytket_circuit/random_6.json", "r") as fp:
+        circ = Circuit().from_dict(json.load(fp))
+
+    network = NISQNetwork(
+        [[2, 1], [1, 0], [1, 3], [0, 4]],
+        {0: [0, 1, 2], 1: [3, 4], 2: [5, 6, 7], 3: [8], 4: [9]},
+    )
+
+    allocator = HypergraphPartitioning()
+    distribution = allocator.allocate(circ, network)
+    circ_with_dist = distribution.to_pytket_circuit()
+    qubit_mapping = distribution.get_qubit_mapping()
+
+    report = check_equivalence_segmented(
+        circ, circ_with_dist, qubit_mapping, segment_size=1
+    )
+    assert report.equivalent
+    assert not report.failed_segments()
+    assert sum(s.n_commands for s in report.segments) == len(
+        circ_with_dist.get_commands()
+    )
+
+    parallel_report = check_equivalence_segmented(
+        circ, circ_with_dist, qubit_mapping, segment_size=1, num_workers=2
+    )
+    assert parallel_report == report
+
+    # Altering a gate of the original circuit is reported on its segment
+    altered = Circuit()
+    for qubit in circ.qubits:
+        altered.add_qubit(qubit)
+    commands = circ.get_commands()
+    rz_index = max(i for i, c in enumerate(commands) if c.op.type == OpType.Rz)
+    for i, command in enumerate(commands):
+        if i == rz_index:
+            altered.Rz(command.op.params[0] + 0.5, command.qubits[0])
+        else:
+            altered.add_gate(command.op, command.qubits)
+
+    report = check_equivalence_segmented(
+        altered, circ_with_dist, qubit_mapping, segment_size=1
+    )
+    assert not report.equivalent
+    assert len(report.failed_segments()) == 1
+
+
+def test_check_ejpp_structure():
+    # Randomly generated circuit of type random, depth 6 and 6 qubits
+    with open("tests/test_circuits/to_pytket_circuit/random_6.json", "r") as fp:
+        circ = Circuit().from_dict(json.load(fp))
+
+    network = NISQNetwork(
+        [[2, 1], [1, 0], [1, 3], [0, 4]],
+        {0: [0, 1, 2], 1: [3, 4], 2: [5, 6, 7], 3: [8], 4: [9]},
+    )
+
+    allocator = HypergraphPartitioning()
+    distribution = allocator.allocate(circ, network)
+    circ_with_dist = distribution.to_pytket_circuit()
+    assert check_ejpp_structure(distribution, circ_with_dist) == []
+
+    commands = circ_with_dist.get_commands()
+    end_index = [i for i, c in enumerate(commands) if is_end_proc(c)][0]
+
+    def rebuild(skip: int) -> Circuit:
+        tampered = Circuit()
+        for qubit in circ_with_dist.qubits:
+            tampered.add_qubit(qubit)
+        for i, command in enumerate(commands):
+            if i != skip:
+                tampered.add_gate(command.op, command.qubits)
+        return tampered
+
+    # Dropping an ending process leaves its link qubit in use
+    assert check_ejpp_structure(distribution, rebuild(end_index))
+
+    # Dropping a gate of the original circuit is reported. Gates acting only
+    # on workspace qubits are not embedding corrections
+    workspace = set(distribution.get_qubit_mapping().values())
+    cu1_index = [
+        i
+        for i, c in enumerate(commands)
+        if c.op.type == OpType.CU1 and set(c.qubits) <= workspace
+    ][0]
+    violations = check_ejpp_structure(distribution, rebuild(cu1_index))
+    assert any("is not implemented" in v.message for v in violations)
+
+
 def test_to_pytket_circuit_with_frac_cz_circ():
     # Randomly generated circuit of type frac_CZ, depth 10 and 10 qubits
     with open("tests/test_circuits/to_pytket_circuit/frac_CZ_10.json", "r") as fp:
@@ -2029,3 +2123,81 @@ def test_embedding_detached():
 
     warnings.resetwarnings()
     assert caught_warning
+
+
+def test_hypergraph_circuit_fingerprint():
+    circ = Circuit(3).add_gate(OpType.CU1, 1.0, [0, 1]).Rz(0.5, 1)
+    circ.add_gate(OpType.CU1, 1.0, [1, 2]).add_gate(OpType.CU1, 1.0, [0, 1])
+    hyp_circ = HypergraphCircuit(circ)
+    fingerprint = hyp_circ.fingerprint()
+
+    assert HypergraphCircuit(circ.copy()).fingerprint() == fingerprint
+    assert circuit_fingerprint(circ) == circuit_fingerprint(circ.copy())
+    other_circ = Circuit(3).add_gate(OpType.CU1, 1.0, [0, 1]).Rz(0.25, 1)
+    other_circ.add_gate(OpType.CU1, 1.0, [1, 2]).add_gate(OpType.CU1, 1.0, [0, 1])
+    assert HypergraphCircuit(other_circ).fingerprint() != fingerprint
+    assert circuit_fingerprint(other_circ) != circuit_fingerprint(circ)
+
+    # Circuits with the same commands on differently named qubits differ
+    renamed_circ = circ.copy()
+    renamed_circ.rename_units({Qubit(i): Qubit("r", i) for i in range(3)})
+    assert HypergraphCircuit(renamed_circ).fingerprint() != fingerprint
+    assert circuit_fingerprint(renamed_circ) != circuit_fingerprint(circ)
+
+    # The fingerprint is recomputed after the hypergraph is modified
+    hyperedge = hyp_circ.hyperedge_list[0]
+    hyp_circ.split_hyperedge(
+        hyperedge,
+        [
+            Hyperedge(hyperedge.vertices[:2]),
+            Hyperedge(hyperedge.vertices[:1] + hyperedge.vertices[2:]),
+        ],
+    )
+    assert hyp_circ.fingerprint() != fingerprint
+
+    hyp_circ = HypergraphCircuit.from_dict(HypergraphCircuit(circ).to_dict())
+    assert hyp_circ.fingerprint() == fingerprint
+
+
+def test_apply_edit_matches_fresh_hypergraph():
+    circ = Circuit(3)
+    circ.add_gate(OpType.CU1, 1.0, [0, 1])
+    circ.H(0)
+    circ.add_gate(OpType.CU1, 1.0, [0, 2])
+    circ.Rz(0.5, 1)
+    circ.add_gate(OpType.CU1, 0.3, [1, 2])
+    circ.H(1)
+    circ.add_gate(OpType.CU1, 0.5, [0, 1])
+    circ.add_gate(OpType.CU1, 0.5, [1, 2])
+
+    # Both merges span a Hadamard gate
+    hyp_circ = HypergraphCircuit(circ)
+    hyp_circ.merge_hyperedge([Hyperedge([0, 3]), Hyperedge([0, 4, 6])])
+    hyp_circ.merge_hyperedge([Hyperedge([1, 3, 5]), Hyperedge([1, 6, 7])])
+
+    commands = circ.get_commands()
+    rz_index = [cmd.op.type for cmd in commands].index(OpType.Rz)
+    cu1_index = [cmd.op.params for cmd in commands].index([0.3])
+    replace = {rz_index: Op.create(OpType.Rz, 0.25)}
+    append = Circuit(3).add_gate(OpType.CU1, 0.5, [2, 0])
+    hyp_circ.apply_edit(append=append, replace=replace, remove=[cu1_index])
+
+    edited = Circuit(3)
+    for i, cmd in enumerate(commands):
+        if i != cu1_index:
+            edited.add_gate(replace.get(i, cmd.op), cmd.qubits)
+    edited.add_gate(OpType.CU1, 0.5, [2, 0])
+    fresh = HypergraphCircuit(edited)
+    # The merge on qubit 1 is split since an edited command lies within it,
+    # while the merge on qubit 0 is kept and extended to the new gate
+    fresh.merge_hyperedge([Hyperedge([0, 3]), Hyperedge([0, 4, 5, 7])])
+
+    assert hyp_circ.get_circuit().get_commands() == edited.get_commands()
+    assert hyp_circ.hyperedge_list == fresh.hyperedge_list
+    assert hyp_circ.hyperedge_dict == fresh.hyperedge_dict
+    assert hyp_circ.vertex_neighbours == fresh.vertex_neighbours
+    assert sorted(hyp_circ.vertex_list) == sorted(fresh.vertex_list)
+    assert (
+        hyp_circ.get_vertex_to_command_index_map()
+        == fresh.get_vertex_to_command_index_map()
+    )
@@ -2,7 +2,11 @@ from pytket_dqc.networks import NISQNetwork
 from pytket_dqc import HypergraphCircuit, Distribution, DQCPass
 from pytket_dqc.circuits import Hyperedge
 from pytket_dqc.placement import Placement
-from pytket import Circuit, OpType
+from pytket_dqc.utils import check_equivalence
+from pytket import Circuit, OpType, Qubit
+from pytket.circuit import Op
+import pytest
+from sympy import Symbol  # type: ignore
 
 
 # TODO: Add tests with circuits where one or more qubits are unused
@@ -263,6 +267,97 @@ def test_distribution_cost_with_embedding():
     assert distribution.is_valid()
 
 
+def test_apply_edit():
+    circ = Circuit(4)
+    circ.add_gate(OpType.CU1, 0.1234, [1, 2])
+    circ.add_gate(OpType.CU1, 0.1234, [0, 2])
+    circ.add_gate(OpType.CU1, 0.1234, [2, 3])
+    circ.add_gate(OpType.CU1, 0.1234, [0, 3])
+    circ.H(0).H(2).Rz(0.1234, 3)
+    circ.add_gate(OpType.CU1, 1.0, [0, 2])
+    circ.add_gate(OpType.CU1, 1.0, [0, 3])
+    circ.add_gate(OpType.CU1, 1.0, [1, 2])
+    circ.H(0).H(2).Rz(0.1234, 0)
+    circ.add_gate(OpType.CU1, 0.1234, [0, 1])
+    circ.add_gate(OpType.CU1, 0.1234, [0, 3])
+    circ.add_gate(OpType.CU1, 1.0, [1, 2])
+
+    network = NISQNetwork(
+        [[0, 1], [0, 2], [0, 3], [3, 4]],
+        {0: [0], 1: [1, 2], 2: [3, 4], 3: [7], 4: [5, 6]},
+    )
+    placement = Placement(
+        {0: 1, 1: 1, 2: 2, 3: 4, 4: 1, 5: 2, 6: 4}
+        | {7: 4, 8: 2, 9: 4, 10: 0, 11: 1, 12: 4, 13: 3}
+    )
+
+    dist_circ = HypergraphCircuit(circ)
+    # Merge hyperedges on qubit 2 using an H-embedding
+    dist_circ.merge_hyperedge([Hyperedge([2, 4, 5, 6]), Hyperedge([2, 13])])
+    distribution = Distribution(dist_circ, placement, network)
+
+    commands = dist_circ.get_circuit().get_commands()
+    command_index = dist_circ.get_vertex_to_command_index_map()
+    rz_on_3 = [
+        i
+        for i, cmd in enumerate(commands)
+        if cmd.op.type == OpType.Rz and cmd.qubits == [Qubit(3)]
+    ]
+    replace = {
+        # Changing a phase within a hyperedge spanning no Hadamard keeps it
+        rz_on_3[0]: Op.create(OpType.Rz, 0.5),
+        # Changing an embedded gate splits the H-embedding
+        command_index[8]: Op.create(OpType.CU1, 0.5),
+    }
+    append = Circuit(4).add_gate(OpType.CU1, 0.3, [3, 1])
+    region = distribution.apply_edit(append=append, replace=replace)
+
+    new_circ = Circuit(4)
+    for i, cmd in enumerate(commands):
+        new_circ.add_gate(replace.get(i, cmd.op), cmd.qubits)
+    new_circ.add_gate(OpType.CU1, 0.3, [3, 1])
+
+    assert distribution.circuit.hyperedge_list == [
+        Hyperedge([0, 5, 7]),
+        Hyperedge([0, 8, 9]),
+        Hyperedge([0, 11, 12]),
+        Hyperedge([1, 4, 10, 11, 13, 14]),
+        Hyperedge([2, 4, 5, 6]),
+        Hyperedge([2, 8, 10]),
+        Hyperedge([2, 13]),
+        Hyperedge([3, 6, 7, 9, 12, 14]),
+    ]
+    new_gate_server = distribution.placement.placement[14]
+    assert new_gate_server in [1, 4]
+    assert {1, 2, 3, 14} <= region
+    assert distribution.is_valid()
+    assert check_equivalence(
+        new_circ,
+        distribution.to_pytket_circuit(),
+        distribution.get_qubit_mapping(),
+    )
+
+    # Removing gates renumbers the gate vertices after them
+    distribution.apply_edit(remove=[command_index[4]])
+    assert distribution.circuit.hyperedge_list == [
+        Hyperedge([0, 4, 6]),
+        Hyperedge([0, 7, 8]),
+        Hyperedge([0, 10, 11]),
+        Hyperedge([1, 9, 10, 12, 13]),
+        Hyperedge([2, 4, 5]),
+        Hyperedge([2, 7, 9]),
+        Hyperedge([2, 12]),
+        Hyperedge([3, 5, 6, 8, 11, 13]),
+    ]
+    assert distribution.placement.placement[13] == new_gate_server
+    assert distribution.is_valid()
+
+    with pytest.raises(Exception):
+        distribution.apply_edit(remove=[len(commands)])
+    with pytest.raises(Exception):
+        distribution.apply_edit(append=Circuit(4).CZ(0, 1))
+
+
 def test_detached_gate_list():
     circ = Circuit(3).CZ(0, 1).CZ(0, 2)
     DQCPass().apply(circ)
@@ -286,3 +381,152 @@ def test_detached_gate_list():
 
     assert dist.detached_gate_count() == 1
     assert dist.non_local_gate_count() == 2
+
+
+def test_to_pytket_circuit_verify(monkeypatch):
+    circ = Circuit(3).CZ(0, 1).H(1).CZ(1, 2).CZ(0, 2)
+    DQCPass().apply(circ)
+    net = NISQNetwork(
+        server_coupling=[[0, 1], [1, 2]],
+        server_qubits={0: [0, 1], 1: [2, 3], 2: [4, 5]},
+    )
+    dist = Distribution(
+        HypergraphCircuit(circ), Placement({0: 0, 1: 1, 2: 2, 3: 1, 4: 1, 5: 0}), net
+    )
+    qubit_mapping = dist.get_qubit_mapping()
+    for verify in ["zx", "sampled"]:
+        assert check_equivalence(
+            circ, dist.to_pytket_circuit(verify=verify), qubit_mapping
+        )
+
+    # By default, only the structural check is run
+    def fail(*args, **kwargs):
+        raise AssertionError("ZX verification should be skipped")
+
+    monkeypatch.setattr("pytket_dqc.circuits.distribution.check_equivalence", fail)
+    assert check_equivalence(circ, dist.to_pytket_circuit(), qubit_mapping)
+    with pytest.raises(AssertionError):
+        dist.to_pytket_circuit(verify="zx")
+    with pytest.raises(Exception):
+        dist.to_pytket_circuit(verify="unknown")
+
+
+def test_transfer_placement():
+    network = NISQNetwork([[0, 1], [1, 2]], {0: [0, 1], 1: [2, 3], 2: [4, 5]})
+
+    circ = (
+        Circuit(4)
+        .add_gate(OpType.CU1, 0.1, [0, 1])
+        .H(1)
+        .add_gate(OpType.CU1, 0.2, [1, 2])
+        .add_gate(OpType.CU1, 0.3, [2, 3])
+    )
+    dist_circ = HypergraphCircuit(circ)
+    # Vertices 0-3 are qubits, 4-6 are the gates in order
+    placement = Placement({0: 0, 1: 0, 2: 1, 3: 2, 4: 0, 5: 1, 6: 2})
+    distribution = Distribution(dist_circ, placement, network)
+
+    # Identical circuit up to the parameters of its gates
+    new_circ = (
+        Circuit(4)
+        .add_gate(OpType.CU1, 0.4, [0, 1])
+        .H(1)
+        .add_gate(OpType.CU1, 0.5, [1, 2])
+        .add_gate(OpType.CU1, 0.6, [2, 3])
+    )
+    new_placement, region = distribution.transfer_placement(HypergraphCircuit(new_circ))
+    assert new_placement == placement
+    assert region == set()
+
+    # A qubit and a gate are appended
+    new_circ = circ.copy()
+    new_circ.add_qubit(Qubit(4))
+    new_circ.add_gate(OpType.CU1, 0.7, [Qubit(3), Qubit(4)])
+    new_dist_circ = HypergraphCircuit(new_circ)
+    new_placement, region = distribution.transfer_placement(new_dist_circ)
+    assert new_placement.is_valid(new_dist_circ, network)
+
+    new_qubit = new_dist_circ.get_vertex_of_qubit(Qubit(4))
+    new_gate = max(new_dist_circ.vertex_list)
+    for q in range(4):
+        v = new_dist_circ.get_vertex_of_qubit(Qubit(q))
+        assert new_placement.placement[v] == placement.placement[q]
+    # Servers 1 and 2 have the most free space; ties go to the lowest
+    assert new_placement.placement[new_qubit] == 1
+    # New gates are placed in the server of their first qubit
+    assert new_placement.placement[new_gate] == 2
+    assert {new_qubit, new_gate} <= region
+    assert new_dist_circ.get_vertex_of_qubit(Qubit(0)) not in region
+
+    # The last gate is removed
+    new_circ = (
+        Circuit(4)
+        .add_gate(OpType.CU1, 0.1, [0, 1])
+        .H(1)
+        .add_gate(OpType.CU1, 0.2, [1, 2])
+    )
+    new_placement, region = distribution.transfer_placement(HypergraphCircuit(new_circ))
+    assert new_placement == Placement({0: 0, 1: 0, 2: 1, 3: 2, 4: 0, 5: 1})
+    assert {2, 3} <= region
+    assert 0 not in region
+
+
+def test_binary_round_trip(tmp_path):
+    network = NISQNetwork(
+        [[0, 1], [1, 2]], {0: [0, 1], 1: [2, 3], 2: [4]}, {0: 2, 1: 3, 2: 1}
+    )
+    circ = Circuit()
+    qubits = [Qubit("a", 0), Qubit("a", 1), Qubit("b", 0)]
+    for qubit in qubits:
+        circ.add_qubit(qubit)
+    circ.add_gate(OpType.CU1, 0.5, [qubits[0], qubits[1]])
+    circ.H(qubits[1]).Rz(0.25, qubits[2])
+    circ.add_gate(OpType.CU1, 1.0, [qubits[1], qubits[2]])
+    circ.add_gate(OpType.CU1, 0.3, [qubits[0], qubits[2]])
+    circ.add_phase(0.5)
+    hyp_circ = HypergraphCircuit(circ)
+    hyperedge = hyp_circ.hyperedge_list[0]
+    hyp_circ.split_hyperedge(
+        hyperedge,
+        [Hyperedge(hyperedge.vertices[:2]), Hyperedge(hyperedge.vertices[::2])],
+    )
+    placement = Placement({0: 0, 1: 1, 2: 2, 3: 0, 4: 1, 5: 2})
+    distribution = Distribution(hyp_circ, placement, network)
+
+    path = str(tmp_path / "distribution.bin")
+    distribution.to_binary(path)
+    for mmap in [True, False]:
+        loaded = Distribution.from_binary(path, mmap=mmap)
+        assert loaded == distribution
+        assert loaded == Distribution.from_dict(distribution.to_dict())
+        assert loaded.cost() == distribution.cost()
+
+    with open(path, "r+b") as f:
+        f.write(b"garbage!")
+    with pytest.raises(Exception):
+        Distribution.from_binary(path)
+
+
+def test_binary_symbolic(tmp_path):
+    network = NISQNetwork([[0, 1]], {0: [0], 1: [1]})
+    placement = Placement({0: 0, 1: 1, 2: 0})
+    path = str(tmp_path / "distribution.bin")
+    a = Symbol("a")
+
+    # ``from_hyperedges`` does not check that the circuit has no symbols
+    numeric = HypergraphCircuit(Circuit(2).add_gate(OpType.CU1, 1.0, [0, 1]))
+    symbolic_param = Circuit(2).Rz(a, 0).add_gate(OpType.CU1, 1.0, [0, 1])
+    symbolic_phase = Circuit(2).add_gate(OpType.CU1, 1.0, [0, 1]).add_phase(a)
+    for circ in [symbolic_param, symbolic_phase]:
+        hyp_circ = HypergraphCircuit.from_hyperedges(
+            circ, numeric.vertex_list, numeric.hyperedge_list
+        )
+        distribution = Distribution(hyp_circ, placement, network)
+        with pytest.raises(Exception, match="symbolic"):
+            distribution.to_binary(path)
+
+        # Once the symbols are substituted the circuit can be written
+        circ.symbol_substitution({a: 0.5})
+        distribution = Distribution(HypergraphCircuit(circ), placement, network)
+        distribution.to_binary(path)
+        assert Distribution.from_binary(path) == distribution
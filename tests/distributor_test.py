@@ -2,10 +2,17 @@ from pytket_dqc.distributors import (
     PartitioningHeterogeneousEmbedding,
     CoverEmbeddingSteinerDetached,
     PartitioningAnnealing,
+    Windowed,
+    PortfolioDistributor,
+    CachedDistributor,
+    DistributionCache,
 )
-from pytket import Circuit
-from pytket_dqc import NISQNetwork
-from pytket_dqc.utils import DQCPass
+from pytket import Circuit, OpType
+from pytket_dqc import NISQNetwork, HypergraphCircuit
+from pytket_dqc.circuits import prepare
+from pytket_dqc.utils import DQCPass, check_equivalence
+import pytest
+import os
 
 
 def small_circuit_network():
@@ -44,3 +51,211 @@ def test_partitioning_embedding():
         initial_distributor=PartitioningAnnealing(),
     )
     assert dist.is_valid()
+
+
+def test_windowed():
+    circ = Circuit(4)
+    for i in range(6):
+        circ.add_gate(OpType.CU1, 1.0, [i % 4, (i + 1) % 4])
+        circ.add_gate(OpType.CU1, 0.5, [i % 4, (i + 2) % 4])
+        circ.H(i % 4).Rz(0.25, (i + 1) % 4)
+    network = NISQNetwork(
+        server_coupling=[[0, 1], [1, 2]],
+        server_qubits={0: [0, 1], 1: [2, 3], 2: [4]},
+    )
+
+    windowed = Windowed()
+    # Commands may be given lazily, along with the qubits
+    distributions = list(
+        windowed.distribute_windows(
+            iter(circ.get_commands()),
+            network,
+            qubits=circ.qubits,
+            window_size=7,
+            distributor=PartitioningAnnealing(),
+            seed=0,
+        )
+    )
+    assert len(distributions) == 4
+    assert all(dist.is_valid() for dist in distributions)
+    # The qubits stay in the same servers in every window
+    qubit_mapping = distributions[0].get_qubit_mapping()
+    assert all(dist.get_qubit_mapping() == qubit_mapping for dist in distributions)
+
+    distributed_circ = Circuit()
+    for dist in distributions:
+        window_circ = dist.to_pytket_circuit()
+        for qubit in window_circ.qubits:
+            if qubit not in distributed_circ.qubits:
+                distributed_circ.add_qubit(qubit)
+        distributed_circ.append(window_circ)
+    assert check_equivalence(circ, distributed_circ, qubit_mapping)
+
+    window_circs = list(
+        windowed.distribute_stream(
+            circ, network, window_size=10, distributor=PartitioningAnnealing()
+        )
+    )
+    assert len(window_circs) == 3
+
+    # The windows are gathered into a distribution of the whole circuit
+    dist = windowed.distribute(
+        circ, network, window_size=7, distributor=PartitioningAnnealing(), seed=0
+    )
+    assert dist.is_valid()
+    assert sorted(dist.circuit.vertex_list) == sorted(
+        HypergraphCircuit(circ).vertex_list
+    )
+    assert check_equivalence(circ, dist.to_pytket_circuit(), dist.get_qubit_mapping())
+
+    with pytest.raises(Exception):
+        next(windowed.distribute_windows(iter(circ.get_commands()), network))
+
+
+def test_portfolio():
+    circ, network = small_circuit_network()
+    portfolio = PortfolioDistributor(
+        [PartitioningAnnealing(), CoverEmbeddingSteinerDetached()]
+    )
+    dist = portfolio.distribute(circ, network, seed=0, time_limit=600)
+    assert dist.is_valid()
+    assert [result.name for result in portfolio.report] == [
+        "PartitioningAnnealing",
+        "CoverEmbeddingSteinerDetached",
+    ]
+    assert all(result.status == "valid" for result in portfolio.report)
+    assert dist.cost() == min(result.cost for result in portfolio.report)
+
+
+def test_portfolio_shares_network():
+    circ, network = small_circuit_network()
+    portfolio = PortfolioDistributor([PartitioningAnnealing()])
+    dist = portfolio.distribute(circ, network, seed=0)
+    assert dist.is_valid()
+    # Only the placement is sent back by the worker
+    assert dist.network is network
+    assert dist.circuit == prepare(circ).hypergraph_circuit()
+    assert dist.cost() == portfolio.report[0].cost
+
+
+def test_portfolio_failed():
+    circ = Circuit(4).CZ(0, 1).CZ(2, 3)
+    DQCPass().apply(circ)
+    _, network = small_circuit_network()
+    portfolio = PortfolioDistributor([CoverEmbeddingSteinerDetached()])
+    with pytest.raises(Exception):
+        portfolio.distribute(circ, network)
+    assert portfolio.report[0].status == "failed"
+    assert portfolio.report[0].error == (
+        "This circuit cannot be implemented on this network."
+    )
+
+
+def test_distribute_batch():
+    circ, network = small_circuit_network()
+    circuits = [circ, Circuit(2), circ]
+
+    results = list(PartitioningAnnealing().distribute_batch(circuits, network, seed=0))
+    assert [i for i, _ in results] == [0, 1, 2]
+    assert all(dist.is_valid() for _, dist in results)
+    assert all(dist.network is network for _, dist in results)
+
+    results = list(
+        PartitioningAnnealing().distribute_batch(
+            circuits, network, seed=0, num_workers=2, ordered=False
+        )
+    )
+    assert sorted(i for i, _ in results) == [0, 1, 2]
+    assert all(dist.is_valid() for _, dist in results)
+
+
+def test_distribute_batch_in_flight():
+    circ, network = small_circuit_network()
+    drawn = []
+
+    def circuits():
+        for i in range(6):
+            drawn.append(i)
+            yield circ
+
+    results = PartitioningAnnealing().distribute_batch(
+        circuits(), network, seed=0, num_workers=1
+    )
+    # Two circuits are submitted, and one more once the first is done
+    index, _ = next(results)
+    assert index == 0
+    assert len(drawn) == 3
+    assert [i for i, _ in results] == [1, 2, 3, 4, 5]
+
+
+def test_cached_distributor(tmp_path):
+    circ, network = small_circuit_network()
+    cache = DistributionCache(str(tmp_path))
+    distributor = CachedDistributor(PartitioningAnnealing(), cache)
+
+    dist = distributor.distribute(circ, network, seed=0)
+    key = cache.key(circ, network, PartitioningAnnealing(), {"seed": 0})
+    assert cache.get(key, network) == dist
+    assert cache.key(circ, network, PartitioningAnnealing(), {"seed": 1}) != key
+
+    cached_dist = distributor.distribute(circ, network, seed=0)
+    assert cached_dist == dist
+    assert cached_dist.network is network
+
+    # Evict everything
+    cache.max_size = 0
+    cache.evict()
+    assert cache.get(key, network) is None
+
+
+def test_cache_key_canonical(tmp_path):
+    circ, network = small_circuit_network()
+    cache = DistributionCache(str(tmp_path))
+    distributor = PartitioningAnnealing()
+
+    # Qubits, enums and sets have deterministic keys
+    kwargs = {"qubits": circ.qubits, "op": OpType.CZ, "fixed": {3, 1, 2}}
+    key = cache.key(circ, network, distributor, kwargs)
+    assert key == cache.key(circ, network, distributor, dict(kwargs))
+    assert key != cache.key(circ, network, distributor, {**kwargs, "op": OpType.CX})
+
+    # Objects only represented by their address are refused
+    with pytest.raises(Exception):
+        cache.key(circ, network, distributor, {"callback": lambda x: x})
+    with pytest.raises(Exception):
+        cache.key(circ, network, distributor, {"object": object()})
+
+
+def test_cache_eviction_scans(tmp_path, monkeypatch):
+    circ, network = small_circuit_network()
+    dist = PartitioningAnnealing().distribute(circ, network, seed=0)
+    cache = DistributionCache(str(tmp_path))
+
+    scans = []
+    listdir = os.listdir
+
+    def counting_listdir(path):
+        scans.append(path)
+        return listdir(path)
+
+    monkeypatch.setattr(os, "listdir", counting_listdir)
+
+    # The directory is not scanned while the cache is below its size
+    for i in range(3):
+        cache.put(f"{i}", dist)
+    assert scans == []
+    size = os.path.getsize(os.path.join(str(tmp_path), "0.json"))
+    assert cache._total_size == 3 * size
+
+    # Overwriting an entry does not change the size
+    cache.put("0", dist)
+    assert cache._total_size == 3 * size
+
+    cache.max_size = 2 * size
+    cache.put("3", dist)
+    assert len(scans) == 1
+    assert cache._total_size == 2 * size
+    assert len(listdir(str(tmp_path))) == 2
+
+    # A new cache finds the entries already stored
+    assert DistributionCache(str(tmp_path))._total_size == 2 * size
@@ -9,6 +9,7 @@ from pytket_dqc.allocators import GainManager
 from pytket_dqc.utils import steiner_tree
 from pytket import Circuit, OpType
 from copy import copy
+import random
 
 
 def get_circ():
@@ -283,3 +284,53 @@ def test_merge_with_embedding():
     )
     gain_mgr.merge_hyperedge(to_merge_hyperedge_list=to_merge_hyperedge_list)
     assert gain_mgr.distribution.cost() == 5
+
+
+def test_best_swap_partner():
+    network = NISQNetwork(
+        [[0, 1], [1, 2], [2, 3]],
+        {0: [0, 1], 1: [2, 3], 2: [4, 5], 3: [6, 7]},
+    )
+    circ = Circuit(8)
+    for layer in range(3):
+        for q in range(8):
+            circ.add_gate(OpType.CU1, 0.5, [q, (q + 2 * layer + 1) % 8]).H(q)
+    dist_circ = HypergraphCircuit(circ)
+
+    rng = random.Random(0)
+    placement_dict = {q: q // 2 for q in range(8)}
+    for v in dist_circ.vertex_list:
+        if not dist_circ.is_qubit_vertex(v):
+            placement_dict[v] = rng.randrange(4)
+    distribution = Distribution(dist_circ, Placement(placement_dict), network)
+    gain_manager = GainManager(distribution)
+
+    assert gain_manager.qubits_in_server == {0: {0, 1}, 1: {2, 3}, 2: {4, 5}, 3: {6, 7}}
+
+    def brute_force_swap_gain(vertex, server):
+        home_server = gain_manager.current_server(vertex)
+        gain_manager.move_vertex(vertex, server, recalculate_cost=False)
+        best = max(
+            gain_manager.move_vertex_gain(v, home_server)
+            for v in distribution.placement.get_vertices_in(server)
+            if dist_circ.is_qubit_vertex(v) and v != vertex
+        )
+        gain_manager.move_vertex(vertex, home_server, recalculate_cost=False)
+        return best
+
+    # The index must remain correct as vertices are moved around
+    for _ in range(30):
+        vertex = rng.randrange(8)
+        server = rng.choice(
+            [s for s in range(4) if s != gain_manager.current_server(vertex)]
+        )
+        partner, gain = gain_manager.best_swap_partner(vertex, server)
+        assert partner in gain_manager.qubits_in_server[server]
+        assert gain == brute_force_swap_gain(vertex, server)
+
+        home_server = gain_manager.current_server(vertex)
+        gain_manager.move_vertex(vertex, server)
+        gain_manager.move_vertex(partner, home_server)
+        gate_vertex = rng.randrange(8, len(dist_circ.vertex_list))
+        gain_manager.move_vertex(gate_vertex, rng.randrange(4))
+        assert distribution.is_valid()
@@ -9,6 +9,8 @@ from pytket_dqc.networks import (
 from pytket.placement import NoiseAwarePlacement
 from pytket.architecture import Architecture
 from pytket.circuit import Node
+import pickle
+import networkx as nx  # type: ignore
 import pytest
 from pytket_dqc.placement import Placement
 from pytket_dqc import HypergraphCircuit
@@ -169,6 +171,41 @@ def test_nisq_get_nx():
     assert list(G_server.edges()) == [(0, 1), (0, 2)]
 
 
+def test_nisq_get_compact_nx():
+    network = NISQNetwork(
+        [[0, 1], [0, 2], [1, 0]], {0: [0, 1, 2], 1: [3, 4, 5], 2: [6, 7, 8, 9]}
+    )
+
+    G_compact = network.get_compact_nx()
+    assert G_compact is network.get_compact_nx()
+    assert list(G_compact.edges()) == [
+        (0, 1),
+        (0, 2),
+        (0, 3),
+        (0, 6),
+        (3, 4),
+        (3, 5),
+        (6, 7),
+        (6, 8),
+        (6, 9),
+    ]
+
+    # Distances between qubits match those of the full graph
+    G_full = network.get_nisq_nx()
+    assert set(G_compact.nodes) == set(G_full.nodes)
+    full_distances = dict(nx.all_pairs_dijkstra_path_length(G_full))
+    compact_distances = dict(nx.all_pairs_dijkstra_path_length(G_compact))
+    assert full_distances == compact_distances
+
+    # Servers with many qubits do not need a quadratic number of edges
+    large_network = NISQNetwork([[0, 1]], {0: list(range(3000)), 1: [3000]})
+    assert large_network.get_compact_nx().number_of_edges() == 3000
+
+    # The cache is cleared when the network is modified
+    network.server_qubits = {0: [0], 1: [3, 4, 5], 2: [6, 7, 8, 9]}
+    assert network.get_compact_nx().number_of_edges() == 7
+
+
 def test_server_get_nx():
     server_network = ServerNetwork([[0, 1], [0, 2], [1, 2]])
     G = server_network.get_server_nx()
@@ -202,3 +239,67 @@ def test_server_network_is_placement():
     assert not large_network.is_placement(placement_five)
     assert small_network.is_placement(placement_one)
     assert not small_network.is_placement(placement_two)
+
+
+def test_network_precompute():
+    network = NISQNetwork([[0, 1], [1, 2]], {0: [0, 1], 1: [2, 3], 2: [4]})
+    network.precompute()
+
+    distance = network.get_distance_matrix()
+    assert distance.tolist() == [[0, 1, 2], [1, 0, 1], [2, 1, 0]]
+
+    tree = network.get_steiner_tree([0, 2])
+    assert sorted(tree.nodes) == [0, 1, 2]
+    assert network.get_steiner_tree([2, 0]) is tree
+    assert sorted(network.get_steiner_tree([1]).nodes) == [1]
+
+    # Caches are not pickled, but rebuilt on demand
+    unpickled = pickle.loads(pickle.dumps(network))
+    assert unpickled == network
+    assert unpickled._steiner_cache == dict()
+    assert unpickled.get_distance_matrix().tolist() == distance.tolist()
+
+
+def test_steiner_cache_bounds(monkeypatch):
+    monkeypatch.setattr("pytket_dqc.networks.server_network._STEINER_CACHE_SIZE", 2)
+    monkeypatch.setattr("pytket_dqc.networks.server_network._STEINER_MAX_KEY_SIZE", 2)
+    network = NISQNetwork([[0, 1], [1, 2], [2, 3]], {0: [0], 1: [1], 2: [2], 3: [3]})
+
+    # Sets of more than two servers are not cached
+    tree = network.get_steiner_tree([0, 1, 3])
+    assert sorted(tree.nodes) == [0, 1, 2, 3]
+    assert len(network._steiner_cache) == 0
+
+    # The least recently used tree is dropped
+    tree_01 = network.get_steiner_tree([0, 1])
+    network.get_steiner_tree([1, 2])
+    assert network.get_steiner_tree([0, 1]) is tree_01
+    network.get_steiner_tree([2, 3])
+    assert list(network._steiner_cache.keys()) == [
+        frozenset([0, 1]),
+        frozenset([2, 3]),
+    ]
+
+
+def test_network_fingerprint():
+    network = NISQNetwork([[0, 1], [1, 2]], {0: [0, 1], 1: [2, 3], 2: [4]})
+    fingerprint = network.fingerprint()
+
+    same = NISQNetwork([[2, 1], [1, 0]], {0: [0, 1], 1: [2, 3], 2: [4]})
+    assert same.fingerprint() == fingerprint
+
+    # Servers 0 and 2 swapped, and qubits relabelled
+    relabelled = NISQNetwork([[2, 1], [1, 0]], {2: [5, 6], 1: [7, 8], 0: [9]})
+    assert relabelled.fingerprint() != fingerprint
+    assert relabelled.fingerprint(relabel_invariant=True) == network.fingerprint(
+        relabel_invariant=True
+    )
+
+    different = NISQNetwork([[0, 1], [1, 2]], {0: [0, 1], 1: [2], 2: [3, 4]})
+    assert different.fingerprint(relabel_invariant=True) != network.fingerprint(
+        relabel_invariant=True
+    )
+
+    # Assigning an attribute clears the cached fingerprint
+    network.server_ebit_mem = {0: 1, 1: 1, 2: 1}
+    assert network.fingerprint() != fingerprint
@@ -664,3 +664,28 @@ def test_intertwining_embeddings_1():
         5: [(P9,)],
     }
     assert merged_packets_ref == pacman.merged_packets
+
+
+def test_indexed_graphs():
+    circ = Circuit(6)
+    circ.add_gate(cz, [0, 1]).H(0).add_gate(cz, [0, 2]).H(0)
+    circ.add_gate(cz, [0, 3]).H(0).add_gate(cz, [0, 4]).H(0).add_gate(cz, [0, 5])
+    placement = Placement({i: 0 if i == 0 or i > 5 else 1 for i in range(11)})
+
+    hyp_circ = HypergraphCircuit(circ)
+    pacman = PacMan(hyp_circ, placement)
+
+    nx_graph, nx_topnodes = pacman.get_nx_graph_merged()
+    graph = pacman.get_indexed_graph_merged()
+    assert set(graph.nodes) == set(nx_graph.nodes)
+    assert {frozenset(e) for e in graph.edges()} == {
+        frozenset(e) for e in nx_graph.edges
+    }
+    assert len(graph.minimum_vertex_cover()) == len(pacman.get_mvc_merged_graph())
+
+    nx_graph, nx_topnodes = pacman.get_nx_graph_conflict()
+    graph = pacman.get_indexed_graph_conflict()
+    assert set(graph.nodes) == set(nx_graph.nodes)
+    assert {frozenset(e) for e in graph.edges()} == {
+        frozenset(e) for e in nx_graph.edges
+    }
@@ -24,7 +24,7 @@ from pytket_dqc.refiners.vertex_cover import (
     VertexCover,
     get_min_covers,
 )
-from pytket_dqc.allocators import HypergraphPartitioning
+from pytket_dqc.allocators import HypergraphPartitioning, Random
 import pytest
 
 
@@ -577,6 +577,9 @@ def test_min_covers():
     ]
     assert sorted(covers) == sorted(get_min_covers(edges))
 
+    with pytest.raises(TimeoutError):
+        get_min_covers(edges, deadline=0)
+
 
 def test_vertex_cover_refiner_empty():
     network = NISQNetwork([[0, 1]], {0: [0, 1], 1: [2]})
@@ -972,6 +975,83 @@ def test_vertex_cover_refiner_random_circ():
         assert ebit_req <= network.server_ebit_mem[server]
 
 
+def test_vertex_cover_refiner_parallel():
+    with open("tests/test_circuits/to_pytket_circuit/random_6.json", "r") as fp:
+        circ = Circuit().from_dict(json.load(fp))
+
+    DQCPass().apply(circ)
+
+    network = NISQNetwork(
+        [[2, 1], [1, 0], [1, 3], [0, 4]],
+        {0: [0, 1, 2], 1: [3, 4], 2: [5, 6, 7], 3: [8], 4: [9]},
+    )
+    placement = Placement({0: 0, 1: 4, 2: 3, 3: 2, 4: 1, 5: 2})
+
+    serial_distribution = Distribution(
+        circuit=HypergraphCircuit(circ), placement=placement, network=network
+    )
+    VertexCover().refine(serial_distribution, vertex_cover_alg="all_brute_force")
+
+    # Components solved in worker processes are merged deterministically
+    distribution = Distribution(
+        circuit=HypergraphCircuit(circ), placement=placement, network=network
+    )
+    VertexCover().refine(
+        distribution, vertex_cover_alg="all_brute_force", num_workers=2
+    )
+    assert distribution.cost() == serial_distribution.cost()
+    assert distribution.placement == serial_distribution.placement
+
+    pytket_circ = distribution.to_pytket_circuit()
+    assert check_equivalence(circ, pytket_circ, distribution.get_qubit_mapping())
+
+    # With a zero time budget, every component falls back to NetworkX
+    distribution = Distribution(
+        circuit=HypergraphCircuit(circ), placement=placement, network=network
+    )
+    VertexCover().refine(
+        distribution,
+        vertex_cover_alg="all_brute_force",
+        num_workers=2,
+        component_time_budget=0,
+    )
+    nx_distribution = Distribution(
+        circuit=HypergraphCircuit(circ), placement=placement, network=network
+    )
+    VertexCover().refine(nx_distribution, vertex_cover_alg="networkx")
+    assert distribution.cost() == nx_distribution.cost()
+
+    pytket_circ = distribution.to_pytket_circuit()
+    assert check_equivalence(circ, pytket_circ, distribution.get_qubit_mapping())
+
+
+def test_vertex_cover_refiner_hopcroft_karp():
+    with open("tests/test_circuits/to_pytket_circuit/random_6.json", "r") as fp:
+        circ = Circuit().from_dict(json.load(fp))
+
+    DQCPass().apply(circ)
+
+    network = NISQNetwork(
+        [[2, 1], [1, 0], [1, 3], [0, 4]],
+        {0: [0, 1, 2], 1: [3, 4], 2: [5, 6, 7], 3: [8], 4: [9]},
+    )
+    placement = Placement({0: 0, 1: 4, 2: 3, 3: 2, 4: 1, 5: 2})
+
+    distribution = Distribution(
+        circuit=HypergraphCircuit(circ), placement=placement, network=network
+    )
+    VertexCover().refine(distribution, vertex_cover_alg="hopcroft_karp")
+    nx_distribution = Distribution(
+        circuit=HypergraphCircuit(circ), placement=placement, network=network
+    )
+    VertexCover().refine(nx_distribution, vertex_cover_alg="networkx")
+    assert distribution.is_valid()
+    assert distribution.cost() == nx_distribution.cost()
+
+    pytket_circ = distribution.to_pytket_circuit()
+    assert check_equivalence(circ, pytket_circ, distribution.get_qubit_mapping())
+
+
 def test_vertex_cover_refiner_frac_CZ_circ():
     # Randomly generated circuit of type frac_CZ, depth 10 and 10 qubits
     with open("tests/test_circuits/to_pytket_circuit/frac_CZ_10.json", "r") as fp:
@@ -1440,6 +1520,71 @@ def test_boundary_reallocation_refiner_complex_2():
     assert check_equivalence(circ, pytket_circ, distribution.get_qubit_mapping())
 
 
+def test_boundary_reallocation_refiner_fm():
+    # Randomly generated circuit of type random, depth 6 and 6 qubits
+    with open("tests/test_circuits/to_pytket_circuit/random_6.json", "r") as fp:
+        circ = Circuit().from_dict(json.load(fp))
+
+    DQCPass().apply(circ)
+
+    network = NISQNetwork(
+        [[2, 1], [1, 0], [1, 3], [0, 4]],
+        {0: [0, 1, 2], 1: [3, 4], 2: [5, 6, 7], 3: [8], 4: [9]},
+    )
+
+    distribution = Random().allocate(circ, network, seed=0)
+    initial_cost = distribution.cost()
+    assert BoundaryReallocation().refine(
+        distribution, reallocation_alg="fm", num_rounds=10, seed=0
+    )
+    assert distribution.is_valid()
+    assert distribution.cost() < initial_cost
+
+    pytket_circ = distribution.to_pytket_circuit()
+    assert check_equivalence(circ, pytket_circ, distribution.get_qubit_mapping())
+
+    # Fixed vertices are never moved
+    distribution = Random().allocate(circ, network, seed=0)
+    fixed = {v: distribution.placement.placement[v] for v in range(6)}
+    BoundaryReallocation().refine(
+        distribution, reallocation_alg="fm", fixed_vertices=list(fixed), seed=0
+    )
+    assert all(distribution.placement.placement[v] == s for v, s in fixed.items())
+
+    with pytest.raises(Exception):
+        BoundaryReallocation().refine(distribution, reallocation_alg="unknown")
+
+
+def test_boundary_reallocation_refiner_active_vertices():
+    with open("tests/test_circuits/to_pytket_circuit/random_6.json", "r") as fp:
+        circ = Circuit().from_dict(json.load(fp))
+
+    DQCPass().apply(circ)
+
+    network = NISQNetwork(
+        [[2, 1], [1, 0], [1, 3], [0, 4]],
+        {0: [0, 1, 2], 1: [3, 4], 2: [5, 6, 7], 3: [8], 4: [9]},
+    )
+
+    # With no active vertices nothing is moved
+    for alg in ["label_propagation", "fm"]:
+        distribution = Random().allocate(circ, network, seed=0)
+        placement = Placement(dict(distribution.placement.placement))
+        assert not BoundaryReallocation().refine(
+            distribution, active_vertices=[], reallocation_alg=alg
+        )
+        assert distribution.placement == placement
+
+    # Refinement starting from a region may spread beyond it
+    distribution = Random().allocate(circ, network, seed=0)
+    initial_cost = distribution.cost()
+    BoundaryReallocation().refine(
+        distribution, active_vertices=distribution.circuit.vertex_list[:3], seed=0
+    )
+    assert distribution.is_valid()
+    assert distribution.cost() <= initial_cost
+
+
 @pytest.mark.high_compute
 def test_boundary_reallocation_refiner_pauli_circ():
     # Randomly generated circuit of type pauli, depth 10 and 10 qubits
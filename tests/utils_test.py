@@ -3,8 +3,13 @@ from pytket_dqc.utils import (
     DQCPass,
     direct_from_origin,
     ebit_memory_required,
+    ebit_cost,
+    analyse_distributed_circuit,
     check_equivalence,
+    check_equivalence_statevector,
     to_euler_with_two_hadamards,
+    clear_decomposition_caches,
+    IndexedBipartiteGraph,
 )
 from pytket import Circuit, OpType
 from pytket.circuit import Op
@@ -22,8 +27,13 @@ from pytket.circuit import PauliExpBox
 from pytket.passes import DecomposeBoxes
 import numpy as np
 import pytest
-from pytket_dqc.utils.qasm import to_qasm_str
+from pytket_dqc.utils.qasm import to_qasm_str, write_qasm, qasm_lines
+import io
+import subprocess
+import sys
 from pytket.qasm import circuit_from_qasm_str
+from pytket_dqc.utils.gateset import start_proc, end_proc, tk1_to_euler, tk2_to_cu1
+from pytket_dqc.utils import gateset
 
 
 def test_qasm():
@@ -45,6 +55,18 @@ def test_qasm():
 
     assert qasm_circ == circ_with_dist
 
+    lines = list(qasm_lines(circ_with_dist))
+    assert all(line.endswith("\n") for line in lines)
+    assert "".join(lines) == qasm_str
+
+    text_file = io.StringIO()
+    write_qasm(circ_with_dist, text_file, buffer_size=16)
+    assert text_file.getvalue() == qasm_str
+
+    binary_file = io.BytesIO()
+    write_qasm(circ_with_dist, binary_file)
+    assert binary_file.getvalue().decode() == qasm_str
+
 
 def test_rebase():
     circ = Circuit(2).CY(0, 1)
@@ -117,6 +139,38 @@ def test_ebit_memory_required():
     assert ebit_memory_required(circ) == {0: 0, 1: 4, 2: 0}
 
 
+def test_analyse_distributed_circuit():
+    with open("tests/test_circuits/pauli_6.json", "r") as fp:
+        circ = Circuit().from_dict(json.load(fp))
+
+    analysis = analyse_distributed_circuit(circ)
+    assert analysis.ebit_cost == 10
+    assert analysis.ebit_memory_required == {0: 0, 1: 2, 2: 3}
+    assert analysis.all_cu1_local
+    assert analysis.non_local_cu1 == []
+    assert sum(analysis.link_usage.values()) == 10
+    assert all(s0 < s1 for s0, s1 in analysis.link_usage)
+
+    # The timeline reaches the peak memory of each server and ends empty
+    assert len(analysis.link_occupancy) == 20
+    for server, peak in analysis.ebit_memory_required.items():
+        occupancy = [e.occupancy for e in analysis.link_occupancy if e.server == server]
+        assert max(occupancy, default=0) == peak
+        assert occupancy[-1:] in [[], [0]]
+    indices = [e.command_index for e in analysis.link_occupancy]
+    assert indices == sorted(indices)
+
+
+def test_ebit_cost_plain_circuit():
+    # Qubits with ordinary names are not assigned to servers
+    circ = Circuit(3).H(0).CZ(0, 1).add_gate(OpType.CU1, [0.3], [1, 2])
+    assert ebit_cost(circ) == 0
+
+    analysis = analyse_distributed_circuit(circ)
+    assert analysis.ebit_memory_required == dict()
+    assert analysis.all_cu1_local
+
+
 def test_detached_gate_count():
     with open("tests/test_circuits/chemistry_aware_post_vertex_cover.json", "r") as fp:
         distribution = Distribution.from_dict(json.load(fp))
@@ -299,6 +353,44 @@ def test_verify_non_equal():
     assert not check_equivalence(ab_circ, ba_circ, {q: q for q in ab_circ.qubits})
 
 
+def test_verify_statevector():
+    h_circ = Circuit(1).H(0)
+    s_circ = Circuit(1).S(0)
+    mapping = {q: q for q in h_circ.qubits}
+    assert not check_equivalence_statevector(h_circ, s_circ, mapping, seed=0)
+    assert check_equivalence_statevector(h_circ, h_circ.copy(), mapping, seed=0)
+
+    ab_circ = Circuit(2).CX(0, 1).CX(1, 0)
+    ba_circ = Circuit(2).CX(1, 0).CX(0, 1)
+    mapping = {q: q for q in ab_circ.qubits}
+    assert not check_equivalence_statevector(ab_circ, ba_circ, mapping, seed=0)
+
+    # A non-local CU1 gate implemented via a link qubit
+    circ = Circuit(2).H(0).add_gate(OpType.CU1, 0.3, [0, 1]).H(1)
+    dist_circ = Circuit()
+    server_0 = dist_circ.add_q_register("server_0", 1)
+    server_1 = dist_circ.add_q_register("server_1", 1)
+    link = dist_circ.add_q_register("server_1_link_register", 1)
+    dist_circ.H(server_0[0])
+    dist_circ.add_custom_gate(start_proc(), [], [server_0[0], link[0]])
+    dist_circ.add_gate(OpType.CU1, 0.3, [link[0], server_1[0]])
+    dist_circ.add_custom_gate(end_proc(), [], [link[0], server_0[0]])
+    dist_circ.H(server_1[0])
+    mapping = {circ.qubits[0]: server_0[0], circ.qubits[1]: server_1[0]}
+    assert check_equivalence_statevector(circ, dist_circ, mapping, seed=1)
+    assert check_equivalence(circ, dist_circ, mapping)
+
+    # A Hadamard on the link qubit makes it lose the copy of its qubit
+    bad_circ = Circuit()
+    for qubit in dist_circ.qubits:
+        bad_circ.add_qubit(qubit)
+    for command in dist_circ.get_commands():
+        bad_circ.add_gate(command.op, command.qubits)
+        if command.op.type == OpType.CU1:
+            bad_circ.H(link[0])
+    assert not check_equivalence_statevector(circ, bad_circ, mapping, seed=1)
+
+
 def test_to_euler_with_two_hadamards():
     test_gatesets = [
         [],
@@ -348,3 +440,102 @@ def test_to_euler_with_two_hadamards():
             np.identity(2),
             identity_up_to_global_phase / identity_up_to_global_phase[0][0],
         )
+
+
+def test_decomposition_cache():
+    clear_decomposition_caches()
+    ops = [Op.create(OpType.Rz, [0.3]), Op.create(OpType.H)]
+    first = to_euler_with_two_hadamards(ops)
+    # Parameters differing by floating point error share an entry
+    second = to_euler_with_two_hadamards(
+        [Op.create(OpType.Rz, [0.1 + 0.2]), Op.create(OpType.H)]
+    )
+    assert first == second
+
+    # The lists returned may be modified without affecting the cache
+    first.reverse()
+    assert to_euler_with_two_hadamards(ops) == second
+
+    circ = tk1_to_euler(0.3, 0.5, 0.7)
+    circ.H(0)
+    assert tk1_to_euler(0.3, 0.5, 0.7) != circ
+
+    # Symbolic parameters are decomposed without being cached
+    n_entries = len(gateset._tk2_cache._entries)
+    symbolic = tk2_to_cu1(0.5 * Symbol("a"), 0.3, 0.2)
+    assert symbolic.free_symbols() == {Symbol("a")}
+    assert len(gateset._tk2_cache._entries) == n_entries
+    n_entries = len(gateset._tk1_cache._entries)
+    with pytest.raises(Exception):
+        tk1_to_euler(0.5 * Symbol("a"), 0.3, 0.2)
+    assert len(gateset._tk1_cache._entries) == n_entries
+
+    # The circuits produced by DQCPass are the same with a warm cache
+    circ = Circuit(3).CX(0, 1).Rx(0.3, 2).CZ(1, 2).Ry(0.7, 0).CX(2, 0)
+    cold = circ.copy()
+    clear_decomposition_caches()
+    DQCPass().apply(cold)
+    warm = circ.copy()
+    DQCPass().apply(warm)
+    assert cold == warm
+
+
+def test_indexed_bipartite_graph():
+    edges = [("a", 0), ("a", 1), ("b", 0), ("c", 2), ("d", 2), ("d", 3), ("a", 0)]
+    graph = IndexedBipartiteGraph.from_edges(edges)
+    assert len(graph) == 8
+    assert len(graph.edges()) == 6
+    # The first node of each connected component is in the bottom half
+    assert graph.top_nodes() == {0, 1, 2, 3}
+    cover = graph.minimum_vertex_cover()
+    assert len(cover) == 4
+    assert all(u in cover or v in cover for u, v in edges)
+
+    sub = graph.subgraph(["a", 0, 1, "z"])
+    assert len(sub) == 3
+    assert len(sub.edges()) == 2
+    assert sub.minimum_vertex_cover() == {"a"}
+
+    with pytest.raises(Exception):
+        IndexedBipartiteGraph.from_edges([(0, 1), (1, 2), (2, 0)])
+
+
+def test_indexed_bipartite_graph_matches_networkx():
+    rng = np.random.default_rng(seed=0)
+    for _ in range(20):
+        edges = {(f"t{rng.integers(15)}", f"b{rng.integers(15)}") for _ in range(30)}
+        graph = IndexedBipartiteGraph.from_edges(edges)
+
+        nx_graph = nx.Graph()
+        nx_graph.add_edges_from(edges)
+        top_nodes = {u for u, _ in edges}
+        matching = nx.bipartite.maximum_matching(nx_graph, top_nodes=top_nodes)
+        nx_cover = nx.bipartite.to_vertex_cover(nx_graph, matching, top_nodes=top_nodes)
+
+        match = graph.maximum_matching()
+        assert (match >= 0).sum() == len(matching)
+        cover = graph.minimum_vertex_cover()
+        assert len(cover) == len(nx_cover)
+        assert all(u in cover or v in cover for u, v in edges)
+
+
+def test_import_is_lazy():
+    # Heavy optional dependencies must only be loaded by the functions using
+    # them, since short-lived worker processes import the package. Run in a
+    # fresh interpreter, since this one has loaded them already.
+    heavy = ["hypernetx", "matplotlib", "pyzx", "kahypar", "scipy.stats"]
+    script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import pytket_dqc, pytket_dqc.allocators, pytket_dqc.distributors\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print([m for m in {heavy} if m in sys.modules])\n"
+        "print(elapsed)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    loaded, elapsed = result.stdout.splitlines()
+    assert loaded == "[]"
+    # Generous bound, to catch a heavy import slipping back in
+    assert float(elapsed) < 10